@@ -0,0 +1,111 @@
+import math
+import time
+from fractions import Fraction
+
+from src.prob.three_rows_chomp_prob import (
+    calculate_three_rows_prob_table,
+    iter_three_rows_boards_by_total,
+)
+
+
+def fill_three_rows_prob_table_naive(
+    n1: int,
+    n2: int,
+    n3: int,
+) -> dict[tuple[int, int, int], Fraction]:
+    """6つの和を毎回ループで足し合わせる、累積和を用いない表の計算。
+
+    各盤面でO(n)回の加算を行うため、表全体ではO(n^4)回の加算になる。
+
+    Parameters
+    ----------
+    n1: int
+        1行目のマスの個数
+    n2: int
+        2行目のマスの個数
+    n3: int
+        3行目のマスの個数
+
+    Returns
+    -------
+    dict of tuple of int to Fraction
+        全ての部分盤面の確率
+
+    """
+    f: dict[tuple[int, int, int], Fraction] = {}
+    for a, b, c in iter_three_rows_boards_by_total(n1, n2, n3):
+        total = a + b + c
+        if total == 0:
+            f[(a, b, c)] = Fraction(1)
+            continue
+        sum_value = Fraction(0)
+        for i in range(b, a):
+            sum_value += f[(i, b, c)]
+        for i in range(c, b):
+            sum_value += f[(i, i, c)] + f[(a, i, c)]
+        for i in range(c):
+            sum_value += f[(i, i, i)] + f[(a, i, i)] + f[(a, b, i)]
+        f[(a, b, c)] = 1 - Fraction(sum_value, total)
+    return f
+
+
+def measure(n: int) -> tuple[float, float]:
+    """N x N x N の盤面について、累積和なしと累積和ありの計算時間を測定する関数。
+
+    Parameters
+    ----------
+    n: int
+        各行のマスの個数
+
+    Returns
+    -------
+    tuple of float
+        (累積和なしの計算時間, 累積和ありの計算時間) [秒]
+
+    """
+    start = time.perf_counter()
+    naive = fill_three_rows_prob_table_naive(n, n, n)
+    naive_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    table = calculate_three_rows_prob_table(n, n, n)
+    prefix_time = time.perf_counter() - start
+
+    if naive[(n, n, n)] != table[(n, n, n)]:
+        msg: str = "累積和ありとなしで計算結果が一致しません。"
+        raise ValueError(msg)
+    return naive_time, prefix_time
+
+
+def benchmark(ns: list[int]) -> None:
+    """計算時間と、隣り合うNの間での計算時間の増え方(両対数の傾き)を表示する関数。
+
+    盤面の数はO(N^3)であり、累積和なしでは各盤面にO(N)回の加算が必要になる。
+    分数の桁数の増加の影響も含まれるが、傾きの差がおよそ1になることを確認できる。
+
+    Parameters
+    ----------
+    ns: list of int
+        測定するNの一覧(昇順)
+
+    """
+    print(f"{'N':>4} {'naive [s]':>12} {'prefix [s]':>12} {'slope':>14} {'ratio':>8}")
+    previous: tuple[int, float, float] | None = None
+    for n in ns:
+        naive_time, prefix_time = measure(n)
+        slope = ""
+        if previous is not None:
+            prev_n, prev_naive, prev_prefix = previous
+            scale = math.log(n / prev_n)
+            naive_slope = math.log(naive_time / prev_naive) / scale
+            prefix_slope = math.log(prefix_time / prev_prefix) / scale
+            slope = f"{naive_slope:.2f} / {prefix_slope:.2f}"
+        print(
+            f"{n:>4} {naive_time:>12.4f} {prefix_time:>12.4f} {slope:>14} "
+            f"{naive_time / prefix_time:>8.1f}",
+        )
+        previous = (n, naive_time, prefix_time)
+
+
+if __name__ == "__main__":
+    benchmark([8, 12, 16, 24, 32, 40])
@@ -0,0 +1,107 @@
+import time
+
+from src.prob.two_rows_chomp_prob import (
+    calculate_mutual_recurrence_relation_binary_splitting,
+    calculate_mutual_recurrence_relation_exact,
+    clear_mutual_recurrence_relation_cache,
+)
+
+
+def calculate_mutual_recurrence_relation_uncached(k: int) -> tuple[int, int]:
+    """キャッシュを用いず、毎回i = 1から相互再帰関係を計算する関数。
+
+    Parameters
+    ----------
+    k : int
+        再帰関係の深さ。
+
+    Returns
+    -------
+    tuple of int
+        計算された相互再帰関係 (a_k, b_k)。
+
+    """
+    a, b = 1, -1
+    for i in range(1, k):
+        a, b = i * (4 * i + 1) * a + b, -i * (i + 1) * a + (4 * i**2 - i - 1) * b
+    return a, b
+
+
+def measure_sweep(max_k: int, *, cached: bool) -> float:
+    """相互再帰関係を k = 1, ..., max_k の順に求める時間を測定する関数。
+
+    Parameters
+    ----------
+    max_k : int
+        求めるkの上限
+    cached : bool
+        キャッシュを用いる場合はTrue
+
+    Returns
+    -------
+    float
+        計算時間 [秒]
+
+    """
+    clear_mutual_recurrence_relation_cache()
+    calculate = (
+        calculate_mutual_recurrence_relation_exact
+        if cached
+        else calculate_mutual_recurrence_relation_uncached
+    )
+    start = time.perf_counter()
+    for k in range(1, max_k + 1):
+        calculate(k)
+    return time.perf_counter() - start
+
+
+def benchmark(max_ks: list[int], uncached_limit: int = 2000) -> None:
+    """キャッシュありとなしで、kの掃引にかかる時間を比較する関数。
+
+    キャッシュなしでは掃引全体でO(K^2)回の行列の掛け算が必要になるため、
+    uncached_limitを超えるKでは測定を省略する。
+
+    Parameters
+    ----------
+    max_ks : list of int
+        測定するKの一覧
+    uncached_limit : int, optional
+        キャッシュなしで測定するKの上限 (デフォルト: 2000)
+
+    """
+    print(f"{'K':>6} {'cached [s]':>12} {'uncached [s]':>14}")
+    for max_k in max_ks:
+        cached_time = measure_sweep(max_k, cached=True)
+        uncached = ""
+        if max_k <= uncached_limit:
+            uncached = f"{measure_sweep(max_k, cached=False):.4f}"
+        print(f"{max_k:>6} {cached_time:>12.4f} {uncached:>14}")
+
+
+def benchmark_binary_splitting(ks: list[int], workers: int = 1) -> None:
+    """大きなkについて、漸化式を順に進める場合と積の木の計算時間を比較する関数。
+
+    Parameters
+    ----------
+    ks : list of int
+        測定するkの一覧
+    workers : int, optional
+        積の木の上位の段を分担するプロセスの数 (デフォルト: 1)
+
+    """
+    print(f"{'k':>8} {'sequential [s]':>16} {'binary splitting [s]':>22}")
+    for k in ks:
+        # キャッシュは全てのkの値を保持してメモリを消費するため、キャッシュなしで測る
+        start = time.perf_counter()
+        calculate_mutual_recurrence_relation_uncached(k)
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        calculate_mutual_recurrence_relation_binary_splitting(k, workers)
+        splitting_time = time.perf_counter() - start
+        print(f"{k:>8} {sequential_time:>16.4f} {splitting_time:>22.4f}")
+
+
+if __name__ == "__main__":
+    benchmark([500, 1000, 2000, 5000, 10000])
+    benchmark_binary_splitting([5000, 10000, 20000, 50000])
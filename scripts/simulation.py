@@ -1,15 +1,40 @@
+import csv
+import os
+from collections.abc import Iterable
 from pathlib import Path
+from typing import NamedTuple
 
 import matplotlib.pyplot as plt
 import numpy as np
 
 from config import RESULT_DIR
-from src.agent import Agent
-from src.chomp import Chomp
-from src.recurrence_relation import calculate_probability
-
-
-def simulate_game(simulation_count: int, board_rows: int, board_cols: int) -> float:
+from src.game.agent import Agent
+from src.game.batch_simulation import (
+    AdaptiveSimulationResult,
+    count_first_player_wins_adaptive,
+    count_first_player_wins_many,
+    count_first_player_wins_parallel,
+)
+from src.game.chomp import Chomp
+from src.game.game_log import (
+    FIRST_PLAYER,
+    GAME_LOG_SUFFIX,
+    SECOND_PLAYER,
+    GameLogWriter,
+)
+from src.prob.two_rows_chomp_prob import calculate_two_rows_prob_grid
+from src.utilities import wilson_interval
+
+
+def simulate_game(
+    simulation_count: int,
+    board_rows: int,
+    board_cols: int,
+    *,
+    vectorized: bool = False,
+    workers: int = 1,
+    seed: int | np.random.SeedSequence | None = None,
+) -> float:
     """Chompゲームのシミュレーションを実行する関数。
 
     Parameters
@@ -20,6 +45,18 @@ def simulate_game(simulation_count: int, board_rows: int, board_cols: int) -> fl
         盤面の行数。
     board_cols : int
         盤面の列数。
+    vectorized : bool, optional
+        Trueの場合、全ゲームをnumpyで同時に進める一括シミュレーションを用いる
+        (デフォルト: False)
+    workers : int, optional
+        一括シミュレーションに使用するプロセス数 (デフォルト: 1)
+    seed : int or numpy.random.SeedSequence, optional
+        一括シミュレーションの乱数のシード。同じシードであればworkersによらず
+        同じ結果になる。
+
+    Note
+    ----------
+    workersまたはseedを指定した場合は、vectorizedによらず一括シミュレーションを用いる。
 
     Return
     ----------
@@ -30,6 +67,16 @@ def simulate_game(simulation_count: int, board_rows: int, board_cols: int) -> fl
     print(
         f"Simulating {simulation_count} games on a {board_rows}x{board_cols} board...",
     )
+    if vectorized or workers > 1 or seed is not None:
+        wins: int = count_first_player_wins_parallel(
+            simulation_count,
+            board_rows,
+            board_cols,
+            workers=workers,
+            seed=seed,
+        )
+        return wins / simulation_count
+
     agent1: Agent = Agent("エージェント1")  # 先手のプレイヤー
     agent2: Agent = Agent("エージェント2")  # 後手のプレイヤー
     agent1_wins: int = 0
@@ -55,14 +102,97 @@ def simulate_game(simulation_count: int, board_rows: int, board_cols: int) -> fl
     return agent1_wins / simulation_count
 
 
+def simulate_game_adaptive(
+    board_rows: int,
+    board_cols: int,
+    half_width: float,
+    *,
+    max_games: int = 10_000_000,
+    workers: int = 1,
+    seed: int | np.random.SeedSequence | None = None,
+) -> AdaptiveSimulationResult:
+    """信頼区間が目標の幅になるまでChompゲームのシミュレーションを実行する関数。
+
+    Parameters
+    ----------
+    board_rows : int
+        盤面の行数。
+    board_cols : int
+        盤面の列数。
+    half_width : float
+        目標とする95%信頼区間の幅の半分。
+    max_games : int, optional
+        シミュレーションするゲームの数の上限 (デフォルト: 10000000)
+    workers : int, optional
+        使用するプロセス数 (デフォルト: 1)
+    seed : int or numpy.random.SeedSequence, optional
+        乱数のシード
+
+    Return
+    ----------
+    result : AdaptiveSimulationResult
+        先手の勝率の推定値、信頼区間、ゲーム数
+
+    """
+    result = count_first_player_wins_adaptive(
+        board_rows,
+        board_cols,
+        half_width,
+        max_games=max_games,
+        workers=workers,
+        seed=seed,
+    )
+    print(
+        f"{board_rows}x{board_cols}: p = {result.probability:.6f} "
+        f"[{result.lower:.6f}, {result.upper:.6f}] ({result.game_count} games)",
+    )
+    return result
+
+
+class ComparisonRow(NamedTuple):
+    """理論値とシミュレーション値の比較表の1行。
+
+    Attributes
+    ----------
+    i : int
+        盤面 2xi の列数
+    theory : float
+        先手の勝率の理論値
+    estimate : float
+        シミュレーションによる先手の勝率の推定値
+    lower : float
+        推定値のWilsonスコア信頼区間の下限
+    upper : float
+        推定値のWilsonスコア信頼区間の上限
+    games : int
+        シミュレーションしたゲームの数
+
+    """
+
+    i: int
+    theory: float
+    estimate: float
+    lower: float
+    upper: float
+    games: int
+
+
 def compare_theory_and_simulation(
     k: int,
     simulation_count: int = 10000,
     file_name: str = "theory_vs_simulation.png",
-) -> None:
+    *,
+    workers: int = 1,
+    seed: int | None = None,
+    confidence: float = 0.95,
+) -> Path:
     """理論値とシミュレーション値の違いを視覚的に確認する関数。
 
     2xi (1 <= i <= k)の長方形Chompの先手勝率を理論値とシミュレーションで比較する。
+    理論値は calculate_two_rows_prob_grid で一度に求め、シミュレーションは
+    全ての盤面をまとめて1つのプロセスプールで行う。
+    結果の表は画像と同じ名前のCSVファイルに保存するため、
+    plot_theory_and_simulationで再計算せずにグラフを描き直せる。
 
     Parameters
     ----------
@@ -72,41 +202,143 @@ def compare_theory_and_simulation(
         各盤面でのシミュレーション回数 (デフォルト: 10000)
     file_name : str
         グラフを保存するファイル名
+    workers : int, optional
+        シミュレーションに使用するプロセス数 (デフォルト: 1)
+    seed : int, optional
+        シミュレーションの乱数のシード
+    confidence : float, optional
+        信頼区間の信頼係数 (デフォルト: 0.95)
+
+    Return
+    ----------
+    csv_path : pathlib.Path
+        結果の表を保存したCSVファイルのパス
 
     """
     if k < 1:
         msg: str = "kは1以上の整数でなければなりません。"
         raise ValueError(msg)
 
-    # データを格納する配列
     i_values = np.arange(1, k + 1)
-    theory_values = np.zeros(k)
-    simulation_values = np.zeros(k)
-
-    # 各iについてシミュレーションと理論値を計算
-    for idx, i in enumerate(i_values):
-        print(f"i={i}/{k} を処理中...")
-
-        # 理論値の計算
-        theory_prob = calculate_probability(int(i), int(i))
-        theory_values[idx] = theory_prob
-
-        # シミュレーション値の計算
-        sim_prob = simulate_game(
-            simulation_count=simulation_count,
-            board_rows=2,
-            board_cols=int(i),
+    theory_values = calculate_two_rows_prob_grid(i_values, i_values).diagonal()
+    print(f"{k}個の盤面を{simulation_count}回ずつシミュレーション中...")
+    wins = count_first_player_wins_many(
+        simulation_count,
+        [(2, int(i)) for i in i_values],
+        workers=workers,
+        seed=seed,
+    )
+
+    rows = []
+    for i, theory, win in zip(i_values, theory_values, wins, strict=True):
+        lower, upper = wilson_interval(win, simulation_count, confidence)
+        rows.append(
+            ComparisonRow(
+                int(i),
+                float(theory),
+                win / simulation_count,
+                lower,
+                upper,
+                simulation_count,
+            ),
+        )
+        print(
+            f"i={i}: 理論値: {theory:.4f}, "
+            f"シミュレーション値: {win / simulation_count:.4f} "
+            f"[{lower:.4f}, {upper:.4f}]",
         )
-        simulation_values[idx] = sim_prob
 
-        print(f"  理論値: {theory_prob:.4f}, シミュレーション値: {sim_prob:.4f}")
+    csv_path = (RESULT_DIR / file_name).with_suffix(".csv")
+    save_comparison_table(rows, csv_path)
+    plot_theory_and_simulation(csv_path, file_name)
+    return csv_path
+
+
+def save_comparison_table(rows: Iterable[ComparisonRow], path: Path | str) -> None:
+    """理論値とシミュレーション値の比較表をCSVファイルに保存する関数。
+
+    Parameters
+    ----------
+    rows : Iterable of ComparisonRow
+        比較表の行
+    path : pathlib.Path or str
+        保存先のファイルのパス
+
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(ComparisonRow._fields)
+        # 浮動小数点数は最短の10進表記で書かれ、読み込むと元の値に戻る
+        writer.writerows(rows)
+
+
+def load_comparison_table(path: Path | str) -> list[ComparisonRow]:
+    """save_comparison_tableで保存した比較表を読み込む関数。
+
+    Parameters
+    ----------
+    path : pathlib.Path or str
+        保存したファイルのパス
+
+    Return
+    ----------
+    rows : list of ComparisonRow
+        比較表の行
+
+    """
+    with Path(path).open(newline="", encoding="utf-8") as file:
+        return [
+            ComparisonRow(
+                int(record["i"]),
+                float(record["theory"]),
+                float(record["estimate"]),
+                float(record["lower"]),
+                float(record["upper"]),
+                int(record["games"]),
+            )
+            for record in csv.DictReader(file)
+        ]
+
+
+def plot_theory_and_simulation(
+    csv_path: Path | str,
+    file_name: str | None = None,
+) -> None:
+    """保存した比較表から、理論値とシミュレーション値のグラフを描く関数。
+
+    Parameters
+    ----------
+    csv_path : pathlib.Path or str
+        比較表のCSVファイルのパス
+    file_name : str, optional
+        グラフを保存するファイル名。省略した場合はCSVファイルと同じ名前の画像にする。
+
+    """
+    rows = load_comparison_table(csv_path)
+    if file_name is None:
+        file_name = Path(csv_path).with_suffix(".png").name
+    i_values = np.array([row.i for row in rows])
+    estimates = np.array([row.estimate for row in rows])
+    errors = np.array(
+        [
+            [row.estimate - row.lower for row in rows],
+            [row.upper - row.estimate for row in rows],
+        ],
+    )
+    game_counts = sorted({row.games for row in rows})
+    game_label = (
+        f"N={game_counts[0]}"
+        if len(game_counts) == 1
+        else f"N={game_counts[0]}-{game_counts[-1]}"
+    )
 
-    # グラフの作成
     plt.figure(figsize=(12, 6))
 
     plt.plot(
         i_values,
-        theory_values,
+        [row.theory for row in rows],
         marker="o",
         label="Theory",
         linewidth=2,
@@ -114,20 +346,22 @@ def compare_theory_and_simulation(
         color="blue",
     )
 
-    plt.plot(
+    plt.errorbar(
         i_values,
-        simulation_values,
+        estimates,
+        yerr=errors,
         marker="s",
-        label=f"Simulation (N={simulation_count})",
+        label=f"Simulation ({game_label})",
         linewidth=2,
         markersize=8,
+        capsize=3,
         color="red",
         alpha=0.7,
     )
 
     plt.xlabel("Number of Chocolates in Column 2 (i)")
     plt.ylabel("First Player Winning Probability")
-    plt.title(f"Theory vs Simulation: 2xi Chomp (1 <= i <= {k})")
+    plt.title(f"Theory vs Simulation: 2xi Chomp (1 <= i <= {i_values.max()})")
     plt.legend()
     plt.grid(visible=True, alpha=0.3)
     plt.ylim(0, 1)
@@ -136,8 +370,26 @@ def compare_theory_and_simulation(
     plt.show()
 
 
-def simulate_square_chomp() -> None:
-    """正方形Chompのシミュレーションを複数回実行し、結果を可視化する関数。"""
+def simulate_square_chomp(
+    workers: int = 1,
+    seed: int | None = None,
+    half_width: float | None = None,
+) -> None:
+    """正方形Chompのシミュレーションを複数回実行し、結果を可視化する関数。
+
+    Parameters
+    ----------
+    workers : int, optional
+        シミュレーションに使用するプロセス数 (デフォルト: 1)
+    seed : int, optional
+        シミュレーションの乱数のシード。各盤面にはこのシードからspawnした
+        独立な乱数列を割り当てる。
+    half_width : float, optional
+        指定した場合、各盤面で95%信頼区間の幅の半分がこの値になるまで
+        シミュレーションし、信頼区間をエラーバーで描く。
+        入力したシミュレーション回数はゲーム数の上限として扱う。
+
+    """
     max_edge_length: int = int(
         input(
             "シミュレーションする正方形領域の1辺の最大値を入力してください(デフォルト: 2): ",  # noqa: E501
@@ -157,20 +409,45 @@ def simulate_square_chomp() -> None:
         or "square_chomp_simulation_yyyymmdd_v.png"
     )
     ns = np.arange(1, max_edge_length + 1)
-    probabilities = np.array(
-        [
-            simulate_game(
-                simulation_count=simulate_count,
-                board_rows=edge_length,
-                board_cols=edge_length,
+    seed_sequences = np.random.SeedSequence(seed).spawn(max_edge_length)
+    if half_width is None:
+        probabilities = np.array(
+            [
+                simulate_game(
+                    simulation_count=simulate_count,
+                    board_rows=edge_length,
+                    board_cols=edge_length,
+                    vectorized=True,
+                    workers=workers,
+                    seed=seed_sequences[edge_length - 1],
+                )
+                for edge_length in range(1, max_edge_length + 1)
+            ],
+        )
+        errors = None
+    else:
+        results = [
+            simulate_game_adaptive(
+                edge_length,
+                edge_length,
+                half_width,
+                max_games=simulate_count,
+                workers=workers,
+                seed=seed_sequences[edge_length - 1],
             )
             for edge_length in range(1, max_edge_length + 1)
-        ],
-    )
+        ]
+        probabilities = np.array([result.probability for result in results])
+        errors = np.array(
+            [
+                [result.probability - result.lower for result in results],
+                [result.upper - result.probability for result in results],
+            ],
+        )
     print(probabilities)  # デバッグ用出力
 
     plt.figure(figsize=(10, 6))
-    plt.plot(ns, probabilities, marker="o")
+    plt.errorbar(ns, probabilities, yerr=errors, marker="o", capsize=3)
     plt.title("Probability of nxn Chomp - First Player Winning")
     plt.xlabel("Number of Chocolates in Each Column (n)")
     plt.ylabel("First Player Winning Probability")
@@ -193,11 +470,29 @@ def simulate_with_log() -> None:
         or "10000",
     )
     file_name: str = (
-        input("ログを保存するファイル名を入力して下さい(デフォルト: simulation.log): ")
+        input(
+            "ログを保存するファイル名を入力して下さい"
+            f"(拡張子が{GAME_LOG_SUFFIX}ならバイナリ形式, "
+            "デフォルト: simulation.log): ",
+        )
         or "simulation.log"
     )
 
-    with Path.open(RESULT_DIR / file_name, mode="w") as f:
+    path: Path = RESULT_DIR / file_name
+    if path.suffix == GAME_LOG_SUFFIX:
+        _write_binary_log(path, init_row, init_col, simulation_count)
+    else:
+        _write_text_log(path, init_row, init_col, simulation_count)
+
+
+def _write_text_log(
+    path: Path,
+    init_row: int,
+    init_col: int,
+    simulation_count: int,
+) -> None:
+    """シミュレーションのログをテキスト形式で書き込む内部関数。"""
+    with Path.open(path, mode="w") as f:
         for _ in range(1, simulation_count + 1):
             game: Chomp = Chomp(init_row, init_col)
             next_player: Agent = Agent("先手プレイヤー")
@@ -243,5 +538,34 @@ def simulate_with_log() -> None:
                 f.write("winner: prev_player\n")
 
 
+def _write_binary_log(
+    path: Path,
+    init_row: int,
+    init_col: int,
+    simulation_count: int,
+) -> None:
+    """シミュレーションのログをバイナリ形式で書き込む内部関数。
+
+    手は選ぶたびにGameLogWriterのバッファへ直接書き込むため、
+    ゲームごとに手のリストを保持しない。読み込みにはGameLogReaderを用いる。
+    """
+    next_player: Agent = Agent("先手プレイヤー")
+    prev_player: Agent = Agent("後手プレイヤー")
+    with GameLogWriter(path, init_row, init_col) as writer:
+        for _ in range(simulation_count):
+            game: Chomp = Chomp(init_row, init_col)
+            is_next_player_turn: bool = True
+
+            while not game.is_empty_board():
+                player = next_player if is_next_player_turn else prev_player
+                row, col = player.select_eat_cell(game)
+                writer.add_move(row, col)
+                game.eat(row, col)
+                is_next_player_turn = not is_next_player_turn
+
+            # 最後のセルを食べたプレイヤーが負けとなる
+            writer.end_game(FIRST_PLAYER if is_next_player_turn else SECOND_PLAYER)
+
+
 if __name__ == "__main__":
-    simulate_square_chomp()
+    simulate_square_chomp(workers=os.cpu_count() or 1)
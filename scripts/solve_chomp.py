@@ -0,0 +1,20 @@
+import time
+
+from src.game.chomp_solver import solve_chomp
+
+if __name__ == "__main__":
+    max_edge_length: int = int(
+        input("解析する長方形の1辺の最大値を入力してください(デフォルト: 8): ") or "8",
+    )
+    start = time.perf_counter()
+    # 小さな長方形の盤面は全て最大の長方形に含まれるため、1回の解析で全て求まる
+    solution = solve_chomp(max_edge_length, max_edge_length)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{solution.state_count}個の盤面を{elapsed:.2f}秒で解析しました。"
+        f"P位置の数: {len(solution.get_p_positions())}",
+    )
+    for rows in range(1, max_edge_length + 1):
+        for cols in range(rows, max_edge_length + 1):
+            moves = solution.get_winning_moves((cols,) * rows)
+            print(f"{rows}x{cols} の勝ち手: {moves}")
@@ -1,26 +1,35 @@
-from src.three_rows_chomp_prob import is_multiple_number
+from src.prob.three_rows_denominator_analysis import (
+    DenominatorRecord,
+    analyze_three_rows_denominators,
+    save_denominator_records,
+)
 
 
-def check_prob_denominator(n: int, n1: int, n2: int, n3: int) -> None:
+def check_prob_denominator(n: int, record: DenominatorRecord) -> None:
     """Chompの確率の分母の倍数判定を行い、結果を表示する関数。
 
     Parameters
     ----------
     n: int
         積のループ回数
-    n1: int
-        1行目のマスの個数
-    n2: int
-        2行目のマスの個数
-    n3: int
-        3行目のマスの個数
+    record: DenominatorRecord
+        analyze_three_rows_denominatorsで求めた盤面の分母の構造
 
     Returns
     -------
     None
 
+    Raises
+    ------
+    ValueError
+        積 (n1+n2+n3)(n1+n2+n3-1)...(n1+n2+n3-n) が0になる場合
+
     """
-    if is_multiple_number(n, n1, n2, n3):
+    if n >= sum(record.board):
+        msg: str = "盤面を十分に大きくしてください"
+        raise ValueError(msg)
+
+    if record.falling_factorial_length >= n + 1:
         print(f"(n1 + n2 + n3) permutation {n} はChompの確率の分母の倍数です。 ")
     else:
         print(
@@ -38,8 +47,16 @@ if __name__ == "__main__":
         (3, 2, 1),
     ]
 
-    for n1, n2, n3 in boards:
-        check_prob_denominator(n, n1, n2, n3)
+    # 全ての盤面を含む表を1回だけ計算する
+    records = {
+        record.board: record
+        for record in analyze_three_rows_denominators(
+            max(board[0] for board in boards),
+            max(board[1] for board in boards),
+            max(board[2] for board in boards),
+        )
+    }
+    save_denominator_records(records.values())
 
-    for n1, n2, n3 in boards:
-        check_prob_denominator(n, n1, n2, n3)
+    for board in boards:
+        check_prob_denominator(n, records[board])
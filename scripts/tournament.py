@@ -0,0 +1,30 @@
+import functools
+import os
+
+from config import RESULT_DIR
+from src.game.agent import Agent, PerfectAgent
+from src.game.tournament import AgentFactory, run_tournament
+
+if __name__ == "__main__":
+    games_per_pairing: int = int(
+        input("組み合わせごとの対戦数を入力してください(デフォルト: 2000): ") or "2000",
+    )
+    agents: dict[str, AgentFactory] = {
+        "random": Agent,
+        "perfect": PerfectAgent,
+        "epsilon0.1": functools.partial(PerfectAgent, epsilon=0.1),
+        "epsilon0.5": functools.partial(PerfectAgent, epsilon=0.5),
+    }
+    boards = [(3, 3), (4, 5), (6, 6)]
+    # 中断した場合も、同じファイルを指定して再実行すれば続きから対戦する
+    result = run_tournament(
+        agents,
+        boards,
+        games_per_pairing,
+        RESULT_DIR / "tournament.jsonl",
+        workers=os.cpu_count() or 1,
+        seed=0,
+    )
+    for board in boards:
+        print(result.format_win_rate_matrix(board))
+        print()
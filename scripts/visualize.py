@@ -1,6 +1,7 @@
 import matplotlib.pyplot as plt
+import numpy as np
 
-from src.recurrence_relation import calculate_probability
+from src.prob.two_rows_chomp_prob import calculate_two_rows_prob_grid
 
 
 def visualize_probability(max_n: int) -> None:
@@ -13,9 +14,8 @@ def visualize_probability(max_n: int) -> None:
 
     """
     ns: list[int] = list(range(1, max_n + 1))
-    probabilities: list[float] = [
-        calculate_probability(n, n) for n in range(1, max_n + 1)
-    ]
+    grid = calculate_two_rows_prob_grid(ns, ns)
+    probabilities: list[float] = grid.diagonal().tolist()
     print(probabilities)  # デバッグ用出力
 
     plt.figure(figsize=(10, 6))
@@ -41,15 +41,15 @@ def visualize_probability_2d(max_n: int) -> None:
     """
     plt.figure(figsize=(12, 8))
 
+    # 全ての (n, k) の勝率をまとめて計算する
+    all_n_values = np.arange(1, max_n + 1)
+    grid = calculate_two_rows_prob_grid(all_n_values, all_n_values)
+
     # 各kについて、nを動かして線をプロット
     for k in range(1, max_n + 1):
-        n_values: list[int] = []
-        prob_values: list[float] = []
-
         # kを固定して、nをkからmax_nまで動かす
-        for n in range(k, max_n + 1):
-            n_values.append(n)
-            prob_values.append(calculate_probability(n, k))
+        n_values: list[int] = all_n_values[k - 1 :].tolist()
+        prob_values: list[float] = grid[k - 1 :, k - 1].tolist()
 
         # k値ごとに異なる色で線をプロット
         plt.plot(
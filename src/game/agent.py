@@ -1,6 +1,9 @@
+from pathlib import Path
+
 import numpy as np
 
 from src.game.chomp import Chomp
+from src.game.chomp_solver import DEFAULT_SOLUTION_DIR, load_chomp_solution
 
 
 class Agent:
@@ -12,12 +15,17 @@ class Agent:
     ----------
     name : str
         エージェントの名前。
+    rng : numpy.random.Generator
+        セルの選択に用いる乱数生成器。
 
     """
 
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, rng: np.random.Generator | None = None) -> None:
         """Agentクラスのコンストラクタ。"""
         self.name = name
+        self.rng: np.random.Generator = (
+            rng if rng is not None else np.random.default_rng()
+        )
 
     def select_eat_cell(self, game: Chomp) -> tuple[int, int]:
         """食べるセルをランダムに選択する。
@@ -33,16 +41,77 @@ class Agent:
             選択されたセルの行と列のインデックス。
 
         """
-        # 盤面からTrue(食べられる)セルの位置を取得
-        board = game.get_board()
-        valid_positions = np.argwhere(board)
+        cell_count = game.get_cell_count()
 
-        if len(valid_positions) == 0:
+        if cell_count == 0:
             msg = "No valid cells to select."
             raise ValueError(msg)
 
-        # ランダムに1つ選択
-        rng = np.random.default_rng()
-        idx = rng.integers(len(valid_positions))
-        row, col = valid_positions[idx]
-        return int(row), int(col)
+        # 残っているセルを行優先で並べたときの番号を一様ランダムに1つ選択
+        idx = int(self.rng.integers(cell_count))
+        return game.get_cell_by_index(idx)
+
+
+class PerfectAgent(Agent):
+    """完全なプレイの表に従ってセルを選ぶエージェントクラス。
+
+    盤面の大きさごとの勝敗と選ぶ手の表 (ChompSolution) を最初に手を選ぶときに
+    load_chomp_solutionで読み込み、以降は盤面の番号から表を1回引くだけで手を決める。
+    表は同じ大きさの盤面を扱う全てのエージェントで共有される。
+    epsilonを正にすると、その確率で一様ランダムな手を選ぶ。
+
+    Attributes
+    ----------
+    name : str
+        エージェントの名前。
+    rng : numpy.random.Generator
+        ランダムな手の選択に用いる乱数生成器。
+    epsilon : float
+        一様ランダムな手を選ぶ確率。0なら常に完全なプレイをする。
+    solution_dir : pathlib.Path
+        表を保存するディレクトリ。
+
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rng: np.random.Generator | None = None,
+        epsilon: float = 0.0,
+        solution_dir: Path | str = DEFAULT_SOLUTION_DIR,
+    ) -> None:
+        """PerfectAgentクラスのコンストラクタ。"""
+        super().__init__(name, rng)
+        if not 0 <= epsilon <= 1:
+            msg: str = "epsilonは0以上1以下でなければなりません。"
+            raise ValueError(msg)
+        self.epsilon = epsilon
+        self.solution_dir = Path(solution_dir)
+
+    def select_eat_cell(self, game: Chomp) -> tuple[int, int]:
+        """食べるセルを表に従って選択する。
+
+        手番のプレイヤーが勝てる盤面では勝ち手を、負ける盤面では1マスだけを食べる手を選ぶ。
+
+        Parameters
+        ----------
+        game : Chomp
+            現在のChompゲームの状態。
+
+        Returns
+        -------
+        tuple of int
+            選択されたセルの行と列のインデックス。
+
+        """
+        if self.epsilon > 0 and self.rng.random() < self.epsilon:
+            return super().select_eat_cell(game)
+        if game.is_empty_board():
+            msg = "No valid cells to select."
+            raise ValueError(msg)
+        solution = load_chomp_solution(
+            game.get_board_rows(),
+            game.get_board_cols(),
+            self.solution_dir,
+        )
+        return solution.get_best_move(game.get_row_lengths())
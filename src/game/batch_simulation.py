@@ -0,0 +1,545 @@
+import math
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from statistics import NormalDist
+from typing import NamedTuple
+
+import numpy as np
+
+from src.game.chomp_solver import (
+    DEFAULT_SOLUTION_DIR,
+    ChompSolution,
+    load_chomp_solution,
+)
+from src.utilities import wilson_interval
+
+DEFAULT_CHUNK_SIZE: int = 4096  # 乱数列を割り当てる単位となるゲーム数
+# (先手, 後手) が一様ランダムな手を選ぶ確率。1は一様ランダム、0は完全なプレイ
+RANDOM_PLAY: tuple[float, float] = (1.0, 1.0)
+
+# チャンク: (ゲーム数, 行数, 列数, SeedSequence, epsilons, 表のディレクトリ)
+_Chunk = tuple[int, int, int, np.random.SeedSequence, tuple[float, float], Path | str]
+
+
+class AdaptiveSimulationResult(NamedTuple):
+    """信頼区間の幅で打ち切る一括シミュレーションの結果。
+
+    Attributes
+    ----------
+    probability : float
+        先手の勝率の推定値
+    lower : float
+        Wilsonスコア信頼区間の下限
+    upper : float
+        Wilsonスコア信頼区間の上限
+    game_count : int
+        シミュレーションしたゲームの数
+    first_player_wins : int
+        先手の勝ち数
+
+    """
+
+    probability: float
+    lower: float
+    upper: float
+    game_count: int
+    first_player_wins: int
+
+    @property
+    def half_width(self) -> float:
+        """信頼区間の幅の半分。"""
+        return (self.upper - self.lower) / 2
+
+
+def count_first_player_wins(
+    game_count: int,
+    board_rows: int,
+    board_cols: int,
+    rng: np.random.Generator | None = None,
+    batch_size: int = 100_000,
+    *,
+    epsilons: tuple[float, float] = RANDOM_PLAY,
+    solution_dir: Path | str = DEFAULT_SOLUTION_DIR,
+) -> int:
+    """一様ランダムな手を打ち合うChompを一括でシミュレーションし、先手の勝ち数を返す関数。
+
+    各ゲームの盤面を行の長さの列として (ゲーム数, 行数) の整数配列にまとめ、
+    生きている全ゲームの手番をnumpyで同時に進める。
+    各手番では残っているセルの中から一様ランダムに1つを選ぶため、
+    Agentクラスを用いたシミュレーションと同じ分布に従う。
+    epsilonsを指定すると、各プレイヤーは確率 1 - epsilon で完全なプレイの表
+    (load_chomp_solution) に従って手を選び、PerfectAgentと同じ分布に従う。
+
+    Parameters
+    ----------
+    game_count : int
+        シミュレーションするゲームの数。
+    board_rows : int
+        盤面の行数。
+    board_cols : int
+        盤面の列数。
+    rng : numpy.random.Generator, optional
+        乱数生成器。省略した場合は新しく生成する。
+    batch_size : int, optional
+        同時に保持するゲームの最大数 (デフォルト: 100000)
+    epsilons : tuple of float, optional
+        (先手, 後手) が一様ランダムな手を選ぶ確率 (デフォルト: 両者とも1)
+    solution_dir : pathlib.Path or str, optional
+        完全なプレイの表を保存するディレクトリ
+
+    Returns
+    -------
+    int
+        先手の勝ち数。
+
+    """
+    if game_count < 0:
+        msg: str = "シミュレーション回数は0以上の整数でなければなりません。"
+        raise ValueError(msg)
+    if batch_size < 1:
+        msg: str = "batch_sizeは1以上の整数でなければなりません。"
+        raise ValueError(msg)
+    if rng is None:
+        rng = np.random.default_rng()
+
+    _validate_epsilons(epsilons)
+
+    # 空の盤面では先手が手を打てないので先手の勝ちとなる
+    if board_rows == 0 or board_cols == 0:
+        return game_count
+
+    solution = None
+    if min(epsilons) < 1:
+        solution = load_chomp_solution(board_rows, board_cols, solution_dir)
+    wins: int = 0
+    for start in range(0, game_count, batch_size):
+        size = min(batch_size, game_count - start)
+        wins += _count_first_player_wins_batch(
+            size,
+            board_rows,
+            board_cols,
+            rng,
+            epsilons=epsilons,
+            solution=solution,
+        )
+    return wins
+
+
+def count_first_player_wins_parallel(
+    game_count: int,
+    board_rows: int,
+    board_cols: int,
+    *,
+    workers: int = 1,
+    seed: int | np.random.SeedSequence | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    epsilons: tuple[float, float] = RANDOM_PLAY,
+    solution_dir: Path | str = DEFAULT_SOLUTION_DIR,
+) -> int:
+    """複数のプロセスで一括シミュレーションを行い、先手の勝ち数を返す関数。
+
+    ゲームをchunk_size個ずつのチャンクに分け、各チャンクには1つの
+    numpy.random.SeedSequenceからspawnした独立な乱数列を割り当てる。
+    チャンクの分け方はworkersに依存しないため、同じseedであれば
+    プロセス数によらず全く同じ結果が得られる。
+
+    Parameters
+    ----------
+    game_count : int
+        シミュレーションするゲームの数。
+    board_rows : int
+        盤面の行数。
+    board_cols : int
+        盤面の列数。
+    workers : int, optional
+        使用するプロセス数 (デフォルト: 1)
+    seed : int or numpy.random.SeedSequence, optional
+        乱数列の元になるシード。省略した場合は毎回異なる結果になる。
+    chunk_size : int, optional
+        1つの乱数列で進めるゲームの数 (デフォルト: 4096)
+    epsilons : tuple of float, optional
+        (先手, 後手) が一様ランダムな手を選ぶ確率 (デフォルト: 両者とも1)
+    solution_dir : pathlib.Path or str, optional
+        完全なプレイの表を保存するディレクトリ
+
+    Returns
+    -------
+    int
+        先手の勝ち数。
+
+    """
+    if game_count < 0:
+        msg: str = "シミュレーション回数は0以上の整数でなければなりません。"
+        raise ValueError(msg)
+    if workers < 1:
+        msg: str = "workersは1以上の整数でなければなりません。"
+        raise ValueError(msg)
+    if chunk_size < 1:
+        msg: str = "chunk_sizeは1以上の整数でなければなりません。"
+        raise ValueError(msg)
+
+    if isinstance(seed, np.random.SeedSequence):
+        seed_sequence = seed
+    else:
+        seed_sequence = np.random.SeedSequence(seed)
+    _prepare_solutions([(board_rows, board_cols)], epsilons, solution_dir)
+    chunk_count = -(-game_count // chunk_size)
+    chunks = [
+        (
+            min(chunk_size, game_count - i * chunk_size),
+            board_rows,
+            board_cols,
+            child,
+            epsilons,
+            solution_dir,
+        )
+        for i, child in enumerate(seed_sequence.spawn(chunk_count))
+    ]
+
+    if workers == 1 or chunk_count <= 1:
+        return sum(_count_first_player_wins_chunk(chunk) for chunk in chunks)
+
+    with ProcessPoolExecutor(max_workers=min(workers, chunk_count)) as executor:
+        return sum(executor.map(_count_first_player_wins_chunk, chunks))
+
+
+def count_first_player_wins_many(
+    game_count: int,
+    boards: Sequence[tuple[int, int]],
+    *,
+    workers: int = 1,
+    seed: int | np.random.SeedSequence | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    epsilons: tuple[float, float] = RANDOM_PLAY,
+    solution_dir: Path | str = DEFAULT_SOLUTION_DIR,
+) -> list[int]:
+    """複数の盤面の一括シミュレーションを1つのプロセスプールで行う関数。
+
+    全ての盤面のチャンクをまとめてプールに投入するため、盤面ごとに
+    count_first_player_wins_parallelを呼ぶ場合と異なり、小さな盤面や
+    ゲーム数の少ない盤面が多くてもプロセスが遊ばない。
+    j番目の盤面には seed からspawnしたj番目の乱数列を割り当てるため、
+    結果は count_first_player_wins_parallel(seed=その乱数列) と一致する。
+
+    Parameters
+    ----------
+    game_count : int
+        各盤面でシミュレーションするゲームの数。
+    boards : Sequence of tuple of int
+        (行数, 列数) の組の列。
+    workers : int, optional
+        使用するプロセス数 (デフォルト: 1)
+    seed : int or numpy.random.SeedSequence, optional
+        乱数列の元になるシード。同じシードであればworkersによらず同じ結果になる。
+    chunk_size : int, optional
+        1つの乱数列で進めるゲームの数 (デフォルト: 4096)
+    epsilons : tuple of float, optional
+        (先手, 後手) が一様ランダムな手を選ぶ確率 (デフォルト: 両者とも1)
+    solution_dir : pathlib.Path or str, optional
+        完全なプレイの表を保存するディレクトリ
+
+    Returns
+    -------
+    list of int
+        各盤面の先手の勝ち数。
+
+    """
+    if game_count < 0:
+        msg: str = "シミュレーション回数は0以上の整数でなければなりません。"
+        raise ValueError(msg)
+    if workers < 1:
+        msg: str = "workersは1以上の整数でなければなりません。"
+        raise ValueError(msg)
+    if chunk_size < 1:
+        msg: str = "chunk_sizeは1以上の整数でなければなりません。"
+        raise ValueError(msg)
+
+    if isinstance(seed, np.random.SeedSequence):
+        seed_sequence = seed
+    else:
+        seed_sequence = np.random.SeedSequence(seed)
+    _prepare_solutions(boards, epsilons, solution_dir)
+    chunk_count = -(-game_count // chunk_size)
+    chunks: list[_Chunk] = []
+    board_indices = []
+    for index, ((board_rows, board_cols), board_seed) in enumerate(
+        zip(boards, seed_sequence.spawn(len(boards)), strict=True),
+    ):
+        for i, child in enumerate(board_seed.spawn(chunk_count)):
+            chunks.append(
+                (
+                    min(chunk_size, game_count - i * chunk_size),
+                    board_rows,
+                    board_cols,
+                    child,
+                    epsilons,
+                    solution_dir,
+                ),
+            )
+            board_indices.append(index)
+
+    if workers == 1 or len(chunks) <= 1:
+        chunk_wins = [_count_first_player_wins_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            chunk_wins = list(executor.map(_count_first_player_wins_chunk, chunks))
+
+    wins = [0] * len(boards)
+    for index, chunk_win in zip(board_indices, chunk_wins, strict=True):
+        wins[index] += chunk_win
+    return wins
+
+
+def count_first_player_wins_adaptive(
+    board_rows: int,
+    board_cols: int,
+    half_width: float,
+    *,
+    confidence: float = 0.95,
+    max_games: int = 10_000_000,
+    min_batch_games: int = 16 * DEFAULT_CHUNK_SIZE,
+    workers: int = 1,
+    seed: int | np.random.SeedSequence | None = None,
+    epsilons: tuple[float, float] = RANDOM_PLAY,
+    solution_dir: Path | str = DEFAULT_SOLUTION_DIR,
+) -> AdaptiveSimulationResult:
+    """信頼区間が十分に狭くなるまで一括シミュレーションを繰り返す関数。
+
+    ゲームを1回ずつまとめて行い、その都度先手の勝率のWilsonスコア信頼区間を
+    計算する。区間の幅の半分がhalf_width以下になるか、ゲーム数がmax_gamesに
+    達したら終了する。次に行うゲーム数は、それまでの推定値から必要なゲーム数を
+    見積もって決めるため、勝率が0や1に近い盤面では少ないゲーム数で終わる。
+
+    Parameters
+    ----------
+    board_rows : int
+        盤面の行数。
+    board_cols : int
+        盤面の列数。
+    half_width : float
+        目標とする信頼区間の幅の半分。
+    confidence : float, optional
+        信頼係数 (デフォルト: 0.95)
+    max_games : int, optional
+        シミュレーションするゲームの数の上限 (デフォルト: 10000000)
+    min_batch_games : int, optional
+        1回にまとめて行うゲームの数の下限 (デフォルト: 65536)
+    workers : int, optional
+        使用するプロセス数 (デフォルト: 1)
+    seed : int or numpy.random.SeedSequence, optional
+        乱数列の元になるシード。同じシードであればworkersによらず同じ結果になる。
+    epsilons : tuple of float, optional
+        (先手, 後手) が一様ランダムな手を選ぶ確率 (デフォルト: 両者とも1)
+    solution_dir : pathlib.Path or str, optional
+        完全なプレイの表を保存するディレクトリ
+
+    Returns
+    -------
+    AdaptiveSimulationResult
+        勝率の推定値、信頼区間、ゲーム数
+
+    """
+    if half_width <= 0:
+        msg: str = "half_widthは正の数でなければなりません。"
+        raise ValueError(msg)
+    if max_games < 1 or min_batch_games < 1:
+        msg: str = "max_gamesとmin_batch_gamesは1以上の整数でなければなりません。"
+        raise ValueError(msg)
+
+    if isinstance(seed, np.random.SeedSequence):
+        seed_sequence = seed
+    else:
+        seed_sequence = np.random.SeedSequence(seed)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+
+    game_count = 0
+    wins = 0
+    lower, upper = 0.0, 1.0
+    while game_count < max_games and (upper - lower) / 2 > half_width:
+        # 現在の推定値から、目標の幅に必要なゲーム数を正規近似で見積もる。
+        # 最初の回は推定値がないため、min_batch_gamesだけ行う
+        required = 0
+        if game_count > 0:
+            probability = wins / game_count
+            required = math.ceil(
+                z**2 * probability * (1 - probability) / half_width**2,
+            )
+        batch_games = min(
+            max(required - game_count, min_batch_games),
+            max_games - game_count,
+        )
+        # spawnは呼ぶたびに異なる子を返すため、各回の乱数列は互いに独立になる
+        wins += count_first_player_wins_parallel(
+            batch_games,
+            board_rows,
+            board_cols,
+            workers=workers,
+            seed=seed_sequence.spawn(1)[0],
+            epsilons=epsilons,
+            solution_dir=solution_dir,
+        )
+        game_count += batch_games
+        lower, upper = wilson_interval(wins, game_count, confidence)
+
+    return AdaptiveSimulationResult(
+        wins / game_count,
+        lower,
+        upper,
+        game_count,
+        wins,
+    )
+
+
+def _count_first_player_wins_chunk(chunk: _Chunk) -> int:
+    """1チャンク分のゲームをそのチャンク専用の乱数列でシミュレーションする内部関数。
+
+    Parameters
+    ----------
+    chunk : tuple
+        (ゲーム数, 行数, 列数, チャンクのSeedSequence, epsilons, 表のディレクトリ)
+
+    Returns
+    -------
+    int
+        先手の勝ち数。
+
+    """
+    game_count, board_rows, board_cols, seed_sequence, epsilons, solution_dir = chunk
+    rng = np.random.default_rng(seed_sequence)
+    return count_first_player_wins(
+        game_count,
+        board_rows,
+        board_cols,
+        rng,
+        epsilons=epsilons,
+        solution_dir=solution_dir,
+    )
+
+
+def _validate_epsilons(epsilons: tuple[float, float]) -> None:
+    """ランダムな手を選ぶ確率が0以上1以下であることを確認する内部関数。"""
+    if len(epsilons) != 2 or not all(0 <= epsilon <= 1 for epsilon in epsilons):
+        msg: str = "epsilonsは0以上1以下の数の組 (先手, 後手) でなければなりません。"
+        raise ValueError(msg)
+
+
+def _prepare_solutions(
+    boards: Sequence[tuple[int, int]],
+    epsilons: tuple[float, float],
+    solution_dir: Path | str,
+) -> None:
+    """完全なプレイの表を、ワーカーに配る前に親プロセスで用意しておく内部関数。
+
+    表が保存されていなければ親プロセスで1回だけ求めて保存するため、
+    各ワーカーは保存された表を読み込むだけでよい。
+    """
+    _validate_epsilons(epsilons)
+    if min(epsilons) < 1:
+        for board_rows, board_cols in set(boards):
+            if board_rows > 0 and board_cols > 0:
+                load_chomp_solution(board_rows, board_cols, solution_dir)
+
+
+def _count_first_player_wins_batch(
+    game_count: int,
+    board_rows: int,
+    board_cols: int,
+    rng: np.random.Generator,
+    *,
+    epsilons: tuple[float, float] = RANDOM_PLAY,
+    solution: ChompSolution | None = None,
+) -> int:
+    """1バッチ分のゲームを同時に進め、先手の勝ち数を返す内部関数。
+
+    Parameters
+    ----------
+    game_count : int
+        バッチ内のゲームの数。
+    board_rows : int
+        盤面の行数。
+    board_cols : int
+        盤面の列数。
+    rng : numpy.random.Generator
+        乱数生成器。
+    epsilons : tuple of float, optional
+        (先手, 後手) が一様ランダムな手を選ぶ確率 (デフォルト: 両者とも1)
+    solution : ChompSolution, optional
+        完全なプレイの表。epsilonsのいずれかが1未満の場合は必須。
+
+    Returns
+    -------
+    int
+        先手の勝ち数。
+
+    """
+    row_lengths = np.full((game_count, board_rows), board_cols, dtype=np.int64)
+    cell_counts = np.full(game_count, board_rows * board_cols, dtype=np.int64)
+    row_indices = np.arange(board_rows)
+    wins: int = 0
+    is_first_player_turn: bool = True
+
+    while row_lengths.shape[0] > 0:
+        epsilon = epsilons[0] if is_first_player_turn else epsilons[1]
+        if epsilon >= 1:
+            rows, cols = _select_random_cells(row_lengths, cell_counts, rng)
+        else:
+            # 確率epsilonで一様ランダムな手を、それ以外は表の手を選ぶ
+            is_random = (
+                rng.random(len(row_lengths)) < epsilon
+                if epsilon > 0
+                else np.zeros(len(row_lengths), dtype=np.bool_)
+            )
+            rows = np.empty(len(row_lengths), dtype=np.int64)
+            cols = np.empty(len(row_lengths), dtype=np.int64)
+            rows[is_random], cols[is_random] = _select_random_cells(
+                row_lengths[is_random],
+                cell_counts[is_random],
+                rng,
+            )
+            rows[~is_random], cols[~is_random] = solution.get_best_moves_many(
+                row_lengths[~is_random],
+            )
+
+        # 選んだセルから右下の部分を食べる
+        np.minimum(
+            row_lengths,
+            cols[:, np.newaxis],
+            out=row_lengths,
+            where=row_indices >= rows[:, np.newaxis],
+        )
+        cell_counts = row_lengths.sum(axis=1)
+
+        # 盤面を空にした(左上のセルを食べた)プレイヤーの負け
+        finished = cell_counts == 0
+        if not is_first_player_turn:
+            wins += int(np.count_nonzero(finished))
+        if finished.any():
+            alive = ~finished
+            row_lengths = row_lengths[alive]
+            cell_counts = cell_counts[alive]
+        is_first_player_turn = not is_first_player_turn
+
+    return wins
+
+
+def _select_random_cells(
+    row_lengths: np.ndarray,
+    cell_counts: np.ndarray,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, np.ndarray]:
+    """各ゲームで残っているセルを一様ランダムに1つずつ選ぶ内部関数。
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        (選んだセルの行, 選んだセルの列)
+
+    """
+    # 残っているセルを行優先で数えたときのk番目のセルを選ぶ
+    k = rng.integers(cell_counts)
+    cumulative = np.cumsum(row_lengths, axis=1)
+    rows = np.count_nonzero(cumulative <= k[:, np.newaxis], axis=1)
+    game_indices = np.arange(row_lengths.shape[0])
+    cols = k - (cumulative[game_indices, rows] - row_lengths[game_indices, rows])
+    return rows, cols
@@ -1,20 +1,45 @@
 import numpy as np
 import numpy.typing as npt
 
+from src.game.fenwick_tree import FenwickTree
+
 
 class Chomp:
     """Chompの盤面に関するクラス。
 
+    Chompで到達可能な盤面は常にヤング図形(各行の長さが非増加)になるため、
+    盤面を各行に残っているセルの数の列として保持する。
+    行の長さの接頭辞和はFenwick木で管理し、残っているセルのうちk番目のセルを
+    O(log 行数)で求められるようにしている。
+
     Attributes
     ----------
-    board : numpy.ndarray
-        盤面の状態を表す2次元numpy配列。Trueは食べられていない部分、Falseは食べられた部分を示す。
+    row_lengths : list of int
+        各行に残っているセルの数。常に非増加列となる。
+    cols : int
+        初期盤面の列数。
 
     """
 
     def __init__(self, row: int, col: int) -> None:
         """Chompクラスのコンストラクタ。"""
-        self.board: npt.NDArray[np.bool_] = np.ones((row, col), dtype=bool)
+        if row < 0 or col < 0:
+            msg: str = "盤面の大きさは0以上の整数でなければなりません。"
+            raise ValueError(msg)
+        self.row_lengths: list[int] = [col] * row
+        self.cols: int = col
+        self._cell_count: int = row * col
+        self._row_length_tree: FenwickTree = FenwickTree(self.row_lengths)
+
+    @property
+    def board(self) -> npt.NDArray[np.bool_]:
+        """盤面の状態を表す2次元numpy配列。
+
+        Trueは食べられていない部分、Falseは食べられた部分を示す。
+        呼び出しのたびに行の長さから生成されるため、書き換えても盤面には反映されない。
+        """
+        lengths = np.asarray(self.row_lengths, dtype=np.int64).reshape(-1, 1)
+        return np.arange(self.cols) < lengths
 
     def get_board(self) -> npt.NDArray[np.bool_]:
         """盤面の状態を取得する。
@@ -27,6 +52,47 @@ class Chomp:
         """
         return self.board
 
+    def get_row_lengths(self) -> tuple[int, ...]:
+        """各行に残っているセルの数を取得する。
+
+        Returns
+        -------
+        tuple of int
+            各行に残っているセルの数(非増加列)。
+
+        """
+        return tuple(self.row_lengths)
+
+    def get_cell_count(self) -> int:
+        """盤面に残っているセルの総数を取得する。
+
+        Returns
+        -------
+        int
+            盤面に残っているセルの総数。
+
+        """
+        return self._cell_count
+
+    def get_cell_by_index(self, index: int) -> tuple[int, int]:
+        """残っているセルを行優先で並べたときのindex番目のセルを取得する。
+
+        Parameters
+        ----------
+        index : int
+            セルの番号。0以上、残っているセルの総数未満でなければならない。
+
+        Returns
+        -------
+        tuple of int
+            セルの行と列のインデックス。
+
+        """
+        if index < 0 or index >= self._cell_count:
+            msg: str = "セルの番号が範囲外です"
+            raise IndexError(msg)
+        return self._row_length_tree.find(index)
+
     def get_board_rows(self) -> int:
         """盤面の行数を取得する。
 
@@ -36,7 +102,7 @@ class Chomp:
             盤面の行数。
 
         """
-        return self.board.shape[0]
+        return len(self.row_lengths)
 
     def get_board_cols(self) -> int:
         """盤面の列数を取得する。
@@ -47,7 +113,7 @@ class Chomp:
             盤面の列数。
 
         """
-        return self.board.shape[1]
+        return self.cols
 
     def get_board_cell(self, row: int, col: int) -> bool:
         """指定された位置の盤面の状態を取得する。
@@ -65,13 +131,8 @@ class Chomp:
             指定された位置が食べられていない場合はTrue、食べられている場合はFalse。
 
         """
-        if row < 0 or row >= self.get_board_rows():
-            msg: str = "行のインデックスが範囲外です"
-            raise IndexError(msg)
-        if col < 0 or col >= self.get_board_cols():
-            msg: str = "列のインデックスが範囲外です"
-            raise IndexError(msg)
-        return bool(self.board[row, col])
+        self._check_cell_index(row, col)
+        return col < self.row_lengths[row]
 
     def get_row_cell_count(self, row: int) -> int:
         """指定された行の残っているセルの数を取得する。
@@ -90,7 +151,7 @@ class Chomp:
         if row < 0 or row >= self.get_board_rows():
             msg: str = "行のインデックスが範囲外です"
             raise IndexError(msg)
-        return int(np.sum(self.board[row]))
+        return self.row_lengths[row]
 
     def get_col_cell_count(self, col: int) -> int:
         """指定された列の残っているセルの数を取得する。
@@ -109,7 +170,13 @@ class Chomp:
         if col < 0 or col >= self.get_board_cols():
             msg: str = "列のインデックスが範囲外です"
             raise IndexError(msg)
-        return int(np.sum(self.board[:, col]))
+        # 行の長さは非増加なので、長さがcol以下になった行で打ち切れる
+        count: int = 0
+        for length in self.row_lengths:
+            if length <= col:
+                break
+            count += 1
+        return count
 
     def eat(self, row: int, col: int) -> None:
         """指定された位置から右下の部分を食べる。
@@ -122,13 +189,16 @@ class Chomp:
             食べ始める列のインデックス。
 
         """
-        if row < 0 or row >= self.get_board_rows():
-            msg: str = "行のインデックスが範囲外です"
-            raise IndexError(msg)
-        if col < 0 or col >= self.get_board_cols():
-            msg: str = "列のインデックスが範囲外です"
-            raise IndexError(msg)
-        self.board[row:, col:] = False
+        self._check_cell_index(row, col)
+        row_lengths = self.row_lengths
+        for r in range(row, len(row_lengths)):
+            length = row_lengths[r]
+            if length <= col:
+                # 以降の行はさらに短いので食べる部分はない
+                break
+            self._cell_count -= length - col
+            self._row_length_tree.add(r, col - length)
+            row_lengths[r] = col
 
     def is_empty_board(self) -> bool:
         """盤面が空であるかどうかを判定する。
@@ -139,7 +209,18 @@ class Chomp:
             盤面が空である場合はTrue、そうでない場合はFalse。
 
         """
-        return not bool(self.board[0, 0])
+        return self._cell_count == 0
+
+    def is_game_over(self) -> bool:
+        """ゲームが終了したかどうかを判定する。
+
+        Returns
+        -------
+        bool
+            盤面が空である場合はTrue、そうでない場合はFalse。
+
+        """
+        return self.is_empty_board()
 
     def is_eatable_cell(self, row: int, col: int) -> bool:
         """指定された位置のセルが食べられるかどうかを判定する。
@@ -157,13 +238,8 @@ class Chomp:
             指定された位置のセルが食べられる場合はTrue、そうでない場合はFalse。
 
         """
-        if row < 0 or row >= self.get_board_rows():
-            msg: str = "行のインデックスが範囲外です"
-            raise IndexError(msg)
-        if col < 0 or col >= self.get_board_cols():
-            msg: str = "列のインデックスが範囲外です"
-            raise IndexError(msg)
-        return bool(self.board[row, col])
+        self._check_cell_index(row, col)
+        return col < self.row_lengths[row]
 
     def display(self) -> None:
         """盤面の状態を表示する。"""
@@ -172,9 +248,32 @@ class Chomp:
         print("   " + " ".join(str(i) for i in range(col_count)))
 
         # 各行を行インデックスと共に表示
-        for i in range(self.get_board_rows()):
+        for i, length in enumerate(self.row_lengths):
             row_display = " ".join(
-                ["O" if cell else "X" for cell in self.board[i]],
+                ["O" if j < length else "X" for j in range(col_count)],
             )
             print(f"{i}: {row_display}")
         print()
+
+    def _check_cell_index(self, row: int, col: int) -> None:
+        """セルのインデックスが盤面の範囲内であるかを確認する。
+
+        Parameters
+        ----------
+        row : int
+            行のインデックス。
+        col : int
+            列のインデックス。
+
+        Raises
+        ------
+        IndexError
+            インデックスが範囲外の場合
+
+        """
+        if row < 0 or row >= self.get_board_rows():
+            msg: str = "行のインデックスが範囲外です"
+            raise IndexError(msg)
+        if col < 0 or col >= self.get_board_cols():
+            msg: str = "列のインデックスが範囲外です"
+            raise IndexError(msg)
@@ -0,0 +1,460 @@
+import functools
+import itertools
+import os
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+from config import RESULT_DIR
+from src.game.chomp import Chomp
+from src.young_diagram import YoungDiagramIndex
+
+SOLVER_BLOCK_SIZE: int = 1 << 16  # 子の番号をまとめて計算する盤面の数
+DEFAULT_SOLUTION_DIR: Path = RESULT_DIR / "chomp_solutions"
+
+
+class ChompSolution:
+    """完全なプレイにおけるChompの盤面の勝敗の表。
+
+    rows x cols の長方形に含まれる全てのヤング図形 (行の長さの非増加列) に
+    YoungDiagramIndexの番号を付け、手番のプレイヤーが勝つ盤面かどうかを
+    1盤面1ビットの配列で保持する。
+    最後のセルを食べたプレイヤーが負けとなるため、空の盤面は手番のプレイヤーの勝ちとする。
+
+    Attributes
+    ----------
+    rows : int
+        長方形の行数
+    cols : int
+        長方形の列数
+    index : YoungDiagramIndex
+        盤面と番号の対応
+    winning_bits : numpy.ndarray
+        番号rの盤面で手番のプレイヤーが勝つとき、r番目のビットが1になるuint8配列。
+        ビットは各バイトの下位から順に並ぶ。
+    best_moves : numpy.ndarray
+        番号rの盤面で選ぶ手のセル (行, 列) を 行 * cols + 列 で表した整数配列。
+        N位置では勝ち手の1つ、P位置では最後の行の右端の1マスだけを食べる手、
+        空の盤面では-1になる。
+
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        winning_bits: npt.NDArray[np.uint8],
+        best_moves: npt.NDArray[np.signedinteger],
+    ) -> None:
+        """ChompSolutionクラスのコンストラクタ。"""
+        self.rows = rows
+        self.cols = cols
+        self.index = YoungDiagramIndex(rows, cols)
+        self.winning_bits = winning_bits
+        self.best_moves = best_moves
+
+    @classmethod
+    def load(cls, path: Path | str) -> "ChompSolution":
+        """saveで保存した表を読み込む。
+
+        Parameters
+        ----------
+        path : pathlib.Path or str
+            保存したファイルのパス
+
+        Returns
+        -------
+        ChompSolution
+            読み込んだ表
+
+        """
+        with np.load(path) as data:
+            return cls(
+                int(data["rows"]),
+                int(data["cols"]),
+                data["winning_bits"],
+                data["best_moves"],
+            )
+
+    def save(self, path: Path | str) -> None:
+        """表をnpz形式で保存する。
+
+        複数のプロセスが同時に保存しても壊れたファイルが読まれないように、
+        一時ファイルに書き込んでから置き換える。
+
+        Parameters
+        ----------
+        path : pathlib.Path or str
+            保存先のファイルのパス
+
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with temporary_path.open("wb") as file:
+            np.savez(
+                file,
+                rows=self.rows,
+                cols=self.cols,
+                winning_bits=self.winning_bits,
+                best_moves=self.best_moves,
+            )
+        temporary_path.replace(path)
+
+    @property
+    def state_count(self) -> int:
+        """長方形に含まれる盤面の数。"""
+        return self.index.size
+
+    def rank(self, row_lengths: Sequence[int]) -> int:
+        """盤面の番号を求める。
+
+        Parameters
+        ----------
+        row_lengths : Sequence of int
+            各行のマスの個数 (非増加列)。rows個に満たない分は0とみなす。
+            Chomp.get_row_lengthsのように末尾に空の行を含んでいてもよい。
+
+        Returns
+        -------
+        int
+            盤面の番号
+
+        """
+        return self.index.rank(self._pad_row_lengths(row_lengths))
+
+    def unrank(self, rank: int) -> tuple[int, ...]:
+        """番号から盤面を求める。
+
+        Parameters
+        ----------
+        rank : int
+            盤面の番号
+
+        Returns
+        -------
+        tuple of int
+            各行のマスの個数 (長さrowsの非増加列)
+
+        """
+        return self.index.unrank(rank)
+
+    def is_winning(self, row_lengths: Sequence[int]) -> bool:
+        """手番のプレイヤーが勝つ盤面 (N位置) かどうかを判定する。
+
+        Parameters
+        ----------
+        row_lengths : Sequence of int
+            各行のマスの個数 (非増加列)
+
+        Returns
+        -------
+        bool
+            手番のプレイヤーが勝つ場合はTrue、負ける場合 (P位置) はFalse
+
+        """
+        return self._is_winning_rank(self.rank(row_lengths))
+
+    def get_p_positions(
+        self,
+        row_lengths: Sequence[int] | None = None,
+    ) -> list[tuple[int, ...]]:
+        """手番のプレイヤーが負ける盤面 (P位置) を全て求める。
+
+        Parameters
+        ----------
+        row_lengths : Sequence of int, optional
+            各行のマスの個数 (非増加列)。指定した場合は、この盤面から到達できる
+            盤面 (各行の長さがこの盤面以下の盤面) のP位置だけを求める。
+            省略した場合は長方形に含まれる全ての盤面のP位置を求める。
+            rows個を超える分は0でなければならない。
+
+        Returns
+        -------
+        list of tuple of int
+            P位置の盤面 (長さrowsの非増加列) を番号の昇順に並べたリスト
+
+        """
+        winning = np.unpackbits(
+            self.winning_bits,
+            count=self.state_count,
+            bitorder="little",
+        )
+        p_positions = self.index.unrank_many(np.flatnonzero(winning == 0))
+        if row_lengths is not None:
+            lengths = self._pad_row_lengths(row_lengths)
+            self.rank(lengths)  # 盤面が長方形に含まれることを確認する
+            p_positions = p_positions[(p_positions <= lengths).all(axis=1)]
+        return [tuple(row_lengths) for row_lengths in p_positions.tolist()]
+
+    def get_winning_moves(
+        self,
+        row_lengths: Sequence[int] | None = None,
+    ) -> list[tuple[int, int]]:
+        """相手をP位置に移す手 (勝ち手) を全て求める。
+
+        Parameters
+        ----------
+        row_lengths : Sequence of int, optional
+            各行のマスの個数 (非増加列)。省略した場合は長方形全体の盤面。
+
+        Returns
+        -------
+        list of tuple of int
+            勝ち手のセル (行, 列) のリスト。P位置の盤面では空になる。
+
+        """
+        if row_lengths is None:
+            row_lengths = [self.cols] * self.rows
+        lengths = self._pad_row_lengths(row_lengths)
+        self.rank(lengths)  # 盤面が長方形に含まれることを確認する
+        moves = []
+        for row in range(self.rows):
+            for col in range(lengths[row]):
+                child = lengths[:row] + [min(length, col) for length in lengths[row:]]
+                if not self._is_winning_rank(self.rank(child)):
+                    moves.append((row, col))
+        return moves
+
+    def get_best_move(self, row_lengths: Sequence[int]) -> tuple[int, int]:
+        """盤面で選ぶ手を、探索せずに表から1回引いて求める。
+
+        Parameters
+        ----------
+        row_lengths : Sequence of int
+            各行のマスの個数 (非増加列)。空の盤面であってはならない。
+
+        Returns
+        -------
+        tuple of int
+            食べるセル (行, 列)。N位置では勝ち手になる。
+
+        """
+        rank = self.rank(row_lengths)
+        if rank == 0:
+            msg: str = "空の盤面には選べる手がありません。"
+            raise ValueError(msg)
+        row, col = divmod(int(self.best_moves[rank]), self.cols)
+        return row, col
+
+    def get_best_moves_many(
+        self,
+        row_lengths: npt.ArrayLike,
+    ) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+        """複数の盤面で選ぶ手をまとめて求める。
+
+        Parameters
+        ----------
+        row_lengths : array_like
+            形が (盤面の数, rows) の整数配列。空の盤面を含んではならない。
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            (食べるセルの行, 食べるセルの列)
+
+        """
+        ranks = self.index.rank_many(row_lengths)
+        if (ranks == 0).any():
+            msg: str = "空の盤面には選べる手がありません。"
+            raise ValueError(msg)
+        return np.divmod(self.best_moves[ranks].astype(np.int64), self.cols)
+
+    def _pad_row_lengths(self, row_lengths: Sequence[int]) -> list[int]:
+        """盤面の行の長さを、長さがちょうどrowsのリストにそろえる内部関数。
+
+        solve_chomp_gameの表は空でない行だけを囲む長方形について作るため、
+        rows個を超える末尾の空の行は取り除き、足りない分は0で埋める。
+        """
+        lengths = list(row_lengths)
+        while len(lengths) > self.rows and lengths[-1] == 0:
+            lengths.pop()
+        return lengths + [0] * (self.rows - len(lengths))
+
+    def _is_winning_rank(self, rank: int) -> bool:
+        """番号rankの盤面のビットを読む内部関数。"""
+        return bool((self.winning_bits[rank >> 3] >> (rank & 7)) & 1)
+
+
+def solve_chomp(rows: int, cols: int) -> ChompSolution:
+    """長方形 rows x cols に含まれる全ての盤面の勝敗を、後退解析で求める関数。
+
+    マスの総数が少ない盤面から順に、同じ総数の盤面をnumpyでまとめて処理する。
+    各盤面の全ての手について子の番号を求め、ビット配列を引いて
+    P位置の子が1つでもあればN位置、なければP位置とする。
+    子のマスの総数は必ず少ないため、子の勝敗は既に求まっている。
+
+    Parameters
+    ----------
+    rows : int
+        長方形の行数
+    cols : int
+        長方形の列数
+
+    Returns
+    -------
+    ChompSolution
+        全ての盤面の勝敗と選ぶ手の表
+
+    """
+    if rows < 0 or cols < 0:
+        msg: str = "盤面の大きさは0以上の整数でなければなりません。"
+        raise ValueError(msg)
+
+    index = YoungDiagramIndex(rows, cols)
+    # 解析中は1盤面1バイトの配列で子の勝敗を引き、最後にビット配列に詰める
+    winning = np.zeros(index.size, dtype=np.bool_)
+    # 空の盤面 (番号0) は、直前に最後のセルを食べた相手の負けなので手番の勝ち
+    winning[0] = True
+    move_dtype = np.int16 if rows * cols <= np.iinfo(np.int16).max else np.int32
+    best_moves = np.full(index.size, -1, dtype=move_dtype)
+
+    term_table = index.term_table
+    # column_terms[c, i] = Σ_{i' < i} term_table[i', c] は、長さcの行が並んだときの寄与
+    column_terms = np.zeros((cols, rows + 1), dtype=np.int64)
+    np.cumsum(term_table[:, :cols].T, axis=1, out=column_terms[:, 1:])
+
+    # 番号順の全ての盤面を、マスの総数の昇順に安定ソートして段に分ける
+    diagrams = index.enumerate_diagrams()
+    sizes = diagrams.sum(axis=1, dtype=np.int64)
+    order = np.argsort(sizes, kind="stable")
+    level_ends = np.cumsum(np.bincount(sizes, minlength=rows * cols + 1)).tolist()
+    for level_start, level_end in itertools.pairwise(level_ends):
+        for start in range(level_start, level_end, SOLVER_BLOCK_SIZE):
+            ranks = order[start : min(start + SOLVER_BLOCK_SIZE, level_end)]
+            winning[ranks], best_moves[ranks] = _solve_block(
+                diagrams[ranks].astype(np.int64),
+                ranks,
+                term_table,
+                column_terms,
+                winning,
+            )
+
+    winning_bits = np.packbits(winning, bitorder="little")
+    return ChompSolution(rows, cols, winning_bits, best_moves)
+
+
+@functools.cache
+def load_chomp_solution(
+    rows: int,
+    cols: int,
+    solution_dir: Path | str = DEFAULT_SOLUTION_DIR,
+) -> ChompSolution:
+    """長方形 rows x cols の勝敗と選ぶ手の表を、保存されていれば読み込む関数。
+
+    保存されていない場合はsolve_chompで求めてsolution_dirに保存するため、
+    表を求めるのは最初の1回だけでよい。同じプロセスでは同じ引数に対して
+    同じオブジェクトを返し、複数のエージェントで表を共有する。
+
+    Parameters
+    ----------
+    rows : int
+        長方形の行数
+    cols : int
+        長方形の列数
+    solution_dir : pathlib.Path or str, optional
+        表を保存するディレクトリ
+
+    Returns
+    -------
+    ChompSolution
+        全ての盤面の勝敗と選ぶ手の表
+
+    """
+    path = Path(solution_dir) / f"chomp_{rows}x{cols}.npz"
+    if path.exists():
+        return ChompSolution.load(path)
+    solution = solve_chomp(rows, cols)
+    solution.save(path)
+    return solution
+
+
+def solve_chomp_game(game: Chomp) -> ChompSolution:
+    """Chompの盤面から到達できる全ての盤面の勝敗を求める関数。
+
+    到達できる盤面は全て、現在の盤面を囲む最小の長方形に含まれるため、
+    その長方形についてsolve_chompを呼ぶ。
+    返す表には到達できない盤面も含まれるため、到達できる盤面のP位置だけが必要な場合は
+    get_p_positions(game.get_row_lengths()) のように現在の盤面を指定する。
+
+    Parameters
+    ----------
+    game : Chomp
+        Chompの盤面
+
+    Returns
+    -------
+    ChompSolution
+        現在の盤面を囲む長方形に含まれる全ての盤面の勝敗の表
+
+    """
+    row_lengths = game.get_row_lengths()
+    rows = sum(1 for length in row_lengths if length > 0)
+    cols = row_lengths[0] if rows > 0 else 0
+    return solve_chomp(rows, cols)
+
+
+def _solve_block(
+    lengths: npt.NDArray[np.int64],
+    ranks: npt.NDArray[np.int64],
+    term_table: npt.NDArray[np.int64],
+    column_terms: npt.NDArray[np.int64],
+    winning: npt.NDArray[np.bool_],
+) -> tuple[npt.NDArray[np.bool_], npt.NDArray[np.int64]]:
+    """マスの総数が等しい盤面の勝敗と選ぶ手をまとめて求める内部関数。
+
+    手 (r, c) はr行目以降の各行の長さをcで切り詰める。行の長さは非増加なので、
+    長さがc以上の行は r, r+1, ..., t-1 行目 (tは長さがc以上の行の数) であり、
+    prefix[i] を0からi-1行目の寄与の和とすると、子の番号は
+    (prefix[r] - column_terms[c, r]) + (column_terms[c, t] + prefix[rows] - prefix[t])
+    となる。後半はrによらないため、列cの手の子の番号は盤面ごとに1回求めた値と
+    rの表の和になる。ほとんどの盤面は左の列の手でP位置の子が見つかるため、
+    列ごとに手を調べ、勝ちが決まった盤面は以降の列で調べない。
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        (各盤面で手番のプレイヤーが勝つかどうか, 各盤面で選ぶ手 (行 * cols + 列))
+
+    """
+    count, rows = lengths.shape
+    cols = len(column_terms)
+    prefix = np.zeros((count, rows + 1), dtype=np.int64)
+    np.cumsum(
+        term_table.ravel()[np.arange(rows) * (cols + 1) + lengths],
+        axis=1,
+        out=prefix[:, 1:],
+    )
+    prefix[:, rows] = ranks
+
+    block_winning = np.zeros(count, dtype=np.bool_)
+    # P位置の盤面では、最後の行の右端の1マスだけを食べる手を選ぶ
+    last_rows = np.count_nonzero(lengths, axis=1) - 1
+    block_moves = last_rows * cols + lengths[np.arange(count), last_rows] - 1
+    # 勝ちが決まっていない盤面の位置・行の長さ・prefixを詰めて持つ
+    undecided = np.arange(count)
+    for col in range(cols):
+        valid = lengths > col
+        end = (lengths >= col).sum(axis=1)
+        suffix = (
+            column_terms[col, end]
+            + prefix[:, rows]
+            - np.take_along_axis(prefix, end[:, np.newaxis], axis=1)[:, 0]
+        )
+        children = prefix[:, :rows] - column_terms[col, :rows] + suffix[:, np.newaxis]
+        # 食べられないセルの手は、空の盤面 (手番の勝ち) に向けて無視する
+        to_losing = valid & ~winning[np.where(valid, children, 0)]
+        found = to_losing.any(axis=1)
+        block_winning[undecided[found]] = True
+        block_moves[undecided[found]] = to_losing[found].argmax(axis=1) * cols + col
+
+        # 1行目の長さがcol+1以下の盤面には、col+1列目以降の手がない
+        keep = ~found & (lengths[:, 0] > col + 1)
+        if not keep.any():
+            break
+        undecided = undecided[keep]
+        lengths = lengths[keep]
+        prefix = prefix[keep]
+    return block_winning, block_moves
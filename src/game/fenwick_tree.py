@@ -0,0 +1,89 @@
+class FenwickTree:
+    """整数列の接頭辞和を管理するFenwick木(Binary Indexed Tree)のクラス。
+
+    要素の更新、接頭辞和の計算、累積和がkを超える最初の位置の探索を
+    いずれもO(log n)で行う。
+
+    Attributes
+    ----------
+    size : int
+        管理する整数列の長さ。
+
+    """
+
+    def __init__(self, values: list[int]) -> None:
+        """FenwickTreeクラスのコンストラクタ。O(n)で木を構築する。"""
+        self.size: int = len(values)
+        tree: list[int] = [0, *values]
+        for i in range(1, self.size + 1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                tree[parent] += tree[i]
+        self._tree: list[int] = tree
+        self._top_bit: int = 1 << (self.size.bit_length() - 1) if self.size else 0
+
+    def add(self, index: int, delta: int) -> None:
+        """指定された位置の要素にdeltaを加える。
+
+        Parameters
+        ----------
+        index : int
+            更新する要素のインデックス(0始まり)。
+        delta : int
+            加える値。
+
+        """
+        tree = self._tree
+        i = index + 1
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index: int) -> int:
+        """先頭からindex個の要素の和を計算する。
+
+        Parameters
+        ----------
+        index : int
+            和をとる要素の個数。
+
+        Returns
+        -------
+        int
+            要素0からindex-1までの和。
+
+        """
+        tree = self._tree
+        total: int = 0
+        i = index
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def find(self, k: int) -> tuple[int, int]:
+        """接頭辞和がkを超える最初の位置を探索する。
+
+        全ての要素が0以上であることを仮定する。
+
+        Parameters
+        ----------
+        k : int
+            探索する値。0以上で全要素の和より小さくなければならない。
+
+        Returns
+        -------
+        tuple of int
+            (接頭辞和がkを超える最初の要素のインデックス, その要素内でのオフセット)
+
+        """
+        tree = self._tree
+        position: int = 0
+        step = self._top_bit
+        while step:
+            next_position = position + step
+            if next_position <= self.size and tree[next_position] <= k:
+                position = next_position
+                k -= tree[next_position]
+            step >>= 1
+        return position, k
@@ -0,0 +1,276 @@
+import struct
+from array import array
+from collections.abc import Iterable
+from pathlib import Path
+from types import TracebackType
+from typing import BinaryIO, Self
+
+import numpy as np
+import numpy.typing as npt
+
+GAME_LOG_SUFFIX: str = ".bin"  # バイナリ形式のゲームログの拡張子
+FIRST_PLAYER: int = 0  # 勝者が先手であることを表す値
+SECOND_PLAYER: int = 1  # 勝者が後手であることを表す値
+
+MOVE_DTYPE: np.dtype = np.dtype([("row", "<u2"), ("col", "<u2")])
+
+# ヘッダ: 識別子, 形式のバージョン, 盤面の行数, 盤面の列数
+_HEADER = struct.Struct("<8sIHH")
+_HEADER_MAGIC: bytes = b"CHOMPLOG"
+_FORMAT_VERSION: int = 1
+# フッタ: ゲーム数, 手の総数, 識別子
+_FOOTER = struct.Struct("<QQ8s")
+_FOOTER_MAGIC: bytes = b"CHOMPEND"
+_MAX_BOARD_LENGTH: int = np.iinfo(np.uint16).max
+_INDEX_ALIGNMENT: int = 8
+
+
+class GameLogWriter:
+    """Chompのゲームログをバイナリ形式で書き込むクラス。
+
+    ファイルは次の順に並ぶ。
+
+    - ヘッダ (16バイト)
+    - 全ゲームの手 (行, 列) をuint16の組で並べた配列
+    - 8バイト境界までの詰め物
+    - 各ゲームの最初の手の位置 (uint64, ゲーム数+1個)
+    - 各ゲームの勝者 (uint8, ゲーム数個)
+    - フッタ (24バイト)
+
+    手はバッファに溜めてまとめて書き込み、ゲームごとの位置と勝者はclose時に書き込む。
+
+    Attributes
+    ----------
+    path : pathlib.Path
+        ログのファイルのパス
+    board_rows : int
+        盤面の行数
+    board_cols : int
+        盤面の列数
+
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        board_rows: int,
+        board_cols: int,
+        buffer_size: int = 1 << 16,
+    ) -> None:
+        """GameLogWriterクラスのコンストラクタ。
+
+        Parameters
+        ----------
+        path : pathlib.Path or str
+            ログのファイルのパス
+        board_rows : int
+            盤面の行数
+        board_cols : int
+            盤面の列数
+        buffer_size : int, optional
+            まとめて書き込む手の数 (デフォルト: 65536)
+
+        """
+        if not (
+            0 < board_rows <= _MAX_BOARD_LENGTH and 0 < board_cols <= _MAX_BOARD_LENGTH
+        ):
+            msg: str = f"盤面の行数と列数は1以上{_MAX_BOARD_LENGTH}以下にしてください。"
+            raise ValueError(msg)
+
+        self.path = Path(path)
+        self.board_rows = board_rows
+        self.board_cols = board_cols
+        self._file: BinaryIO = self.path.open("wb")
+        self._file.write(
+            _HEADER.pack(_HEADER_MAGIC, _FORMAT_VERSION, board_rows, board_cols),
+        )
+        self._buffer = np.empty(buffer_size, dtype=MOVE_DTYPE)
+        self._buffer_length = 0
+        self._move_count = 0
+        self._offsets = array("Q", [0])
+        self._winners = array("B")
+
+    def __enter__(self) -> Self:
+        """with文でログを開く。"""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """with文を抜けるときにログを閉じる。"""
+        self.close()
+
+    @property
+    def game_count(self) -> int:
+        """書き込んだゲームの数。"""
+        return len(self._winners)
+
+    def add_move(self, row: int, col: int) -> None:
+        """書き込み中のゲームに1手を追加する。
+
+        Parameters
+        ----------
+        row : int
+            選んだセルの行
+        col : int
+            選んだセルの列
+
+        """
+        if self._buffer_length == len(self._buffer):
+            self._flush()
+        self._buffer[self._buffer_length] = (row, col)
+        self._buffer_length += 1
+        self._move_count += 1
+
+    def end_game(self, winner: int) -> None:
+        """書き込み中のゲームを勝者とともに確定する。
+
+        Parameters
+        ----------
+        winner : int
+            勝者 (FIRST_PLAYERまたはSECOND_PLAYER)
+
+        """
+        if winner not in (FIRST_PLAYER, SECOND_PLAYER):
+            msg: str = "勝者はFIRST_PLAYERまたはSECOND_PLAYERで指定してください。"
+            raise ValueError(msg)
+        self._offsets.append(self._move_count)
+        self._winners.append(winner)
+
+    def write_game(self, moves: Iterable[tuple[int, int]], winner: int) -> None:
+        """1ゲーム分の手と勝者を書き込む。
+
+        Parameters
+        ----------
+        moves : Iterable of tuple of int
+            選んだセル (行, 列) の列
+        winner : int
+            勝者 (FIRST_PLAYERまたはSECOND_PLAYER)
+
+        """
+        for row, col in moves:
+            self.add_move(row, col)
+        self.end_game(winner)
+
+    def close(self) -> None:
+        """残りの手と各ゲームの位置・勝者を書き込み、ログを閉じる。"""
+        if self._file.closed:
+            return
+        self._flush()
+        # 確定していない手は捨てるため、最後に確定したゲームの手の直後まで切り詰める
+        moves_end = _HEADER.size + self._offsets[-1] * MOVE_DTYPE.itemsize
+        self._file.seek(moves_end)
+        self._file.truncate()
+        padding = -moves_end % _INDEX_ALIGNMENT
+        self._file.write(b"\0" * padding)
+        self._offsets.tofile(self._file)
+        self._winners.tofile(self._file)
+        self._file.write(
+            _FOOTER.pack(self.game_count, self._offsets[-1], _FOOTER_MAGIC),
+        )
+        self._file.close()
+
+    def _flush(self) -> None:
+        """バッファに溜めた手をファイルに書き込む内部関数。"""
+        self._buffer[: self._buffer_length].tofile(self._file)
+        self._buffer_length = 0
+
+
+class GameLogReader:
+    """バイナリ形式のChompのゲームログを、メモリマップで読み込むクラス。
+
+    ファイルの内容はコピーせずにnumpy配列として参照する。
+
+    Attributes
+    ----------
+    path : pathlib.Path
+        ログのファイルのパス
+    board_rows : int
+        盤面の行数
+    board_cols : int
+        盤面の列数
+    moves : numpy.ndarray
+        全ゲームの手。フィールド"row"と"col"を持つ構造化配列
+    offsets : numpy.ndarray
+        各ゲームの最初の手の位置。i番目のゲームの手は moves[offsets[i]:offsets[i+1]]
+    winners : numpy.ndarray
+        各ゲームの勝者 (FIRST_PLAYERまたはSECOND_PLAYER)
+
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        """GameLogReaderクラスのコンストラクタ。"""
+        self.path = Path(path)
+        data = np.memmap(self.path, dtype=np.uint8, mode="r")
+        if len(data) < _HEADER.size + _FOOTER.size:
+            msg: str = "ゲームログの形式が正しくありません。"
+            raise ValueError(msg)
+
+        magic, version, self.board_rows, self.board_cols = _HEADER.unpack(
+            data[: _HEADER.size].tobytes(),
+        )
+        game_count, move_count, footer_magic = _FOOTER.unpack(
+            data[-_FOOTER.size :].tobytes(),
+        )
+        moves_end = _HEADER.size + move_count * MOVE_DTYPE.itemsize
+        offsets_start = moves_end + (-moves_end % _INDEX_ALIGNMENT)
+        winners_start = offsets_start + (game_count + 1) * 8
+        if (
+            magic != _HEADER_MAGIC
+            or footer_magic != _FOOTER_MAGIC
+            or version != _FORMAT_VERSION
+            or winners_start + game_count + _FOOTER.size != len(data)
+        ):
+            msg: str = "ゲームログの形式が正しくありません。"
+            raise ValueError(msg)
+
+        self.moves: npt.NDArray[np.void] = data[_HEADER.size : moves_end].view(
+            MOVE_DTYPE,
+        )
+        self.offsets: npt.NDArray[np.uint64] = data[offsets_start:winners_start].view(
+            "<u8",
+        )
+        self.winners: npt.NDArray[np.uint8] = data[
+            winners_start : winners_start + game_count
+        ]
+
+    def __len__(self) -> int:
+        """ゲームの数を返す。"""
+        return len(self.winners)
+
+    @property
+    def rows(self) -> npt.NDArray[np.uint16]:
+        """全ゲームの手の行。"""
+        return self.moves["row"]
+
+    @property
+    def cols(self) -> npt.NDArray[np.uint16]:
+        """全ゲームの手の列。"""
+        return self.moves["col"]
+
+    @property
+    def move_counts(self) -> npt.NDArray[np.uint64]:
+        """各ゲームの手数。"""
+        return np.diff(self.offsets)
+
+    def get_game_moves(self, index: int) -> npt.NDArray[np.void]:
+        """index番目のゲームの手を返す。
+
+        Parameters
+        ----------
+        index : int
+            ゲームの番号
+
+        Returns
+        -------
+        numpy.ndarray
+            ゲームの手 (フィールド"row"と"col"を持つ構造化配列)
+
+        """
+        if not 0 <= index < len(self):
+            msg: str = "ゲームの番号が範囲外です"
+            raise IndexError(msg)
+        return self.moves[int(self.offsets[index]) : int(self.offsets[index + 1])]
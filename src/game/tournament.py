@@ -0,0 +1,535 @@
+import json
+import os
+import zlib
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import NamedTuple, Protocol
+
+import numpy as np
+import numpy.typing as npt
+
+from src.game.chomp import Chomp
+from src.utilities import wilson_interval
+
+DEFAULT_BLOCK_SIZE: int = 1000  # 1つのタスクで対戦させるゲーム数
+
+
+class ChompPlayer(Protocol):
+    """トーナメントに参加できるエージェントが満たすインターフェース。"""
+
+    def select_eat_cell(self, game: Chomp) -> tuple[int, int]:
+        """食べるセルを選択する。"""
+        ...
+
+
+# エージェントを作る関数: (名前, 乱数生成器) -> エージェント。
+# プロセスプールに渡すため、モジュールの最上位で定義した関数やクラス、
+# functools.partialなどのpickleできる呼び出し可能オブジェクトでなければならない
+AgentFactory = Callable[[str, np.random.Generator], ChompPlayer]
+
+
+class Pairing(NamedTuple):
+    """トーナメントの1つの組み合わせ (先手, 後手, 盤面)。
+
+    Attributes
+    ----------
+    first : str
+        先手のエージェントの名前
+    second : str
+        後手のエージェントの名前
+    board_rows : int
+        盤面の行数
+    board_cols : int
+        盤面の列数
+
+    """
+
+    first: str
+    second: str
+    board_rows: int
+    board_cols: int
+
+
+class BlockResult(NamedTuple):
+    """1ブロック分の対戦結果。結果のファイルの1行に対応する。
+
+    Attributes
+    ----------
+    pairing : Pairing
+        組み合わせ
+    block : int
+        組み合わせの中でのブロックの番号
+    game_count : int
+        対戦したゲームの数
+    first_player_wins : int
+        先手の勝ち数
+
+    """
+
+    pairing: Pairing
+    block: int
+    game_count: int
+    first_player_wins: int
+
+
+# タスク: (組み合わせ, ブロックの番号, ゲーム数,
+#          先手の作成関数, 後手の作成関数, SeedSequence)
+_Task = tuple[Pairing, int, int, AgentFactory, AgentFactory, np.random.SeedSequence]
+
+
+class TournamentResult:
+    """トーナメントの結果を、組み合わせごとの勝ち数として集計するクラス。
+
+    wins[i, j, k] と games[i, j, k] は、i番目のエージェントが先手、j番目が後手で
+    k番目の盤面を対戦したときの先手の勝ち数とゲーム数である。
+
+    Attributes
+    ----------
+    names : tuple of str
+        エージェントの名前
+    boards : tuple of tuple of int
+        盤面 (行数, 列数) の列
+    wins : numpy.ndarray
+        先手の勝ち数。形は (エージェント数, エージェント数, 盤面の数)
+    games : numpy.ndarray
+        ゲーム数。形は winsと同じ
+
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        boards: Sequence[tuple[int, int]],
+    ) -> None:
+        """TournamentResultクラスのコンストラクタ。"""
+        self.names = tuple(names)
+        # 同じ盤面を2回数えないよう、重複した盤面は最初の1つだけを残す
+        self.boards = tuple(dict.fromkeys((rows, cols) for rows, cols in boards))
+        shape = (len(self.names), len(self.names), len(self.boards))
+        self.wins: npt.NDArray[np.int64] = np.zeros(shape, dtype=np.int64)
+        self.games: npt.NDArray[np.int64] = np.zeros(shape, dtype=np.int64)
+        self._name_indices = {name: i for i, name in enumerate(self.names)}
+        self._board_indices = {board: k for k, board in enumerate(self.boards)}
+
+    def add(self, result: BlockResult) -> None:
+        """1ブロック分の結果を集計に加える。
+
+        Parameters
+        ----------
+        result : BlockResult
+            ブロックの結果
+
+        """
+        pairing = result.pairing
+        index = (
+            self._name_indices[pairing.first],
+            self._name_indices[pairing.second],
+            self._board_indices[pairing.board_rows, pairing.board_cols],
+        )
+        self.wins[index] += result.first_player_wins
+        self.games[index] += result.game_count
+
+    def get_win_rate_matrix(
+        self,
+        board: tuple[int, int],
+        confidence: float = 0.95,
+    ) -> tuple[npt.NDArray[np.float64], ...]:
+        """盤面ごとの先手の勝率の行列と、そのWilsonスコア信頼区間を求める。
+
+        Parameters
+        ----------
+        board : tuple of int
+            盤面 (行数, 列数)
+        confidence : float, optional
+            信頼係数 (デフォルト: 0.95)
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            (勝率, 下限, 上限)。[i, j] 成分はi番目のエージェントが先手、
+            j番目が後手のときの先手の勝率。ゲーム数が0の成分の勝率はnan
+
+        """
+        k = self._board_indices[board]
+        wins = self.wins[:, :, k]
+        games = self.games[:, :, k]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rates = np.where(games > 0, wins / games, np.nan)
+        lower = np.empty_like(rates)
+        upper = np.empty_like(rates)
+        for index in np.ndindex(rates.shape):
+            lower[index], upper[index] = wilson_interval(
+                int(wins[index]),
+                int(games[index]),
+                confidence,
+            )
+        return rates, lower, upper
+
+    def format_win_rate_matrix(
+        self,
+        board: tuple[int, int],
+        confidence: float = 0.95,
+    ) -> str:
+        """盤面ごとの先手の勝率の行列を、信頼区間とともに表の文字列にする。
+
+        Parameters
+        ----------
+        board : tuple of int
+            盤面 (行数, 列数)
+        confidence : float, optional
+            信頼係数 (デフォルト: 0.95)
+
+        Returns
+        -------
+        str
+            行が先手、列が後手の表
+
+        """
+        rates, lower, upper = self.get_win_rate_matrix(board, confidence)
+        cells = [
+            [
+                f"{rates[i, j]:.3f} [{lower[i, j]:.3f}, {upper[i, j]:.3f}]"
+                for j in range(len(self.names))
+            ]
+            for i in range(len(self.names))
+        ]
+        width = max(len(cell) for row in cells for cell in [*row, *self.names])
+        header = f"{board[0]}x{board[1]} 先手\\後手"
+        name_width = max(len(header), *(len(name) for name in self.names))
+        lines = [
+            " ".join(
+                [header.ljust(name_width), *(name.rjust(width) for name in self.names)],
+            ),
+        ]
+        lines.extend(
+            " ".join([name.ljust(name_width), *(cell.rjust(width) for cell in row)])
+            for name, row in zip(self.names, cells, strict=True)
+        )
+        return "\n".join(lines)
+
+
+def run_tournament(
+    agents: Mapping[str, AgentFactory],
+    boards: Sequence[tuple[int, int]],
+    games_per_pairing: int,
+    results_path: Path | str,
+    *,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    workers: int = 1,
+    seed: int | None = None,
+) -> TournamentResult:
+    """エージェントの総当たり戦を行い、結果をファイルに追記しながら集計する関数。
+
+    全ての順序付きの組 (先手, 後手) と盤面の組み合わせについて、
+    games_per_pairing回の対戦をblock_sizeゲームずつのブロックに分け、
+    全てのブロックを1つのプロセスプールに投入する。
+    ブロックが終わるたびにその結果を集計に加え、JSON Lines形式の結果のファイルに
+    1行として追記する。途中で中断しても、同じ引数で再び呼べば
+    ファイルに記録済みのブロックは飛ばして続きから対戦する。
+    シード・block_size・games_per_pairingはファイルの先頭に記録し、
+    再開時に異なる値を指定するとValueErrorを送出する。
+
+    各ブロックの乱数列はシードとエージェントの名前・盤面・ブロックの番号から
+    決まるため、結果はworkersや中断の有無、エージェントの並び順によらない。
+    シードを省略した場合は新しいシードを生成してファイルに記録し、再開時にはそれを用いる。
+
+    Parameters
+    ----------
+    agents : Mapping of str to AgentFactory
+        エージェントの名前から、(名前, 乱数生成器) を受け取ってエージェントを作る
+        関数への対応。エージェントはselect_eat_cell(game)を持つ任意のオブジェクトでよい。
+    boards : Sequence of tuple of int
+        盤面 (行数, 列数) の列。重複した盤面は1つにまとめる。
+    games_per_pairing : int
+        組み合わせごとの対戦数
+    results_path : pathlib.Path or str
+        結果を追記するファイルのパス
+    block_size : int, optional
+        1つのタスクで対戦させるゲーム数 (デフォルト: 1000)
+    workers : int, optional
+        使用するプロセス数 (デフォルト: 1)
+    seed : int, optional
+        乱数のシード
+
+    Returns
+    -------
+    TournamentResult
+        ファイルに記録済みのブロックを含む全ての組み合わせの結果
+
+    """
+    if games_per_pairing < 0:
+        msg: str = "対戦数は0以上の整数でなければなりません。"
+        raise ValueError(msg)
+    if block_size < 1:
+        msg: str = "block_sizeは1以上の整数でなければなりません。"
+        raise ValueError(msg)
+    if workers < 1:
+        msg: str = "workersは1以上の整数でなければなりません。"
+        raise ValueError(msg)
+    if any(rows < 0 or cols < 0 for rows, cols in boards):
+        msg: str = "盤面の大きさは0以上の整数でなければなりません。"
+        raise ValueError(msg)
+
+    results_path = Path(results_path)
+    result = TournamentResult(list(agents), boards)
+    entropy, done = _load_results(
+        results_path,
+        result,
+        seed=seed,
+        block_size=block_size,
+        games_per_pairing=games_per_pairing,
+    )
+    if entropy is None:
+        entropy = seed if seed is not None else np.random.SeedSequence().entropy
+        results_path.parent.mkdir(parents=True, exist_ok=True)
+        with results_path.open("w", encoding="utf-8") as file:
+            header = {
+                "seed": entropy,
+                "block_size": block_size,
+                "games_per_pairing": games_per_pairing,
+            }
+            file.write(json.dumps(header) + "\n")
+
+    tasks = [
+        task
+        for task in _iter_tasks(
+            agents,
+            result.boards,
+            games_per_pairing,
+            block_size,
+            entropy,
+        )
+        if (task[0], task[1]) not in done
+    ]
+    with results_path.open("a", encoding="utf-8") as file:
+        for block_result in _run_tasks(tasks, workers):
+            file.write(json.dumps(_to_record(block_result)) + "\n")
+            file.flush()
+            result.add(block_result)
+    return result
+
+
+def load_tournament_result(
+    results_path: Path | str,
+    names: Sequence[str],
+    boards: Sequence[tuple[int, int]],
+) -> TournamentResult:
+    """結果のファイルから、指定したエージェントと盤面の結果を集計する関数。
+
+    Parameters
+    ----------
+    results_path : pathlib.Path or str
+        run_tournamentで書き込んだ結果のファイルのパス
+    names : Sequence of str
+        集計するエージェントの名前
+    boards : Sequence of tuple of int
+        集計する盤面 (行数, 列数) の列
+
+    Returns
+    -------
+    TournamentResult
+        記録済みのブロックの結果
+
+    """
+    result = TournamentResult(names, boards)
+    _load_results(Path(results_path), result)
+    return result
+
+
+def play_games(
+    first: ChompPlayer,
+    second: ChompPlayer,
+    game_count: int,
+    board_rows: int,
+    board_cols: int,
+) -> int:
+    """2つのエージェントを対戦させ、先手の勝ち数を返す関数。
+
+    最後のセルを食べたプレイヤーの負けとする。
+
+    Parameters
+    ----------
+    first : ChompPlayer
+        先手のエージェント
+    second : ChompPlayer
+        後手のエージェント
+    game_count : int
+        対戦するゲームの数
+    board_rows : int
+        盤面の行数
+    board_cols : int
+        盤面の列数
+
+    Returns
+    -------
+    int
+        先手の勝ち数
+
+    """
+    wins = 0
+    for _ in range(game_count):
+        game = Chomp(board_rows, board_cols)
+        is_first_turn = True
+        while not game.is_empty_board():
+            player = first if is_first_turn else second
+            game.eat(*player.select_eat_cell(game))
+            is_first_turn = not is_first_turn
+        # 空の盤面で手番が回ってきたプレイヤーの勝ち
+        wins += is_first_turn
+    return wins
+
+
+def _iter_tasks(
+    agents: Mapping[str, AgentFactory],
+    boards: Sequence[tuple[int, int]],
+    games_per_pairing: int,
+    block_size: int,
+    entropy: int,
+) -> Iterator[_Task]:
+    """全ての組み合わせとブロックのタスクを生成する内部関数。"""
+    block_count = -(-games_per_pairing // block_size)
+    for first, first_factory in agents.items():
+        for second, second_factory in agents.items():
+            for board_rows, board_cols in boards:
+                pairing = Pairing(first, second, board_rows, board_cols)
+                for block in range(block_count):
+                    # 名前から乱数列を決め、並び順や追加したエージェントの影響を受けない
+                    seed_sequence = np.random.SeedSequence(
+                        entropy,
+                        spawn_key=(
+                            zlib.crc32(first.encode()),
+                            zlib.crc32(second.encode()),
+                            board_rows,
+                            board_cols,
+                            block,
+                        ),
+                    )
+                    yield (
+                        pairing,
+                        block,
+                        min(block_size, games_per_pairing - block * block_size),
+                        first_factory,
+                        second_factory,
+                        seed_sequence,
+                    )
+
+
+def _run_tasks(tasks: list[_Task], workers: int) -> Iterator[BlockResult]:
+    """タスクを実行し、終わった順に結果を返す内部関数。"""
+    if workers == 1 or len(tasks) <= 1:
+        yield from map(_run_task, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        # 結果を書き込む前に全てのタスクをpickleしないよう、投入数を制限する
+        pending = set()
+        task_iter = iter(tasks)
+        for task in task_iter:
+            pending.add(executor.submit(_run_task, task))
+            if len(pending) >= 4 * workers:
+                break
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield future.result()
+                next_task = next(task_iter, None)
+                if next_task is not None:
+                    pending.add(executor.submit(_run_task, next_task))
+
+
+def _run_task(task: _Task) -> BlockResult:
+    """1ブロック分の対戦を行う内部関数。"""
+    pairing, block, game_count, first_factory, second_factory, seed_sequence = task
+    first_seed, second_seed = seed_sequence.spawn(2)
+    first = first_factory(pairing.first, np.random.default_rng(first_seed))
+    second = second_factory(pairing.second, np.random.default_rng(second_seed))
+    wins = play_games(first, second, game_count, pairing.board_rows, pairing.board_cols)
+    return BlockResult(pairing, block, game_count, wins)
+
+
+def _to_record(result: BlockResult) -> dict[str, str | int]:
+    """ブロックの結果を結果のファイルの1行に変換する内部関数。"""
+    return {
+        **result.pairing._asdict(),
+        "block": result.block,
+        "game_count": result.game_count,
+        "first_player_wins": result.first_player_wins,
+    }
+
+
+def _load_results(
+    path: Path,
+    result: TournamentResult,
+    *,
+    seed: int | None = None,
+    block_size: int | None = None,
+    games_per_pairing: int | None = None,
+) -> tuple[int | None, set[tuple[Pairing, int]]]:
+    """結果のファイルを読み込み、記録済みのブロックを集計に加える内部関数。
+
+    書き込み途中で中断した最後の行は削除する。
+
+    Returns
+    -------
+    tuple
+        (ファイルに記録されたシード, 記録済みの (組み合わせ, ブロックの番号) の集合)。
+        ファイルが存在しない場合、シードはNone
+
+    """
+    if not path.exists():
+        return None, set()
+    with path.open("rb") as file:
+        data = file.read()
+    complete_length = data.rfind(b"\n") + 1
+    if complete_length < len(data):
+        with path.open("r+b") as file:
+            file.truncate(complete_length)
+            file.flush()
+            os.fsync(file.fileno())
+    lines = data[:complete_length].decode("utf-8").splitlines()
+    if not lines:
+        msg: str = f"{path} はトーナメントの結果のファイルではありません。"
+        raise ValueError(msg)
+
+    header = json.loads(lines[0])
+    if seed is not None and header["seed"] != seed:
+        msg: str = f"{path} は異なるシードで実行したトーナメントの結果です。"
+        raise ValueError(msg)
+    if block_size is not None and header["block_size"] != block_size:
+        msg: str = f"{path} は異なるblock_sizeで実行したトーナメントの結果です。"
+        raise ValueError(msg)
+    if (
+        games_per_pairing is not None
+        and header["games_per_pairing"] != games_per_pairing
+    ):
+        msg: str = f"{path} は異なる対戦数で実行したトーナメントの結果です。"
+        raise ValueError(msg)
+
+    done: set[tuple[Pairing, int]] = set()
+    for line in lines[1:]:
+        record = json.loads(line)
+        pairing = Pairing(
+            record["first"],
+            record["second"],
+            record["board_rows"],
+            record["board_cols"],
+        )
+        key = (pairing, record["block"])
+        # 集計しないエージェントや盤面の結果と、重複した行は読み飛ばす
+        if (
+            key in done
+            or pairing.first not in result.names
+            or pairing.second not in result.names
+            or (pairing.board_rows, pairing.board_cols) not in result.boards
+        ):
+            continue
+        done.add(key)
+        result.add(
+            BlockResult(
+                pairing,
+                record["block"],
+                record["game_count"],
+                record["first_player_wins"],
+            ),
+        )
+    return header["seed"], done
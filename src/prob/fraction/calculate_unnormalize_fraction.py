@@ -20,11 +20,7 @@ def add_fraction(
         加算結果の分数
 
     """
-    numerator = (
-        frac1.numerator * frac2.denominator + frac2.numerator * frac1.denominator
-    )
-    denominator = frac1.denominator * frac2.denominator
-    return UnnormalizeFraction(numerator, denominator)
+    return frac1 + frac2
 
 
 def sub_fraction(
@@ -46,14 +42,7 @@ def sub_fraction(
         減算結果の分数
 
     """
-    numerator = (
-        frac1.numerator * frac2.denominator - frac2.numerator * frac1.denominator
-    )
-    denominator = frac1.denominator * frac2.denominator
-    return UnnormalizeFraction(
-        numerator,
-        denominator,
-    )
+    return frac1 - frac2
 
 
 def mul_fraction(
@@ -75,12 +64,7 @@ def mul_fraction(
         乗算結果の分数
 
     """
-    numerator = frac1.numerator * frac2.numerator
-    denominator = frac1.denominator * frac2.denominator
-    return UnnormalizeFraction(
-        numerator,
-        denominator,
-    )
+    return frac1 * frac2
 
 
 def div_fraction(
@@ -102,9 +86,4 @@ def div_fraction(
         除算結果の分数
 
     """
-    numerator = frac1.numerator * frac2.denominator
-    denominator = frac1.denominator * frac2.numerator
-    return UnnormalizeFraction(
-        numerator,
-        denominator,
-    )
+    return frac1 / frac2
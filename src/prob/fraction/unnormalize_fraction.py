@@ -1,15 +1,100 @@
+import math
+from fractions import Fraction
+from typing import ClassVar, Self
+
+DEFAULT_NORMALIZE_BIT_LENGTH: int = 1024  # 約分を行う分子・分母のビット数の閾値
+
+
+class UnnormalizeFractionStats:
+    """UnnormalizeFractionの演算で生じた分子・分母の大きさと約分の回数の統計。
+
+    約分の閾値を調整するために用いる。
+
+    Attributes
+    ----------
+    operation_count : int
+        演算の回数
+    normalization_count : int
+        約分を行った回数
+    max_bit_length : int
+        演算結果の分子・分母の最大のビット数
+    total_bit_length : int
+        演算結果の分子・分母のビット数の合計
+    removed_bit_length : int
+        約分によって減った分子・分母のビット数の合計
+
+    """
+
+    __slots__ = (
+        "max_bit_length",
+        "normalization_count",
+        "operation_count",
+        "removed_bit_length",
+        "total_bit_length",
+    )
+
+    def __init__(self) -> None:
+        """UnnormalizeFractionStatsクラスのコンストラクタ。"""
+        self.reset()
+
+    def reset(self) -> None:
+        """統計を0に戻す。"""
+        self.operation_count = 0
+        self.normalization_count = 0
+        self.max_bit_length = 0
+        self.total_bit_length = 0
+        self.removed_bit_length = 0
+
+    @property
+    def mean_bit_length(self) -> float:
+        """演算結果の分子・分母の平均のビット数。"""
+        if self.operation_count == 0:
+            return 0.0
+        return self.total_bit_length / self.operation_count
+
+    def report(self) -> str:
+        """統計を1行の文字列にまとめる。
+
+        Returns
+        -------
+        str
+            統計の文字列
+
+        """
+        return (
+            f"operations={self.operation_count}, "
+            f"normalizations={self.normalization_count}, "
+            f"mean_bits={self.mean_bit_length:.1f}, "
+            f"max_bits={self.max_bit_length}, "
+            f"removed_bits={self.removed_bit_length}"
+        )
+
+
 class UnnormalizeFraction:
     """正規化しない分数クラス。
 
+    演算のたびに約分を行うFractionと異なり、分子・分母のビット数が
+    normalize_bit_lengthを超えたときにだけ約分を行う。
+    +=などの演算子は新しいオブジェクトを作らずに自身を書き換える。
+
     Attributes
     ----------
     numerator : int
         分子
     denominator : int
         分母
+    normalize_bit_length : int
+        約分を行う分子・分母のビット数の閾値 (全てのインスタンスで共通)
+    stats : UnnormalizeFractionStats
+        演算の統計 (全てのインスタンスで共通)
 
     """
 
+    __slots__ = ("denominator", "numerator")
+
+    normalize_bit_length: ClassVar[int] = DEFAULT_NORMALIZE_BIT_LENGTH
+    stats: ClassVar[UnnormalizeFractionStats] = UnnormalizeFractionStats()
+
     def __init__(self, numerator: int, denominator: int) -> None:
         """クラスの初期化関数。"""
         self.numerator = numerator
@@ -18,3 +103,142 @@ class UnnormalizeFraction:
     def show_fraction(self) -> None:
         """分数を表示する関数。"""
         print(f"{self.numerator}/{self.denominator}")
+
+    def normalize(self) -> Self:
+        """約分し、分母を正にする。
+
+        Returns
+        -------
+        UnnormalizeFraction
+            約分した自身
+
+        """
+        bit_length = self._bit_length()
+        divisor = math.gcd(self.numerator, self.denominator)
+        if self.denominator < 0:
+            divisor = -divisor
+        if divisor not in (0, 1):
+            self.numerator //= divisor
+            self.denominator //= divisor
+        self.stats.normalization_count += 1
+        self.stats.removed_bit_length += bit_length - self._bit_length()
+        return self
+
+    def to_fraction(self) -> Fraction:
+        """約分したFractionに変換する。
+
+        Returns
+        -------
+        Fraction
+            同じ値のFraction
+
+        """
+        return Fraction(self.numerator, self.denominator)
+
+    def __repr__(self) -> str:
+        """分数の文字列表現を返す。"""
+        return f"UnnormalizeFraction({self.numerator}, {self.denominator})"
+
+    def __eq__(self, other: object) -> bool:
+        """約分せずに、たすき掛けで値を比較する。"""
+        if isinstance(other, int):
+            other = UnnormalizeFraction(other, 1)
+        if not isinstance(other, UnnormalizeFraction):
+            return NotImplemented
+        return self.numerator * other.denominator == other.numerator * self.denominator
+
+    # +=などで値が変わるため、辞書のキーには使えない
+    __hash__ = None  # type: ignore[assignment]
+
+    def __add__(self, other: "UnnormalizeFraction | int") -> "UnnormalizeFraction":
+        """分数を加算する。"""
+        return self._copy().__iadd__(other)
+
+    def __radd__(self, other: int) -> "UnnormalizeFraction":
+        """整数に分数を加算する。"""
+        return self._copy().__iadd__(other)
+
+    def __iadd__(self, other: "UnnormalizeFraction | int") -> Self:
+        """分数を加算して自身を書き換える。"""
+        if isinstance(other, int):
+            self.numerator += other * self.denominator
+        else:
+            self.numerator = (
+                self.numerator * other.denominator + other.numerator * self.denominator
+            )
+            self.denominator *= other.denominator
+        return self._after_operation()
+
+    def __sub__(self, other: "UnnormalizeFraction | int") -> "UnnormalizeFraction":
+        """分数を減算する。"""
+        return self._copy().__isub__(other)
+
+    def __rsub__(self, other: int) -> "UnnormalizeFraction":
+        """整数から分数を減算する。"""
+        return UnnormalizeFraction(other, 1).__isub__(self)
+
+    def __isub__(self, other: "UnnormalizeFraction | int") -> Self:
+        """分数を減算して自身を書き換える。"""
+        if isinstance(other, int):
+            self.numerator -= other * self.denominator
+        else:
+            self.numerator = (
+                self.numerator * other.denominator - other.numerator * self.denominator
+            )
+            self.denominator *= other.denominator
+        return self._after_operation()
+
+    def __mul__(self, other: "UnnormalizeFraction | int") -> "UnnormalizeFraction":
+        """分数を乗算する。"""
+        return self._copy().__imul__(other)
+
+    def __rmul__(self, other: int) -> "UnnormalizeFraction":
+        """整数に分数を乗算する。"""
+        return self._copy().__imul__(other)
+
+    def __imul__(self, other: "UnnormalizeFraction | int") -> Self:
+        """分数を乗算して自身を書き換える。"""
+        if isinstance(other, int):
+            self.numerator *= other
+        else:
+            self.numerator *= other.numerator
+            self.denominator *= other.denominator
+        return self._after_operation()
+
+    def __truediv__(self, other: "UnnormalizeFraction | int") -> "UnnormalizeFraction":
+        """分数を除算する。"""
+        return self._copy().__itruediv__(other)
+
+    def __rtruediv__(self, other: int) -> "UnnormalizeFraction":
+        """整数を分数で除算する。"""
+        return UnnormalizeFraction(other, 1).__itruediv__(self)
+
+    def __itruediv__(self, other: "UnnormalizeFraction | int") -> Self:
+        """分数を除算して自身を書き換える。"""
+        if isinstance(other, int):
+            other = UnnormalizeFraction(other, 1)
+        if other.numerator == 0:
+            msg: str = "0で割ることはできません。"
+            raise ZeroDivisionError(msg)
+        self.numerator *= other.denominator
+        self.denominator *= other.numerator
+        return self._after_operation()
+
+    def _copy(self) -> "UnnormalizeFraction":
+        """同じ値の新しいオブジェクトを作る内部関数。"""
+        return UnnormalizeFraction(self.numerator, self.denominator)
+
+    def _bit_length(self) -> int:
+        """分子と分母の大きい方のビット数を返す内部関数。"""
+        return max(self.numerator.bit_length(), self.denominator.bit_length())
+
+    def _after_operation(self) -> Self:
+        """演算の統計を記録し、ビット数が閾値を超えていれば約分する内部関数。"""
+        bit_length = self._bit_length()
+        stats = self.stats
+        stats.operation_count += 1
+        stats.total_bit_length += bit_length
+        stats.max_bit_length = max(stats.max_bit_length, bit_length)
+        if bit_length > self.normalize_bit_length:
+            self.normalize()
+        return self
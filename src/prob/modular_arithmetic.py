@@ -0,0 +1,178 @@
+import math
+from fractions import Fraction
+
+import numpy as np
+import numpy.typing as npt
+
+PRIME_UPPER_BOUND: int = 1 << 31  # 積がint64に収まるよう素数は2^31未満にとる
+
+
+def is_prime(n: int) -> bool:
+    """2^32未満の整数が素数であるかを決定的Miller-Rabin法で判定する関数。
+
+    Parameters
+    ----------
+    n : int
+        判定する整数。
+
+    Returns
+    -------
+    bool
+        nが素数であればTrue、そうでなければFalse
+
+    """
+    if n < 2:
+        return False
+    for small_prime in (2, 3, 5, 7, 11, 13):
+        if n % small_prime == 0:
+            return n == small_prime
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    # 2^32未満では底2, 7, 61で決定的に判定できる
+    for base in (2, 7, 61):
+        x = pow(base, d, n)
+        if x in (0, 1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def generate_primes(
+    count: int,
+    upper_bound: int = PRIME_UPPER_BOUND,
+) -> npt.NDArray[np.int64]:
+    """upper_bound未満の素数を大きい順にcount個生成する関数。
+
+    Parameters
+    ----------
+    count : int
+        生成する素数の個数。
+    upper_bound : int, optional
+        素数の上限 (デフォルト: 2^31)。2^32以下の偶数でなければならない。
+
+    Returns
+    -------
+    numpy.ndarray
+        素数の配列。
+
+    """
+    primes: list[int] = []
+    candidate = upper_bound - 1
+    while len(primes) < count:
+        if is_prime(candidate):
+            primes.append(candidate)
+        candidate -= 2
+    return np.array(primes, dtype=np.int64)
+
+
+def inverse_table(size: int, primes: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+    """1からsize-1までの各整数の、各素数を法とする逆元の表を作る関数。
+
+    inv(i) = -(p // i) * inv(p % i) mod p の漸化式をnumpyでまとめて計算する。
+
+    Parameters
+    ----------
+    size : int
+        表の大きさ。size-1は全ての素数より小さくなければならない。
+    primes : numpy.ndarray
+        法とする素数の配列。
+
+    Returns
+    -------
+    numpy.ndarray
+        形が (size, 素数の個数) の配列。i行目がiの逆元(0行目は0)。
+
+    """
+    table = np.zeros((max(size, 2), len(primes)), dtype=np.int64)
+    table[1] = 1
+    columns = np.arange(len(primes))
+    for i in range(2, size):
+        table[i] = (primes - primes // i) * table[primes % i, columns] % primes
+    return table[:size]
+
+
+def chinese_remainder(residues: list[int], moduli: list[int]) -> tuple[int, int]:
+    """中国剰余定理により、各法での剰余から全体の法での剰余を復元する関数。
+
+    Parameters
+    ----------
+    residues : list of int
+        各法での剰余
+    moduli : list of int
+        互いに素な法
+
+    Returns
+    -------
+    tuple of int
+        (復元した剰余, 法の積)
+
+    """
+    value = 0
+    modulus = 1
+    for residue, prime in zip(residues, moduli, strict=True):
+        # value + modulus * t ≡ residue (mod prime) となるtを求める
+        t = (residue - value) * pow(modulus, -1, prime) % prime
+        value += modulus * t
+        modulus *= prime
+    return value, modulus
+
+
+def rational_reconstruction(
+    value: int,
+    modulus: int,
+    numerator_bound: int,
+    denominator_bound: int,
+) -> Fraction:
+    """法modulusでの剰余valueから、分子と分母が上限以下の有理数を復元する関数。
+
+    modulus > 2 * numerator_bound * denominator_bound であれば、
+    条件を満たす有理数は高々1つであり、存在すれば必ず復元できる。
+
+    Parameters
+    ----------
+    value : int
+        剰余
+    modulus : int
+        法
+    numerator_bound : int
+        分子の絶対値の上限
+    denominator_bound : int
+        分母の上限
+
+    Returns
+    -------
+    Fraction
+        n ≡ d * value (mod modulus), |n| <= numerator_bound,
+        0 < d <= denominator_bound を満たす有理数 n/d
+
+    Raises
+    ------
+    ValueError
+        法が一意性を保証するのに十分大きくない場合、または復元に失敗した場合
+
+    """
+    if modulus <= 2 * numerator_bound * denominator_bound:
+        msg: str = "法が小さすぎるため、有理数を一意に復元できるとは限りません。"
+        raise ValueError(msg)
+
+    r0, r1 = modulus, value % modulus
+    s0, s1 = 0, 1
+    while r1 > numerator_bound:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q * r1
+        s0, s1 = s1, s0 - q * s1
+
+    if s1 < 0:
+        r1, s1 = -r1, -s1
+    if s1 == 0 or s1 > denominator_bound or math.gcd(r1, s1) != 1:
+        msg: str = "有理数の復元に失敗しました。"
+        raise ValueError(msg)
+    return Fraction(r1, s1)
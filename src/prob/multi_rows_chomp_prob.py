@@ -0,0 +1,142 @@
+from collections.abc import Iterator, Sequence
+from fractions import Fraction
+from itertools import pairwise
+
+
+def calculate_multi_rows_prob_table(
+    row_lengths: Sequence[int],
+) -> dict[tuple[int, ...], Fraction]:
+    """任意の行数のChomp盤面について、全ての部分盤面の先手の勝率を計算する関数。
+
+    盤面は各行のマスの個数を並べた非増加列(ヤング図形)で指定する。
+    一様ランダムに手を打つとき、盤面λの先手の勝率f(λ)は
+    f(空) = 1, f(λ) = 1 - 1/|λ| * Σ f(λの後続盤面) を満たす。
+
+    Parameters
+    ----------
+    row_lengths : Sequence of int
+        各行のマスの個数。非増加でなければならない。
+
+    Returns
+    -------
+    dict of tuple of int to Fraction
+        row_lengthsに含まれる各部分盤面(行数はrow_lengthsと同じ)から先手の勝率への辞書。
+
+    Notes
+    -----
+        行r(0始まり)の列cを食べると、行r, r+1, ..., sの長さがcになる。
+        ただしsはλ_s > cを満たす最後の行であり、cはλ_{s+1} <= c < λ_sを動く
+        (λ_m = 0とする)。そこで
+        G(λ, r, s) = Σ(c=λ_{s+1} to λ_s-1) f(λ[r..s := c])
+        とおくと、λ' = λ[r..s := λ_s - 1]に対して
+        G(λ, r, s) = f(λ') + G(λ', r, s)
+        が成り立つ。後続盤面の和はΣ G(λ, r, s)であり、各盤面でO(m^2)個の
+        Gを更新するだけで計算できる。m=3のときの6つのGは
+        calculate_three_rows_prob_fractionの再帰式の6つの和に対応する。
+
+    """
+    shape: tuple[int, ...] = tuple(row_lengths)
+    _validate_row_lengths(shape)
+    row_count = len(shape)
+    pairs: list[tuple[int, int]] = [
+        (r, s) for s in range(row_count) for r in range(s + 1)
+    ]
+
+    probabilities: dict[tuple[int, ...], Fraction] = {}
+    partial_sums: dict[tuple[int, ...], list[Fraction]] = {}
+
+    # 辞書式順序では後続盤面が必ず先に現れるため、この順に表を埋める
+    for state in _iter_sub_diagrams(shape):
+        total = sum(state)
+        if total == 0:
+            probabilities[state] = Fraction(1)
+            partial_sums[state] = [Fraction(0)] * len(pairs)
+            continue
+
+        sums: list[Fraction] = []
+        for r, s in pairs:
+            next_length = state[s + 1] if s + 1 < row_count else 0
+            if state[s] <= next_length:
+                sums.append(Fraction(0))
+                continue
+            length = state[s] - 1
+            successor = state[:r] + (length,) * (s - r + 1) + state[s + 1 :]
+            index = len(sums)
+            sums.append(probabilities[successor] + partial_sums[successor][index])
+
+        probabilities[state] = 1 - Fraction(sum(sums), total)
+        partial_sums[state] = sums
+
+    return probabilities
+
+
+def calculate_multi_rows_prob_fraction(row_lengths: Sequence[int]) -> Fraction:
+    """任意の行数のChomp盤面における先手の勝率を分数型で計算する関数。
+
+    Parameters
+    ----------
+    row_lengths : Sequence of int
+        各行のマスの個数。非増加でなければならない。
+
+    Returns
+    -------
+    Fraction
+        先手の勝率。
+
+    """
+    shape: tuple[int, ...] = tuple(row_lengths)
+    return calculate_multi_rows_prob_table(shape)[shape]
+
+
+def _validate_row_lengths(row_lengths: tuple[int, ...]) -> None:
+    """盤面が非負の非増加列であることを確認する内部関数。
+
+    Parameters
+    ----------
+    row_lengths : tuple of int
+        各行のマスの個数。
+
+    Raises
+    ------
+    ValueError
+        盤面が非負の非増加列でない場合
+
+    """
+    if any(length < 0 for length in row_lengths):
+        msg: str = "各行のマスの個数は0以上の整数でなければなりません。"
+        raise ValueError(msg)
+    if any(a < b for a, b in pairwise(row_lengths)):
+        msg: str = "盤面は各行のマスの個数が非増加になる形で指定してください。"
+        raise ValueError(msg)
+
+
+def _iter_sub_diagrams(shape: tuple[int, ...]) -> Iterator[tuple[int, ...]]:
+    """shapeに含まれる全てのヤング図形を辞書式順序で列挙する内部関数。
+
+    Parameters
+    ----------
+    shape : tuple of int
+        外側のヤング図形。
+
+    Yields
+    ------
+    tuple of int
+        shapeに含まれるヤング図形(行数はshapeと同じ)。
+
+    """
+    row_count = len(shape)
+    current: list[int] = [0] * row_count
+    while True:
+        yield tuple(current)
+        # 増やせる最後の行を探し、それより後ろの行を0に戻す
+        i = row_count - 1
+        while i >= 0:
+            limit = shape[i] if i == 0 else min(shape[i], current[i - 1])
+            if current[i] < limit:
+                break
+            i -= 1
+        if i < 0:
+            return
+        current[i] += 1
+        for j in range(i + 1, row_count):
+            current[j] = 0
@@ -0,0 +1,200 @@
+import sqlite3
+from collections.abc import Iterable, Sequence
+from fractions import Fraction
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+from config import RESULT_DIR
+
+DEFAULT_CACHE_PATH: Path = RESULT_DIR / "prob_cache.sqlite3"
+
+
+class ProbCache:
+    """計算済みの勝率を保存する、複数のプロセスや実行の間で共有できるキャッシュ。
+
+    勝率は (計算方法, 計算方法のバージョン, 盤面) をキーとして、
+    SQLiteに厳密な分数で保存する。
+    WALモードを用いるため、読み込みは複数のプロセスから同時に行え、
+    書き込みはトランザクションによって1つずつ安全に行われる。
+
+    Attributes
+    ----------
+    path : pathlib.Path
+        キャッシュのファイルのパス
+
+    """
+
+    def __init__(
+        self,
+        path: Path | str = DEFAULT_CACHE_PATH,
+        timeout: float = 60.0,
+    ) -> None:
+        """ProbCacheクラスのコンストラクタ。"""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(
+            self.path,
+            timeout=timeout,
+            isolation_level=None,
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS probabilities (
+                engine TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                board TEXT NOT NULL,
+                numerator TEXT NOT NULL,
+                denominator TEXT NOT NULL,
+                PRIMARY KEY (engine, version, board)
+            ) WITHOUT ROWID
+            """,
+        )
+
+    def __enter__(self) -> Self:
+        """with文でキャッシュを開く。"""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """with文を抜けるときにキャッシュを閉じる。"""
+        self.close()
+
+    def close(self) -> None:
+        """キャッシュを閉じる。"""
+        self._connection.close()
+
+    def get(
+        self,
+        engine: str,
+        version: int,
+        board: Sequence[int],
+    ) -> Fraction | None:
+        """保存されている勝率を取得する。
+
+        Parameters
+        ----------
+        engine : str
+            計算方法の名前
+        version : int
+            計算方法のバージョン
+        board : Sequence of int
+            盤面(各行のマスの個数)
+
+        Returns
+        -------
+        Fraction or None
+            保存されている勝率。保存されていない場合はNone
+
+        """
+        row = self._connection.execute(
+            "SELECT numerator, denominator FROM probabilities "
+            "WHERE engine = ? AND version = ? AND board = ?",
+            (engine, version, _encode_board(board)),
+        ).fetchone()
+        if row is None:
+            return None
+        return Fraction(_decode_int(row[0]), _decode_int(row[1]))
+
+    def get_all(
+        self,
+        engine: str,
+        version: int,
+    ) -> dict[tuple[int, ...], Fraction]:
+        """ある計算方法で保存されている全ての勝率を取得する。
+
+        Parameters
+        ----------
+        engine : str
+            計算方法の名前
+        version : int
+            計算方法のバージョン
+
+        Returns
+        -------
+        dict of tuple of int to Fraction
+            盤面から勝率への辞書
+
+        """
+        rows = self._connection.execute(
+            "SELECT board, numerator, denominator FROM probabilities "
+            "WHERE engine = ? AND version = ?",
+            (engine, version),
+        )
+        return {
+            _decode_board(board): Fraction(
+                _decode_int(numerator),
+                _decode_int(denominator),
+            )
+            for board, numerator, denominator in rows
+        }
+
+    def put_many(
+        self,
+        engine: str,
+        version: int,
+        items: Iterable[tuple[Sequence[int], Fraction]],
+    ) -> None:
+        """複数の勝率をまとめて保存する。既に保存されている盤面は上書きしない。
+
+        Parameters
+        ----------
+        engine : str
+            計算方法の名前
+        version : int
+            計算方法のバージョン
+        items : Iterable of tuple
+            (盤面, 勝率) の組
+
+        """
+        rows = [
+            (
+                engine,
+                version,
+                _encode_board(board),
+                _encode_int(value.numerator),
+                _encode_int(value.denominator),
+            )
+            for board, value in items
+        ]
+        # BEGIN IMMEDIATEで書き込みロックを取り、書き込みを1プロセスずつに限る
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO probabilities "
+                "(engine, version, board, numerator, denominator) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+
+def _encode_board(board: Sequence[int]) -> str:
+    """盤面をキャッシュのキーの文字列に変換する内部関数。"""
+    return ",".join(str(length) for length in board)
+
+
+def _decode_board(text: str) -> tuple[int, ...]:
+    """キャッシュのキーの文字列を盤面に戻す内部関数。"""
+    return tuple(int(length) for length in text.split(",")) if text else ()
+
+
+def _encode_int(value: int) -> str:
+    """整数を16進数の文字列に変換する内部関数。
+
+    10進数の文字列への変換には桁数の上限があるため、16進数で保存する。
+    """
+    return hex(value)
+
+
+def _decode_int(text: str) -> int:
+    """16進数の文字列を整数に戻す内部関数。"""
+    return int(text, 16)
@@ -2,7 +2,8 @@ from pathlib import Path
 
 import matplotlib.pyplot as plt
 
-from src.prob.three_rows_chomp_prob import calculate_three_rows_prob_fraction
+from src.prob.prob_cache import ProbCache
+from src.prob.three_rows_chomp_prob import calculate_three_rows_prob_cube
 
 # Output directory setup
 OUTPUT_DIR = Path(__file__).parent / "output"
@@ -13,6 +14,7 @@ def visualize_three_rows_chomp_prob(
     init_n2: int,
     init_n3: int,
     output_file: str | None = None,
+    cache: ProbCache | None = None,
 ) -> None:
     """指定した初期盤面からn3を動かしながら3行のChompの勝率を計算して可視化する関数。
 
@@ -26,6 +28,8 @@ def visualize_three_rows_chomp_prob(
         3行目のマスの数の初期値
     output_file: str
         出力するファイルのパス
+    cache: ProbCache, optional
+        計算済みの確率のキャッシュ
 
     Returns
     -------
@@ -40,10 +44,8 @@ def visualize_three_rows_chomp_prob(
         output_file = str(OUTPUT_DIR / "three_rows_chomp.png")
 
     # Prepare data for plotting
-    prob_list = [
-        float(calculate_three_rows_prob_fraction(init_n1, init_n2, n3))
-        for n3 in range(init_n3 + 1)
-    ]
+    cube = calculate_three_rows_prob_cube(init_n1, init_n2, init_n3, cache)
+    prob_list = [float(cube[init_n1, init_n2, n3]) for n3 in range(init_n3 + 1)]
     n3_values = list(range(init_n3 + 1))
 
     # Create matplotlib figure
@@ -81,6 +83,7 @@ def batch_visualize_three_rows_prob(
     init_n2: int,
     init_n3: int,
     output_file: str | None = None,
+    cache: ProbCache | None = None,
 ) -> None:
     """複数の盤面をまとめて可視化する関数。
 
@@ -96,6 +99,8 @@ def batch_visualize_three_rows_prob(
         3行目のマスの数の初期値
     output_file: str
         出力するファイルのパス
+    cache: ProbCache, optional
+        計算済みの確率のキャッシュ
 
     Returns
     -------
@@ -109,6 +114,9 @@ def batch_visualize_three_rows_prob(
     if output_file is None:
         output_file = str(OUTPUT_DIR / "batch_three_rows_chomp.png")
 
+    # Compute all probabilities with a single table fill
+    cube = calculate_three_rows_prob_cube(init_n1, init_n2, init_n3, cache)
+
     # Create matplotlib subplots
     rows = init_n1 + 1
     cols = init_n2 + 1
@@ -127,8 +135,7 @@ def batch_visualize_three_rows_prob(
             if n2 <= n1:
                 # Prepare data for plotting
                 prob_list = [
-                    float(calculate_three_rows_prob_fraction(n1, n2, n3))
-                    for n3 in range(min(n2, init_n3) + 1)
+                    float(cube[n1, n2, n3]) for n3 in range(min(n2, init_n3) + 1)
                 ]
                 n3_values = list(range(min(n2, init_n3) + 1))
 
@@ -162,6 +169,7 @@ def batch_visualize_three_rows_prob_overlap_col(
     init_n2: int,
     init_n3: int,
     output_file: str | None = None,
+    cache: ProbCache | None = None,
 ) -> None:
     """同じ列のグラフを1つにまとめて可視化する関数。
 
@@ -177,6 +185,8 @@ def batch_visualize_three_rows_prob_overlap_col(
         3行目のマスの数の初期値
     output_file: str
         出力するファイルのパス
+    cache: ProbCache, optional
+        計算済みの確率のキャッシュ
 
     Returns
     -------
@@ -190,6 +200,9 @@ def batch_visualize_three_rows_prob_overlap_col(
     if output_file is None:
         output_file = str(OUTPUT_DIR / "batch_three_rows_chomp_overlap_col.png")
 
+    # Compute all probabilities with a single table fill
+    cube = calculate_three_rows_prob_cube(init_n1, init_n2, init_n3, cache)
+
     # Create matplotlib subplots (1 row, multiple columns for each n2)
     cols = init_n2 + 1
     fig, axes = plt.subplots(1, cols, figsize=(cols * 4, 5))
@@ -222,10 +235,7 @@ def batch_visualize_three_rows_prob_overlap_col(
         all_y_values = []
         for n1 in range(n2, init_n1 + 1):
             # Prepare data for plotting
-            prob_list = [
-                float(calculate_three_rows_prob_fraction(n1, n2, n3))
-                for n3 in range(min(n2, init_n3) + 1)
-            ]
+            prob_list = [float(cube[n1, n2, n3]) for n3 in range(min(n2, init_n3) + 1)]
             n3_values = list(range(min(n2, init_n3) + 1))
             all_y_values.extend(prob_list)
 
@@ -274,6 +284,7 @@ def batch_visualize_three_rows_prob_overlap_row(
     init_n2: int,
     init_n3: int,
     output_file: str | None = None,
+    cache: ProbCache | None = None,
 ) -> None:
     """同じ行のグラフを1つにまとめて可視化する関数。
 
@@ -289,6 +300,8 @@ def batch_visualize_three_rows_prob_overlap_row(
         3行目のマスの数の初期値
     output_file: str
         出力するファイルのパス
+    cache: ProbCache, optional
+        計算済みの確率のキャッシュ
 
     Returns
     -------
@@ -302,6 +315,9 @@ def batch_visualize_three_rows_prob_overlap_row(
     if output_file is None:
         output_file = str(OUTPUT_DIR / "batch_three_rows_chomp_overlap_row.png")
 
+    # Compute all probabilities with a single table fill
+    cube = calculate_three_rows_prob_cube(init_n1, init_n2, init_n3, cache)
+
     # Create matplotlib subplots (multiple rows, 1 column for each n1)
     rows = init_n1 + 1
     fig, axes = plt.subplots(rows, 1, figsize=(8, rows * 3))
@@ -334,10 +350,7 @@ def batch_visualize_three_rows_prob_overlap_row(
         all_y_values = []
         for n2 in range(min(n1, init_n2) + 1):
             # Prepare data for plotting
-            prob_list = [
-                float(calculate_three_rows_prob_fraction(n1, n2, n3))
-                for n3 in range(min(n2, init_n3) + 1)
-            ]
+            prob_list = [float(cube[n1, n2, n3]) for n3 in range(min(n2, init_n3) + 1)]
             n3_values = list(range(min(n2, init_n3) + 1))
             all_y_values.extend(prob_list)
 
@@ -382,6 +395,7 @@ def batch_visualize_three_rows_prob_overlap_row(
 
 
 if __name__ == "__main__":
-    # batch_visualize_three_rows_prob(20, 16, 12)
-    batch_visualize_three_rows_prob_overlap_col(20, 16, 12)
-    # batch_visualize_three_rows_prob_overlap_row(20, 16, 12)
+    with ProbCache() as prob_cache:
+        # batch_visualize_three_rows_prob(20, 16, 12, cache=prob_cache)
+        batch_visualize_three_rows_prob_overlap_col(20, 16, 12, cache=prob_cache)
+        # batch_visualize_three_rows_prob_overlap_row(20, 16, 12, cache=prob_cache)
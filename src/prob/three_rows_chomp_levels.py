@@ -0,0 +1,91 @@
+from collections.abc import Iterator
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+
+class ThreeRowsLevel(NamedTuple):
+    """マスの総数が等しい3行の盤面をまとめた段。
+
+    3行のChompの再帰式に現れる盤面はいずれもマスの総数が小さいため、
+    同じ段の盤面は互いに依存せず、numpyでまとめて計算できる。
+    累積和の更新に必要な1つ手前の盤面は全て直前の段に含まれる。
+
+    Attributes
+    ----------
+    total : int
+        段に含まれる盤面のマスの総数
+    a : numpy.ndarray
+        1行目のマスの個数
+    b : numpy.ndarray
+        2行目のマスの個数
+    c : numpy.ndarray
+        3行目のマスの個数
+    row_prev : numpy.ndarray
+        盤面 (a-1, b, c) の直前の段での位置。a == b の場合は-1
+    col_prev : numpy.ndarray
+        盤面 (a, b-1, c) の直前の段での位置。b == c の場合は-1
+    last_row_prev : numpy.ndarray
+        盤面 (a, b, c-1) の直前の段での位置。c == 0 の場合は-1
+
+    """
+
+    total: int
+    a: npt.NDArray[np.int64]
+    b: npt.NDArray[np.int64]
+    c: npt.NDArray[np.int64]
+    row_prev: npt.NDArray[np.int64]
+    col_prev: npt.NDArray[np.int64]
+    last_row_prev: npt.NDArray[np.int64]
+
+
+def iter_three_rows_levels(n1: int, n2: int, n3: int) -> Iterator[ThreeRowsLevel]:
+    """(n1, n2, n3) に含まれる3行の盤面をマスの総数ごとの段として列挙する関数。
+
+    Parameters
+    ----------
+    n1: int
+        1行目のマスの個数の上限
+    n2: int
+        2行目のマスの個数の上限
+    n3: int
+        3行目のマスの個数の上限
+
+    Yields
+    ------
+    ThreeRowsLevel
+        マスの総数が0, 1, ..., n1+n2+n3の段。各段の盤面は1行目の昇順に並ぶ。
+
+    """
+    if not n1 >= n2 >= n3 >= 0:
+        msg: str = "盤面は n1 >= n2 >= n3 の形で指定してください。"
+        raise ValueError(msg)
+
+    # 直前の段の盤面 (a, b, total-1-a-b) の位置を (a, b) で引くための表
+    prev_position = np.full((n1 + 1, n2 + 1), -1, dtype=np.int64)
+    position = np.full((n1 + 1, n2 + 1), -1, dtype=np.int64)
+    first_rows = np.arange(n1 + 1, dtype=np.int64)
+
+    for total in range(n1 + n2 + n3 + 1):
+        # c = total - a - b が 0 <= c <= min(b, n3) を満たすbの範囲
+        rest = total - first_rows
+        b_min = np.maximum(np.maximum(-(-rest // 2), rest - n3), 0)
+        b_max = np.minimum(np.minimum(first_rows, n2), rest)
+        counts = np.maximum(b_max - b_min + 1, 0)
+        size = int(counts.sum())
+
+        a = np.repeat(first_rows, counts)
+        starts = np.cumsum(counts) - counts
+        b = np.arange(size, dtype=np.int64) - np.repeat(starts - b_min, counts)
+        c = total - a - b
+
+        row_prev = np.where(a > b, prev_position[np.maximum(a - 1, 0), b], -1)
+        col_prev = np.where(b > c, prev_position[a, np.maximum(b - 1, 0)], -1)
+        last_row_prev = np.where(c > 0, prev_position[a, b], -1)
+
+        position.fill(-1)
+        position[a, b] = np.arange(size, dtype=np.int64)
+        prev_position, position = position, prev_position
+
+        yield ThreeRowsLevel(total, a, b, c, row_prev, col_prev, last_row_prev)
@@ -1,10 +1,232 @@
+import math
+from collections.abc import Iterator, Mapping
 from fractions import Fraction
 
-from src.prob.fraction.calculate_unnormalize_fraction import add_fraction, sub_fraction
+import numpy as np
+import numpy.typing as npt
+
 from src.prob.fraction.unnormalize_fraction import UnnormalizeFraction
+from src.prob.prob_cache import ProbCache
+
+# ProbCacheに保存するときの計算方法の名前とバージョン。
+# 計算結果が変わる修正を行った場合はバージョンを上げる。
+THREE_ROWS_ENGINE: str = "three_rows"
+THREE_ROWS_ENGINE_VERSION: int = 1
+
+
+class ThreeRowsProbTable(Mapping[tuple[int, int, int], Fraction]):
+    """3行のChomp盤面とその全ての部分盤面の先手の勝率をまとめた表。
+
+    (a, b, c) をキーとして、a >= b >= c を満たす部分盤面の勝率を参照できる。
+    表はマスの総数が小さい盤面から順に埋めるため、再帰を用いず
+    sys.setrecursionlimitに依存しない。
+
+    盤面 (a, b, c) の勝率の分母は (a+b+c)! の約数なので、表には勝率に
+    scale = (n1+n2+n3)! を掛けた整数を保持する。
+    (a+b+c)! に下降階乗 (n1+n2+n3)!/(a+b+c)! を掛けて全ての盤面の尺度を揃えたもので、
+    表を埋める間はFractionの生成やgcdの計算を行わず、値を読み出すときにだけ約分する。
+
+    Attributes
+    ----------
+    n1 : int
+        1行目のマスの個数の上限
+    n2 : int
+        2行目のマスの個数の上限
+    n3 : int
+        3行目のマスの個数の上限
+    scale : int
+        表の値の尺度 (n1+n2+n3)!
+
+    """
+
+    def __init__(self, n1: int, n2: int, n3: int) -> None:
+        """ThreeRowsProbTableクラスのコンストラクタ。表の全ての値を計算する。"""
+        _validate_three_rows_board(n1, n2, n3)
+        self.n1 = n1
+        self.n2 = n2
+        self.n3 = n3
+        self.scale: int = math.factorial(n1 + n2 + n3)
+        self._values: dict[tuple[int, int, int], int] = {}
+        self._fill()
+
+    def __getitem__(self, board: tuple[int, int, int]) -> Fraction:
+        """盤面 (a, b, c) の先手の勝率を約分した分数で返す。"""
+        return Fraction(self._values[board], self.scale)
 
+    def get_scaled(self, board: tuple[int, int, int]) -> int:
+        """盤面 (a, b, c) の先手の勝率にscaleを掛けた整数を返す。
+
+        Parameters
+        ----------
+        board : tuple of int
+            盤面 (a, b, c)
+
+        Returns
+        -------
+        int
+            先手の勝率 * scale
+
+        """
+        return self._values[board]
+
+    def get_float(self, board: tuple[int, int, int]) -> float:
+        """盤面 (a, b, c) の先手の勝率を浮動小数点数で返す。
+
+        整数どうしの割り算は正しく丸められるため、約分せずに変換できる。
+
+        Parameters
+        ----------
+        board : tuple of int
+            盤面 (a, b, c)
+
+        Returns
+        -------
+        float
+            先手の勝率
+
+        """
+        return self._values[board] / self.scale
+
+    def __iter__(self) -> Iterator[tuple[int, int, int]]:
+        """表に含まれる盤面をマスの総数の昇順に返す。"""
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        """表に含まれる盤面の数を返す。"""
+        return len(self._values)
+
+    def _fill(self) -> None:
+        """マスの総数の昇順に表を埋める。
+
+        Notes
+        -----
+            再帰式は以下のように表される。:
+            1 - 1/(n1+n2+n3) * (
+                Σ(i=n2 to n1-1) f(i, n2, n3) +
+                Σ(i=n3 to n2-1) f(i, i, n3) +
+                Σ(i=0 to n3-1) f(i, i, i) +
+                Σ(i=n3 to n2-1) f(n1, i, n3) +
+                Σ(i=0 to n3-1) f(n1, i, i) +
+                Σ(i=0 to n3-1) f(n1, n2, i)
+            )
+            右辺の盤面はいずれもマスの総数が小さいため、既に表に入っている。
+
+            6つの和はそれぞれ次の累積和として保持し、各盤面をO(1)回の加算で求める。
+            row_sums[(a, b, c)] = Σ(i=b to a-1) f(i, b, c)
+            diagonal_sums[(b, c)] = Σ(i=c to b-1) f(i, i, c)
+            cube_sums[c] = Σ(i=0 to c-1) f(i, i, i)
+            col_sums[(a, b, c)] = Σ(i=c to b-1) f(a, i, c)
+            corner_sums[(a, c)] = Σ(i=0 to c-1) f(a, i, i)
+            last_row_sums[(a, b, c)] = Σ(i=0 to c-1) f(a, b, i)
+
+            値は全てscaleを掛けた整数で保持する。右辺の和Sの各項の分母は
+            (a+b+c-1)! の約数なので scale * S / (a+b+c) は整数になり、
+            f * scale = scale - (scale * S) // (a+b+c) は整数演算だけで求まる。
+
+        """
+        f = self._values
+        scale = self.scale
+        # 盤面ごとの累積和は次の段(マスの総数が1多い盤面)でしか使わないので、
+        # 直前の段の分だけを保持する
+        level_total = 0
+        prev_sums: dict[tuple[int, int, int], tuple[int, int, int]] = {}
+        sums: dict[tuple[int, int, int], tuple[int, int, int]] = {}
+        diagonal_sums: dict[tuple[int, int], int] = {}
+        corner_sums: dict[tuple[int, int], int] = {}
+        cube_sums: list[int] = [0]
+
+        for a, b, c in iter_three_rows_boards_by_total(self.n1, self.n2, self.n3):
+            total = a + b + c
+            if total != level_total:
+                level_total = total
+                prev_sums, sums = sums, {}
+
+            # 1つ手前の盤面はいずれもマスの総数が1少ないので既に計算済み
+            row_sum = prev_sums[(a - 1, b, c)][0] + f[(a - 1, b, c)] if a > b else 0
+            col_sum = prev_sums[(a, b - 1, c)][1] + f[(a, b - 1, c)] if b > c else 0
+            last_row_sum = (
+                prev_sums[(a, b, c - 1)][2] + f[(a, b, c - 1)] if c > 0 else 0
+            )
+            sum_value = (
+                row_sum
+                + diagonal_sums.get((b, c), 0)
+                + cube_sums[c]
+                + col_sum
+                + corner_sums.get((a, c), 0)
+                + last_row_sum
+            )
+
+            value = scale - sum_value // total if total > 0 else scale
+            f[(a, b, c)] = value
+            sums[(a, b, c)] = (row_sum, col_sum, last_row_sum)
+
+            # 対角線上の盤面が求まったら、それを含む累積和を延ばす
+            if a == b:
+                diagonal_sums[(b + 1, c)] = diagonal_sums.get((b, c), 0) + value
+            if b == c:
+                corner_sums[(a, c + 1)] = corner_sums.get((a, c), 0) + value
+            if a == b == c:
+                cube_sums.append(cube_sums[c] + value)
+
+
+def iter_three_rows_boards_by_total(
+    n1: int,
+    n2: int,
+    n3: int,
+) -> Iterator[tuple[int, int, int]]:
+    """(n1, n2, n3) に含まれる3行の盤面をマスの総数の昇順に列挙する関数。
 
-def calculate_three_rows_prob_fraction(n1: int, n2: int, n3: int) -> Fraction:
+    Parameters
+    ----------
+    n1: int
+        1行目のマスの個数の上限
+    n2: int
+        2行目のマスの個数の上限
+    n3: int
+        3行目のマスの個数の上限
+
+    Yields
+    ------
+    tuple of int
+        a >= b >= c, a <= n1, b <= n2, c <= n3 を満たす盤面 (a, b, c)
+
+    """
+    for total in range(n1 + n2 + n3 + 1):
+        for a in range(min(n1, total) + 1):
+            # c = total - a - b が 0 <= c <= min(b, n3) を満たすbの範囲
+            b_min = max(-(-(total - a) // 2), total - a - n3, 0)
+            b_max = min(a, n2, total - a)
+            for b in range(b_min, b_max + 1):
+                yield a, b, total - a - b
+
+
+def calculate_three_rows_prob_table(n1: int, n2: int, n3: int) -> ThreeRowsProbTable:
+    """3行のChomp盤面の全ての部分盤面の確率を表として計算する関数
+
+    Parameters
+    ----------
+    n1: int
+        1行目のマスの個数
+    n2: int
+        2行目のマスの個数
+    n3: int
+        3行目のマスの個数
+
+    Returns
+    -------
+    ThreeRowsProbTable
+        a <= n1, b <= n2, c <= n3 を満たす全ての盤面 (a, b, c) の確率の表
+
+    """
+    return ThreeRowsProbTable(n1, n2, n3)
+
+
+def calculate_three_rows_prob_fraction(
+    n1: int,
+    n2: int,
+    n3: int,
+    cache: ProbCache | None = None,
+) -> Fraction:
     """3行のChomp盤面における確率を計算する関数
 
     Parameters
@@ -15,6 +237,9 @@ def calculate_three_rows_prob_fraction(n1: int, n2: int, n3: int) -> Fraction:
         2行目のマスの個数
     n3: int
         3行目のマスの個数
+    cache: ProbCache, optional
+        計算済みの確率のキャッシュ。キャッシュにない場合は表を計算し、
+        表に含まれる全ての部分盤面の確率をキャッシュに保存する。
 
     Returns
     -------
@@ -32,72 +257,90 @@ def calculate_three_rows_prob_fraction(n1: int, n2: int, n3: int) -> Fraction:
             Σ(i=0 to n3-1) f(n1, i, i) +
             Σ(i=0 to n3-1) f(n1, n2, i)
         )
+        計算はcalculate_three_rows_prob_tableで表を埋めて行う。
 
     """
-    # メモ化用の辞書
-    memo = {}
+    if cache is None:
+        return calculate_three_rows_prob_table(n1, n2, n3)[(n1, n2, n3)]
 
-    def f(a: int, b: int, c: int) -> Fraction:
-        """内部関数: メモ化を用いた再帰計算
+    cached = cache.get(THREE_ROWS_ENGINE, THREE_ROWS_ENGINE_VERSION, (n1, n2, n3))
+    if cached is not None:
+        return cached
 
-        Parameters
-        ----------
-        a: int
-            1行目のマスの個数
-        b: int
-            2行目のマスの個数
-        c: int
-            3行目のマスの個数
+    table = calculate_three_rows_prob_table(n1, n2, n3)
+    cache.put_many(THREE_ROWS_ENGINE, THREE_ROWS_ENGINE_VERSION, table.items())
+    return table[(n1, n2, n3)]
 
-        Returns
-        -------
-        Fraction
-            確率 (分数形式)
 
-        """
-        # 基底条件
-        if a == 0 and b == 0 and c == 0:
-            return Fraction(1)
+def calculate_three_rows_prob_cube(
+    n1: int,
+    n2: int,
+    n3: int,
+    cache: ProbCache | None = None,
+) -> npt.NDArray[np.float64]:
+    """3行のChomp盤面 (n1, n2, n3) の全ての部分盤面の確率を配列で求める関数
 
-        # メモ化チェック
-        if (a, b, c) in memo:
-            return memo[(a, b, c)]
+    1回の表の計算で全ての盤面の確率が求まるため、盤面ごとに
+    calculate_three_rows_prob_fractionを呼ぶよりもはるかに高速である。
 
-        # 再帰式の計算
-        total = a + b + c
-        sum_value = Fraction(0)
+    Parameters
+    ----------
+    n1: int
+        1行目のマスの個数の上限
+    n2: int
+        2行目のマスの個数の上限
+    n3: int
+        3行目のマスの個数の上限
+    cache: ProbCache, optional
+        計算済みの確率のキャッシュ。全ての盤面がキャッシュにある場合は計算を行わない。
 
-        # Σ(i=n2 to n1-1) f(i, n2, n3)
-        for i in range(b, a):
-            sum_value += f(i, b, c)
+    Returns
+    -------
+    numpy.ndarray
+        形が (n1+1, n2+1, n3+1) の配列。[a, b, c] 成分が盤面 (a, b, c) の確率で、
+        a >= b >= c を満たさない成分はnanになる。
 
-        # Σ(i=n3 to n2-1) f(i, i, n3)
-        for i in range(c, b):
-            sum_value += f(i, i, c)
+    """
+    _validate_three_rows_board(n1, n2, n3)
+    cube = np.full((n1 + 1, n2 + 1, n3 + 1), np.nan)
+    boards = list(iter_three_rows_boards_by_total(n1, n2, n3))
 
-        # Σ(i=0 to n3-1) f(i, i, i)
-        for i in range(c):
-            sum_value += f(i, i, i)
+    if cache is not None:
+        cached = cache.get_all(THREE_ROWS_ENGINE, THREE_ROWS_ENGINE_VERSION)
+        if all(board in cached for board in boards):
+            for board in boards:
+                cube[board] = float(cached[board])
+            return cube
 
-        # Σ(i=n3 to n2-1) f(n1, i, n3)
-        for i in range(c, b):
-            sum_value += f(a, i, c)
+    table = calculate_three_rows_prob_table(n1, n2, n3)
+    if cache is not None:
+        cache.put_many(THREE_ROWS_ENGINE, THREE_ROWS_ENGINE_VERSION, table.items())
+    for board in boards:
+        cube[board] = table.get_float(board)
+    return cube
 
-        # Σ(i=0 to n3-1) f(n1, i, i)
-        for i in range(c):
-            sum_value += f(a, i, i)
 
-        # Σ(i=0 to n3-1) f(n1, n2, i)
-        for i in range(c):
-            sum_value += f(a, b, i)
+def _validate_three_rows_board(n1: int, n2: int, n3: int) -> None:
+    """盤面が n1 >= n2 >= n3 >= 0 を満たすことを確認する内部関数。
 
-        result = Fraction(1) - Fraction(sum_value, total)
+    Parameters
+    ----------
+    n1: int
+        1行目のマスの個数
+    n2: int
+        2行目のマスの個数
+    n3: int
+        3行目のマスの個数
 
-        # メモ化
-        memo[(a, b, c)] = result
-        return result
+    Raises
+    ------
+    ValueError
+        盤面が n1 >= n2 >= n3 >= 0 を満たさない場合
 
-    return f(n1, n2, n3)
+    """
+    if not n1 >= n2 >= n3 >= 0:
+        msg: str = "盤面は n1 >= n2 >= n3 の形で指定してください。"
+        raise ValueError(msg)
 
 
 def calculate_three_rows_prob_unnormalized_fraction(
@@ -169,33 +412,30 @@ def calculate_three_rows_prob_unnormalized_fraction(
 
         # Σ(i=n2 to n1-1) f(i, n2, n3)
         for i in range(b, a):
-            sum_value = add_fraction(sum_value, f(i, b, c))
+            sum_value += f(i, b, c)
 
         # Σ(i=n3 to n2-1) f(i, i, n3)
         for i in range(c, b):
-            sum_value = add_fraction(sum_value, f(i, i, c))
+            sum_value += f(i, i, c)
 
         # Σ(i=0 to n3-1) f(i, i, i)
         for i in range(c):
-            sum_value = add_fraction(sum_value, f(i, i, i))
+            sum_value += f(i, i, i)
 
         # Σ(i=n3 to n2-1) f(n1, i, n3)
         for i in range(c, b):
-            sum_value = add_fraction(sum_value, f(a, i, c))
+            sum_value += f(a, i, c)
 
         # Σ(i=0 to n3-1) f(n1, i, i)
         for i in range(c):
-            sum_value = add_fraction(sum_value, f(a, i, i))
+            sum_value += f(a, i, i)
 
         # Σ(i=0 to n3-1) f(n1, n2, i)
         for i in range(c):
-            sum_value = add_fraction(sum_value, f(a, b, i))
+            sum_value += f(a, b, i)
 
         # 確率の計算
-        result: UnnormalizeFraction = sub_fraction(
-            UnnormalizeFraction(1, 1),
-            UnnormalizeFraction(sum_value.numerator, sum_value.denominator * total),
-        )
+        result: UnnormalizeFraction = 1 - sum_value / total
 
         # メモ化
         memo[(a, b, c)] = result
@@ -212,6 +452,11 @@ def is_multiple_number(
 ) -> bool:
     """整数nがChompの確率の分母の倍数であるかを判定する関数。
 
+    再帰項 1/2 - f(n1, n2, n3) を約分した分母が、下降階乗
+    (n1+n2+n3)(n1+n2+n3-1)...(n1+n2+n3-n) で割り切れるかを判定する。
+    約分しない分母は計算の順序や約分の閾値によって変わるため、
+    常に約分した分母を用いる。
+
     Parameters
     ----------
     n: int
@@ -226,7 +471,7 @@ def is_multiple_number(
     Returns
     -------
     bool
-        nが確率の分母の倍数であればTrue、そうでなければFalse
+        約分した再帰項の分母が下降階乗の倍数であればTrue、そうでなければFalse
 
     Raises
     ------
@@ -240,10 +485,10 @@ def is_multiple_number(
         n2,
         n3,
     )  # 再帰的に求めた確率
-    recurrence_term: UnnormalizeFraction = sub_fraction(
-        UnnormalizeFraction(1, 2),
-        prob,
-    )  # 再帰項
+    # 約分の閾値によって分母が変わらないよう、約分してから判定する
+    recurrence_term: UnnormalizeFraction = (
+        UnnormalizeFraction(1, 2) - prob
+    ).normalize()  # 再帰項
 
     for i in range(n + 1):
         recurrence_denominator *= n1 + n2 + n3 - i
@@ -0,0 +1,187 @@
+from fractions import Fraction
+
+import numpy as np
+import numpy.typing as npt
+
+from src.prob.three_rows_chomp_levels import iter_three_rows_levels
+from src.prob.three_rows_chomp_prob import calculate_three_rows_prob_fraction
+
+FloatArray = npt.NDArray[np.float64]
+
+
+def calculate_three_rows_prob_interval_cube(
+    n1: int,
+    n2: int,
+    n3: int,
+) -> tuple[FloatArray, FloatArray]:
+    """3行のChompの全ての部分盤面の確率を、厳密値を必ず含む区間として求める関数。
+
+    calculate_three_rows_prob_residuesと同じく、マスの総数が等しい盤面の段ごとに
+    numpyでまとめて計算する。浮動小数点数の演算の結果は最も近い値に丸められるため、
+    各演算の後で下限は1つ小さい浮動小数点数に、上限は1つ大きい浮動小数点数にずらし、
+    厳密値が区間から外れないようにする。
+
+    Parameters
+    ----------
+    n1: int
+        1行目のマスの個数の上限
+    n2: int
+        2行目のマスの個数の上限
+    n3: int
+        3行目のマスの個数の上限
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        (下限, 上限)。いずれも形が (n1+1, n2+1, n3+1) の配列で、
+        a >= b >= c を満たさない成分はnanになる。
+
+    """
+    lower_cube = np.full((n1 + 1, n2 + 1, n3 + 1), np.nan)
+    upper_cube = np.full((n1 + 1, n2 + 1, n3 + 1), np.nan)
+
+    # 累積和はcalculate_three_rows_prob_tableと同じ6種類を、下限と上限の組で持つ
+    diagonal_sums = np.zeros((2, n2 + 2, n3 + 1))
+    corner_sums = np.zeros((2, n1 + 1, n3 + 2))
+    cube_sums = np.zeros((2, n3 + 2))
+    empty = np.zeros((2, 0))
+    prev_f = prev_row_sums = prev_col_sums = prev_last_row_sums = empty
+
+    for level in iter_three_rows_levels(n1, n2, n3):
+        a, b, c = level.a, level.b, level.c
+        row_sums = _shifted_interval_sums(level.row_prev, prev_row_sums, prev_f)
+        col_sums = _shifted_interval_sums(level.col_prev, prev_col_sums, prev_f)
+        last_row_sums = _shifted_interval_sums(
+            level.last_row_prev,
+            prev_last_row_sums,
+            prev_f,
+        )
+        sum_value = row_sums
+        for term in (
+            diagonal_sums[:, b, c],
+            cube_sums[:, c],
+            col_sums,
+            corner_sums[:, a, c],
+            last_row_sums,
+        ):
+            sum_value = _add_interval(sum_value, term)
+
+        if level.total == 0:
+            f = np.ones_like(sum_value)
+        else:
+            # f = 1 - S / total は S について減少するので、下限と上限が入れ替わる
+            lower = _round_down(1 - _round_up(sum_value[1] / level.total))
+            upper = _round_up(1 - _round_down(sum_value[0] / level.total))
+            f = np.stack([np.maximum(lower, 0.0), np.minimum(upper, 1.0)])
+
+        lower_cube[a, b, c] = f[0]
+        upper_cube[a, b, c] = f[1]
+
+        on_diagonal = a == b
+        diagonal_sums[:, b[on_diagonal] + 1, c[on_diagonal]] = _add_interval(
+            diagonal_sums[:, b[on_diagonal], c[on_diagonal]],
+            f[:, on_diagonal],
+        )
+        on_corner = b == c
+        corner_sums[:, a[on_corner], c[on_corner] + 1] = _add_interval(
+            corner_sums[:, a[on_corner], c[on_corner]],
+            f[:, on_corner],
+        )
+        on_cube = on_diagonal & on_corner
+        cube_sums[:, c[on_cube] + 1] = _add_interval(
+            cube_sums[:, c[on_cube]],
+            f[:, on_cube],
+        )
+
+        prev_f = f
+        prev_row_sums = row_sums
+        prev_col_sums = col_sums
+        prev_last_row_sums = last_row_sums
+
+    return lower_cube, upper_cube
+
+
+def calculate_three_rows_prob_interval(
+    n1: int,
+    n2: int,
+    n3: int,
+    max_width: float | None = None,
+) -> tuple[float, float]:
+    """3行のChomp盤面における確率を、厳密値を必ず含む区間として求める関数
+
+    Parameters
+    ----------
+    n1: int
+        1行目のマスの個数
+    n2: int
+        2行目のマスの個数
+    n3: int
+        3行目のマスの個数
+    max_width: float, optional
+        区間の幅の上限。区間の幅がこれを超える場合は厳密な分数を計算し、
+        それを含む最も狭い区間を返す。
+
+    Returns
+    -------
+    tuple of float
+        (下限, 上限)
+
+    """
+    lower_cube, upper_cube = calculate_three_rows_prob_interval_cube(n1, n2, n3)
+    lower = float(lower_cube[n1, n2, n3])
+    upper = float(upper_cube[n1, n2, n3])
+    if max_width is None or upper - lower <= max_width:
+        return lower, upper
+    return _enclose_fraction(calculate_three_rows_prob_fraction(n1, n2, n3))
+
+
+def _add_interval(x: FloatArray, y: FloatArray) -> FloatArray:
+    """(下限, 上限) の組で表した区間どうしを、外側に丸めて足す内部関数。"""
+    return np.stack([_round_down(x[0] + y[0]), _round_up(x[1] + y[1])])
+
+
+def _round_down(x: FloatArray) -> FloatArray:
+    """丸められた演算結果を、1つ小さい浮動小数点数にずらす内部関数。"""
+    return np.nextafter(x, -np.inf)
+
+
+def _round_up(x: FloatArray) -> FloatArray:
+    """丸められた演算結果を、1つ大きい浮動小数点数にずらす内部関数。"""
+    return np.nextafter(x, np.inf)
+
+
+def _shifted_interval_sums(
+    prev_index: npt.NDArray[np.int64],
+    prev_sums: FloatArray,
+    prev_f: FloatArray,
+) -> FloatArray:
+    """直前の段の累積和に1項を加えて、この段の累積和の区間を求める内部関数。
+
+    Parameters
+    ----------
+    prev_index : numpy.ndarray
+        1つ手前の盤面の直前の段での位置。-1の場合は累積和が0になる。
+    prev_sums : numpy.ndarray
+        直前の段の累積和の (下限, 上限)
+    prev_f : numpy.ndarray
+        直前の段の勝率の (下限, 上限)
+
+    Returns
+    -------
+    numpy.ndarray
+        この段の累積和の (下限, 上限)
+
+    """
+    sums = np.zeros((2, len(prev_index)))
+    valid = prev_index >= 0
+    index = prev_index[valid]
+    sums[:, valid] = _add_interval(prev_sums[:, index], prev_f[:, index])
+    return sums
+
+
+def _enclose_fraction(value: Fraction) -> tuple[float, float]:
+    """分数を含む最も狭い浮動小数点数の区間を求める内部関数。"""
+    nearest = float(value)
+    lower = nearest if Fraction(nearest) <= value else float(_round_down(nearest))
+    upper = nearest if Fraction(nearest) >= value else float(_round_up(nearest))
+    return lower, upper
@@ -0,0 +1,257 @@
+import math
+from collections.abc import Iterable
+from fractions import Fraction
+
+import numpy as np
+import numpy.typing as npt
+
+from src.prob.modular_arithmetic import (
+    chinese_remainder,
+    generate_primes,
+    inverse_table,
+    rational_reconstruction,
+)
+from src.prob.three_rows_chomp_levels import ThreeRowsLevel, iter_three_rows_levels
+
+# 6つの累積和の和 (< 6p) と逆元 (< p) の積がuint64に収まるよう、素数は2^30未満にとる
+MODULAR_PRIME_UPPER_BOUND: int = 1 << 30
+# 1つの素数の組で同時に扱う (段の盤面数 * 素数の個数) の目安。
+# 段ごとの配列がCPUのキャッシュに収まる大きさにする
+_BATCH_ELEMENTS: int = 1 << 16
+
+
+def required_prime_count(n1: int, n2: int, n3: int) -> int:
+    """確率の復元に必要な素数の個数を求める関数。
+
+    先手の勝率f(a, b, c)の分母は (a+b+c)! の約数であり、0 <= f <= 1 なので、
+    N = n1+n2+n3 として N! * f(n1, n2, n3) は0以上N!以下の整数になる。
+    したがって法が 2 * N! を超えればこの整数は一意に定まる。
+
+    Parameters
+    ----------
+    n1: int
+        1行目のマスの個数
+    n2: int
+        2行目のマスの個数
+    n3: int
+        3行目のマスの個数
+
+    Returns
+    -------
+    int
+        必要な素数の個数
+
+    """
+    bound_bits = (2 * math.factorial(n1 + n2 + n3)).bit_length()
+    # 用いる素数はいずれも2^29より大きいので、1個あたり29ビット以上を担う
+    return bound_bits // 29 + 1
+
+
+def calculate_three_rows_prob_residues(
+    n1: int,
+    n2: int,
+    n3: int,
+    primes: npt.NDArray[np.int64],
+    levels: Iterable[ThreeRowsLevel] | None = None,
+) -> npt.NDArray[np.int64]:
+    """3行のChomp盤面の先手の勝率を、各素数を法として計算する関数。
+
+    マスの総数が等しい盤面を1つの段としてまとめ、段ごとに
+    (段の盤面数, 素数の個数) の配列でnumpyによる剰余演算を行う。
+    割り算はマスの総数の逆元を掛けることで行う。
+    値は常に素数未満に保ち、足し算は剰余の代わりに素数を1回引く比較で戻すため、
+    盤面1つあたりの剰余演算は逆元との積の1回だけである。
+
+    Parameters
+    ----------
+    n1: int
+        1行目のマスの個数
+    n2: int
+        2行目のマスの個数
+    n3: int
+        3行目のマスの個数
+    primes : numpy.ndarray
+        法とする素数の配列。いずれもn1+n2+n3より大きく2^30未満でなければならない。
+    levels : Iterable of ThreeRowsLevel, optional
+        iter_three_rows_levels(n1, n2, n3) の段。複数の素数の組で計算する場合に
+        段の列挙を1回で済ませるために渡す。
+
+    Returns
+    -------
+    numpy.ndarray
+        各素数を法とした先手の勝率
+
+    """
+    if levels is None:
+        levels = iter_three_rows_levels(n1, n2, n3)
+    prime_count = len(primes)
+    p = primes.astype(np.uint64)[np.newaxis, :]
+    p_plus_one = p + np.uint64(1)
+    inverses = inverse_table(n1 + n2 + n3 + 1, primes).astype(np.uint64)
+
+    # 累積和はcalculate_three_rows_prob_tableと同じ6種類を用いる
+    diagonal_sums = np.zeros((n2 + 2, n3 + 1, prime_count), dtype=np.uint64)
+    corner_sums = np.zeros((n1 + 1, n3 + 2, prime_count), dtype=np.uint64)
+    cube_sums = np.zeros((n3 + 2, prime_count), dtype=np.uint64)
+    # 段ごとの配列は末尾に0の行を持ち、位置-1を引くと0が得られる
+    zero = np.zeros((1, prime_count), dtype=np.uint64)
+    prev_f = prev_row_sums = prev_col_sums = prev_last_row_sums = zero
+
+    for level in levels:
+        a, b, c = level.a, level.b, level.c
+        # この段の累積和は、1つ手前の盤面の累積和にその盤面の勝率を加えたもの
+        row_sums = _add_mod(prev_row_sums, prev_f, p)[_with_sentinel(level.row_prev)]
+        col_sums = _add_mod(prev_col_sums, prev_f, p)[_with_sentinel(level.col_prev)]
+        last_row_sums = _add_mod(prev_last_row_sums, prev_f, p)[
+            _with_sentinel(level.last_row_prev)
+        ]
+
+        # 6つの項はいずれもp未満なので、和は6p未満でuint64に収まる
+        sum_value = row_sums + col_sums
+        sum_value += last_row_sums
+        sum_value[:-1] += diagonal_sums[b, c]
+        sum_value[:-1] += cube_sums[c]
+        sum_value[:-1] += corner_sums[a, c]
+
+        # f = 1 - sum / total。段0では逆元の表が0なのでf = 1になる
+        sum_value *= inverses[level.total]
+        sum_value %= p
+        f = np.subtract(p_plus_one, sum_value, out=sum_value)
+        f = _reduce_once(f, p)
+        f[-1] = 0
+
+        on_diagonal = a == b
+        diagonal_sums[b[on_diagonal] + 1, c[on_diagonal]] = _add_mod(
+            diagonal_sums[b[on_diagonal], c[on_diagonal]],
+            f[:-1][on_diagonal],
+            p,
+        )
+        on_corner = b == c
+        corner_sums[a[on_corner], c[on_corner] + 1] = _add_mod(
+            corner_sums[a[on_corner], c[on_corner]],
+            f[:-1][on_corner],
+            p,
+        )
+        on_cube = on_diagonal & on_corner
+        cube_sums[c[on_cube] + 1] = _add_mod(
+            cube_sums[c[on_cube]],
+            f[:-1][on_cube],
+            p,
+        )
+
+        prev_f = f
+        prev_row_sums = row_sums
+        prev_col_sums = col_sums
+        prev_last_row_sums = last_row_sums
+
+    # 最後の段は盤面 (n1, n2, n3) のみからなる
+    return prev_f[0].astype(np.int64)
+
+
+def calculate_three_rows_prob_fraction_modular(
+    n1: int,
+    n2: int,
+    n3: int,
+    prime_count: int | None = None,
+    batch_size: int | None = None,
+) -> Fraction:
+    """3行のChomp盤面における確率を、複数の素数を法とする計算から復元する関数
+
+    多倍長の分数演算の代わりに、ワードサイズの素数を法とした剰余で再帰式を計算し、
+    中国剰余定理と有理数復元によって厳密な分数を求める。
+    分母が (n1+n2+n3)! の約数であることを用いて、整数 (n1+n2+n3)! * f を
+    (分母の上限を1とする) 有理数復元で求めるため、分子と分母の両方を
+    復元する場合の約半分の素数で済む。
+    大きな盤面ではcalculate_three_rows_prob_fractionより高速である
+    (n1 = n2 = n3 = 200 で約2.3倍)。
+
+    Parameters
+    ----------
+    n1: int
+        1行目のマスの個数
+    n2: int
+        2行目のマスの個数
+    n3: int
+        3行目のマスの個数
+    prime_count: int, optional
+        用いる素数の個数。省略した場合は復元が一意になる最小の個数を用いる。
+    batch_size: int, optional
+        同時に計算する素数の個数。省略した場合は段ごとの配列がCPUのキャッシュに
+        収まるように、最大の段の盤面数から決める。
+
+    Returns
+    -------
+    Fraction
+        確率 (分数形式)
+
+    Raises
+    ------
+    ValueError
+        素数の個数が足りず、復元結果が一意に定まるとは限らない場合
+
+    """
+    if not n1 >= n2 >= n3 >= 0:
+        msg: str = "盤面は n1 >= n2 >= n3 の形で指定してください。"
+        raise ValueError(msg)
+    if prime_count is None:
+        prime_count = required_prime_count(n1, n2, n3)
+
+    # 段の列挙は素数の組によらないので1回だけ行う
+    levels = list(iter_three_rows_levels(n1, n2, n3))
+    if batch_size is None:
+        max_level_size = max(len(level.a) for level in levels)
+        batch_size = max(1, _BATCH_ELEMENTS // max_level_size)
+
+    total = n1 + n2 + n3
+    primes = generate_primes(prime_count, MODULAR_PRIME_UPPER_BOUND)
+    residues: list[int] = []
+    for start in range(0, prime_count, batch_size):
+        batch = primes[start : start + batch_size]
+        residues.extend(
+            int(r)
+            for r in calculate_three_rows_prob_residues(n1, n2, n3, batch, levels)
+        )
+
+    # total! * f の剰余から整数 total! * f を復元する
+    moduli = [int(prime) for prime in primes]
+    scaled_residues = [
+        residue * _factorial_mod(total, prime) % prime
+        for residue, prime in zip(residues, moduli, strict=True)
+    ]
+    value, modulus = chinese_remainder(scaled_residues, moduli)
+    factorial = math.factorial(total)
+    scaled = rational_reconstruction(value, modulus, factorial, 1)
+    return Fraction(scaled.numerator, factorial)
+
+
+def _add_mod(
+    x: npt.NDArray[np.uint64],
+    y: npt.NDArray[np.uint64],
+    p: npt.NDArray[np.uint64],
+) -> npt.NDArray[np.uint64]:
+    """p未満の2つの値の和をpで割った余りを、剰余演算を使わずに求める内部関数。"""
+    return _reduce_once(x + y, p)
+
+
+def _reduce_once(
+    x: npt.NDArray[np.uint64],
+    p: npt.NDArray[np.uint64],
+) -> npt.NDArray[np.uint64]:
+    """2p未満の値をp未満に戻す内部関数。xを書き換えて返す。
+
+    x < p のとき x - p は桁あふれして x より大きくなるため、小さい方を選べばよい。
+    """
+    return np.minimum(x, x - p, out=x)
+
+
+def _with_sentinel(prev_index: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+    """段の末尾の0の行に対応する位置-1を、位置の配列の末尾に加える内部関数。"""
+    return np.append(prev_index, -1)
+
+
+def _factorial_mod(n: int, prime: int) -> int:
+    """階乗n!をprimeで割った余りを求める内部関数。"""
+    result = 1
+    for i in range(2, n + 1):
+        result = result * i % prime
+    return result
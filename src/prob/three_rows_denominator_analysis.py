@@ -0,0 +1,276 @@
+import math
+import sqlite3
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from config import RESULT_DIR
+from src.prob.three_rows_chomp_prob import (
+    calculate_three_rows_prob_table,
+    iter_three_rows_boards_by_total,
+)
+
+DEFAULT_ANALYSIS_PATH: Path = RESULT_DIR / "three_rows_denominators.sqlite3"
+
+
+class DenominatorRecord(NamedTuple):
+    """3行の盤面の再帰項 1/2 - f(a, b, c) の分母の構造。
+
+    Attributes
+    ----------
+    board : tuple of int
+        盤面 (a, b, c)
+    denominator : int
+        約分した再帰項の分母
+    valuations : dict of int to int
+        分母の素因数分解 (素数から指数への辞書)。
+        分母は 2 * (a+b+c)! の約数なので、素因数は max(2, a+b+c) 以下である。
+    falling_factorial_length : int
+        下降階乗 (a+b+c)(a+b+c-1)...(a+b+c-m+1) が分母を割り切るような最大のm。
+        is_multiple_number(n, a, b, c) は m >= n+1 と同値である。
+
+    """
+
+    board: tuple[int, int, int]
+    denominator: int
+    valuations: dict[int, int]
+    falling_factorial_length: int
+
+
+def analyze_three_rows_denominators(
+    n1: int,
+    n2: int,
+    n3: int,
+) -> Iterator[DenominatorRecord]:
+    """(n1, n2, n3) の全ての部分盤面について、再帰項の分母の構造を求める関数。
+
+    確率の表を1回だけ計算し、全ての盤面の分母をその表から求める。
+    盤面ごとにis_multiple_numberを呼んで確率を計算し直す必要はない。
+
+    Parameters
+    ----------
+    n1: int
+        1行目のマスの個数の上限
+    n2: int
+        2行目のマスの個数の上限
+    n3: int
+        3行目のマスの個数の上限
+
+    Yields
+    ------
+    DenominatorRecord
+        マスの総数の昇順に並んだ各盤面の分母の構造
+
+    """
+    table = calculate_three_rows_prob_table(n1, n2, n3)
+    primes = _primes_up_to(max(2, n1 + n2 + n3))
+    # 分母は 2 * total! の約数なので、2 * total! の素因数分解から
+    # 小さな余因数 2 * total! / 分母 の素因数分解を引いて求める
+    factorials = [1]
+    for total in range(1, n1 + n2 + n3 + 1):
+        factorials.append(factorials[-1] * total)
+    factorial_valuations = [
+        _double_factorial_valuations(total, primes) for total in range(n1 + n2 + n3 + 1)
+    ]
+
+    for board in iter_three_rows_boards_by_total(n1, n2, n3):
+        total = sum(board)
+        # 1/2 - F / scale = (scale - 2F) / (2 * scale)
+        numerator = table.scale - 2 * table.get_scaled(board)
+        denominator = 2 * table.scale // math.gcd(numerator, 2 * table.scale)
+        valuations = factorial_valuations[total].copy()
+        cofactor = _factorize(2 * factorials[total] // denominator, primes)
+        for prime, exponent in cofactor.items():
+            valuations[prime] -= exponent
+            if valuations[prime] == 0:
+                del valuations[prime]
+        yield DenominatorRecord(
+            board,
+            denominator,
+            valuations,
+            _falling_factorial_length(denominator, total),
+        )
+
+
+def save_denominator_records(
+    records: Iterable[DenominatorRecord],
+    path: Path | str = DEFAULT_ANALYSIS_PATH,
+) -> int:
+    """分母の構造をSQLiteの表に保存する関数。
+
+    denominatorsテーブルには盤面ごとの分母と下降階乗の長さを、
+    valuationsテーブルには盤面と素数ごとの指数を保存するため、
+    「3で2回以上割り切れる盤面」などの仮説をSQLで検証できる。
+    同じ盤面が既に保存されている場合は上書きする。
+
+    Parameters
+    ----------
+    records : Iterable of DenominatorRecord
+        保存する分母の構造
+    path : pathlib.Path or str, optional
+        保存先のファイルのパス
+
+    Returns
+    -------
+    int
+        保存した盤面の数
+
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    denominator_rows = []
+    valuation_rows = []
+    for record in records:
+        a, b, c = record.board
+        denominator_rows.append(
+            (
+                a,
+                b,
+                c,
+                a + b + c,
+                hex(record.denominator),
+                record.denominator.bit_length(),
+                record.falling_factorial_length,
+            ),
+        )
+        valuation_rows.extend(
+            (a, b, c, prime, exponent) for prime, exponent in record.valuations.items()
+        )
+
+    connection = sqlite3.connect(path)
+    try:
+        with connection:
+            _create_tables(connection)
+            connection.executemany(
+                "DELETE FROM valuations WHERE a = ? AND b = ? AND c = ?",
+                [row[:3] for row in denominator_rows],
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO denominators "
+                "(a, b, c, total, denominator, bit_length, falling_factorial_length) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                denominator_rows,
+            )
+            connection.executemany(
+                "INSERT INTO valuations (a, b, c, prime, exponent) "
+                "VALUES (?, ?, ?, ?, ?)",
+                valuation_rows,
+            )
+    finally:
+        connection.close()
+    return len(denominator_rows)
+
+
+def load_denominator_records(
+    path: Path | str = DEFAULT_ANALYSIS_PATH,
+) -> dict[tuple[int, int, int], DenominatorRecord]:
+    """保存された分母の構造を読み込む関数。
+
+    Parameters
+    ----------
+    path : pathlib.Path or str, optional
+        保存先のファイルのパス
+
+    Returns
+    -------
+    dict of tuple of int to DenominatorRecord
+        盤面から分母の構造への辞書
+
+    """
+    connection = sqlite3.connect(path)
+    try:
+        valuations: dict[tuple[int, int, int], dict[int, int]] = {}
+        for a, b, c, prime, exponent in connection.execute(
+            "SELECT a, b, c, prime, exponent FROM valuations ORDER BY prime",
+        ):
+            valuations.setdefault((a, b, c), {})[prime] = exponent
+        return {
+            (a, b, c): DenominatorRecord(
+                (a, b, c),
+                int(denominator, 16),
+                valuations.get((a, b, c), {}),
+                falling_factorial_length,
+            )
+            for a, b, c, denominator, falling_factorial_length in connection.execute(
+                "SELECT a, b, c, denominator, falling_factorial_length "
+                "FROM denominators",
+            )
+        }
+    finally:
+        connection.close()
+
+
+def _create_tables(connection: sqlite3.Connection) -> None:
+    """分母の構造を保存する表を作る内部関数。"""
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS denominators (
+            a INTEGER NOT NULL,
+            b INTEGER NOT NULL,
+            c INTEGER NOT NULL,
+            total INTEGER NOT NULL,
+            denominator TEXT NOT NULL,
+            bit_length INTEGER NOT NULL,
+            falling_factorial_length INTEGER NOT NULL,
+            PRIMARY KEY (a, b, c)
+        ) WITHOUT ROWID
+        """,
+    )
+    connection.execute(
+        """
+        CREATE TABLE IF NOT EXISTS valuations (
+            a INTEGER NOT NULL,
+            b INTEGER NOT NULL,
+            c INTEGER NOT NULL,
+            prime INTEGER NOT NULL,
+            exponent INTEGER NOT NULL,
+            PRIMARY KEY (a, b, c, prime)
+        ) WITHOUT ROWID
+        """,
+    )
+
+
+def _primes_up_to(limit: int) -> list[int]:
+    """limit以下の素数をエラトステネスの篩で求める内部関数。"""
+    is_prime = bytearray([1]) * (limit + 1)
+    is_prime[:2] = b"\x00\x00"
+    for i in range(2, math.isqrt(limit) + 1):
+        if is_prime[i]:
+            is_prime[i * i :: i] = bytes(len(range(i * i, limit + 1, i)))
+    return [i for i in range(limit + 1) if is_prime[i]]
+
+
+def _factorize(value: int, primes: list[int]) -> dict[int, int]:
+    """与えられた素数だけを素因数に持つ整数を素因数分解する内部関数。"""
+    valuations: dict[int, int] = {}
+    for prime in primes:
+        if value == 1:
+            break
+        exponent = 0
+        while value % prime == 0:
+            value //= prime
+            exponent += 1
+        if exponent > 0:
+            valuations[prime] = exponent
+    return valuations
+
+
+def _double_factorial_valuations(total: int, primes: list[int]) -> dict[int, int]:
+    """2 * total! の素因数分解をルジャンドルの公式で求める内部関数。"""
+    valuations = {2: 1}
+    for prime in primes:
+        power = prime
+        while power <= total:
+            valuations[prime] = valuations.get(prime, 0) + total // power
+            power *= prime
+    return valuations
+
+
+def _falling_factorial_length(denominator: int, total: int) -> int:
+    """total(total-1)...(total-m+1) が分母を割り切る最大のmを求める内部関数。"""
+    product = 1
+    for length in range(total):
+        product *= total - length
+        if denominator % product != 0:
+            return length
+    return total
@@ -1,11 +1,34 @@
 import math
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
 from fractions import Fraction
 
 import numpy as np
+import numpy.typing as npt
 
+BINARY_SPLITTING_THRESHOLD: int = 1000  # キャッシュからこれ以上離れたkは積の木で求める
+BINARY_SPLITTING_LEAF_SIZE: int = 32  # 積の木の葉で順に掛け合わせる行列の個数
 
-def calculate_mutual_recurrence_relation(k: int) -> np.ndarray:
-    """相互再帰関係を計算する関数。
+# 2x2行列 (m00, m01, m10, m11) と、(2i-1)(2i) の積をまとめた組
+MatrixProduct = tuple[int, int, int, int, int]
+
+# 勝率の式が使えない盤面の勝率 (これ以外の k = 0 の盤面の勝率は1/2)
+_SPECIAL_TWO_ROWS_PROBS: dict[tuple[int, int], Fraction] = {
+    (0, 0): Fraction(1),
+    (1, 0): Fraction(0),
+    (1, 1): Fraction(1, 2),
+}
+
+# 計算済みの (a_k, b_k) を k = 1, 2, ... の順に保存するキャッシュ
+_recurrence_cache: list[tuple[int, int]] = [(1, -1)]
+
+
+def calculate_mutual_recurrence_relation_exact(k: int) -> tuple[int, int]:
+    """相互再帰関係を多倍長整数で厳密に計算する関数。
+
+    計算済みの値はキャッシュに保存され、k = 1, ..., K を順に求める場合も
+    全体でK回の行列の掛け算しか行わない。
 
     Parameters
     ----------
@@ -14,66 +37,151 @@ def calculate_mutual_recurrence_relation(k: int) -> np.ndarray:
 
     Returns
     -------
-    list of int
-        計算された相互再帰関係のリスト。
+    tuple of int
+        計算された相互再帰関係 (a_k, b_k)。
 
     """
     if k < 1:
         msg: str = "kは1以上の整数でなければなりません。"
         raise ValueError(msg)
 
-    recurrent_vector: np.ndarray = np.zeros(2, dtype=int)
-    recurrent_vector[0] = 1
-    recurrent_vector[1] = -1
+    a, b = _recurrence_cache[-1]
+    for i in range(len(_recurrence_cache), k):
+        a, b = i * (4 * i + 1) * a + b, -i * (i + 1) * a + (4 * i**2 - i - 1) * b
+        _recurrence_cache.append((a, b))
 
-    for i in range(1, k):
-        operator = np.array(
-            [[i * (4 * i + 1), 1], [-i * (i + 1), 4 * i**2 - i - 1]],
-            dtype=int,
-        )
-        recurrent_vector = np.dot(operator, recurrent_vector)
+    return _recurrence_cache[k - 1]
 
-    return recurrent_vector
 
+def clear_mutual_recurrence_relation_cache() -> None:
+    """相互再帰関係のキャッシュを空にする関数。"""
+    del _recurrence_cache[1:]
 
-def calculate_mutual_recurrence_relation_fraction(k: int) -> Fraction:
-    """相互再帰関係を分数型で計算する関数。
+
+def calculate_mutual_recurrence_relation_binary_splitting(
+    k: int,
+    workers: int = 1,
+) -> tuple[int, int, int]:
+    """相互再帰関係と (2(k-1))! を、行列の積の二分木によって計算する関数。
+
+    k-1個の2x2行列を1つずつ掛けると、桁数の大きな数と小さな数の掛け算を
+    繰り返すことになる。積を平衡二分木の形で計算すると、桁数の近い数どうしの
+    掛け算になり、多倍長整数の高速な乗算を活かせる。
+    (2(k-1))! も各行列に対応する因子 (2i-1)(2i) として同じ木で計算する。
 
     Parameters
     ----------
     k : int
         再帰関係の深さ。
+    workers : int, optional
+        木の上位の段を分担するプロセスの数 (デフォルト: 1)
 
     Returns
     -------
-    Fraction
-        計算された相互再帰関係の分数型。
+    tuple of int
+        (a_k, b_k, (2(k-1))!)
 
     """
     if k < 1:
         msg: str = "kは1以上の整数でなければなりません。"
         raise ValueError(msg)
+    if workers < 1:
+        msg: str = "workersは1以上の整数でなければなりません。"
+        raise ValueError(msg)
 
-    recurrent_vector: list[Fraction] = [Fraction(1), Fraction(-1)]
+    chunk_count = min(workers, max(1, (k - 1) // BINARY_SPLITTING_LEAF_SIZE))
+    if chunk_count == 1:
+        m00, m01, m10, m11, factorial = _multiply_matrix_range(1, k)
+    else:
+        bounds = [1 + (k - 1) * i // chunk_count for i in range(chunk_count + 1)]
+        with ProcessPoolExecutor(max_workers=chunk_count) as executor:
+            products = list(
+                executor.map(_multiply_matrix_range, bounds[:-1], bounds[1:]),
+            )
+        m00, m01, m10, m11, factorial = _multiply_products(products)
 
-    for i in range(1, k):
-        a11 = Fraction(i * (4 * i + 1))
-        a12 = Fraction(1)
-        a21 = Fraction(-i * (i + 1))
-        a22 = Fraction(4 * i**2 - i - 1)
+    # 初期ベクトル (1, -1) に積を掛ける
+    return m00 - m01, m10 - m11, factorial
 
-        new_recurrent_vector_0 = a11 * recurrent_vector[0] + a12 * recurrent_vector[1]
-        new_recurrent_vector_1 = a21 * recurrent_vector[0] + a22 * recurrent_vector[1]
 
-        recurrent_vector[0] = new_recurrent_vector_0
-        recurrent_vector[1] = new_recurrent_vector_1
+def calculate_mutual_recurrence_relation_normalized(k: int) -> tuple[float, float]:
+    """相互再帰関係を (2(k-1))! で割った値を浮動小数点数で計算する関数。
 
-    return recurrent_vector[0] / recurrent_vector[1]
+    a_k, b_k は (2(k-1))! と同程度の速さで増えるため、多倍長整数では桁数が
+    kとともに増え、浮動小数点数ではすぐに桁あふれする。
+    alpha_k = a_k / (2(k-1))!, beta_k = b_k / (2(k-1))! は高々kの多項式程度にしか
+    増えないため、各段で (2i-1)(2i) で割りながら漸化式を進めれば、
+    kに比例する時間と一定のメモリで倍精度の値が得られる。
+
+    Parameters
+    ----------
+    k : int
+        再帰関係の深さ。
+
+    Returns
+    -------
+    tuple of float
+        (a_k / (2(k-1))!, b_k / (2(k-1))!)
+
+    """
+    if k < 1:
+        msg: str = "kは1以上の整数でなければなりません。"
+        raise ValueError(msg)
+
+    # 最後の値だけを保持して、メモリを一定に保つ
+    _, alpha, beta = deque(_iter_normalized_recurrence(k), maxlen=1)[0]
+    return alpha, beta
+
+
+def calculate_mutual_recurrence_relation(k: int) -> np.ndarray:
+    """相互再帰関係を計算する関数。
+
+    Parameters
+    ----------
+    k : int
+        再帰関係の深さ。
+
+    Returns
+    -------
+    list of int
+        計算された相互再帰関係のリスト。
+
+    Raises
+    ------
+    OverflowError
+        値がnumpyの整数型に収まらない場合。
+        収まらない場合はcalculate_mutual_recurrence_relation_exactを用いる。
+
+    """
+    return np.array(calculate_mutual_recurrence_relation_exact(k), dtype=int)
+
+
+def calculate_mutual_recurrence_relation_fraction(k: int) -> Fraction:
+    """相互再帰関係を分数型で計算する関数。
+
+    Parameters
+    ----------
+    k : int
+        再帰関係の深さ。
+
+    Returns
+    -------
+    Fraction
+        計算された相互再帰関係の分数型。
+
+    """
+    a_k, b_k = calculate_mutual_recurrence_relation_exact(k)
+    return Fraction(a_k, b_k)
 
 
 def calculate_two_rows_prob(n: int, k: int) -> float:
     """2行のChompにおいて一様ランダムに手を打ったときの先手の勝率を求める関数。
 
+    calculate_mutual_recurrence_relation_normalizedにより、
+    kに比例する時間と一定のメモリで倍精度の値を求める。
+    正しく丸めた値 (float(calculate_two_rows_prob_fraction(n, k))) とは
+    盤面によって1ulp程度の差が生じることがある。
+
     Parameters
     ----------
     n: int
@@ -94,16 +202,17 @@ def calculate_two_rows_prob(n: int, k: int) -> float:
             return 0.0
         return 0.5
 
-    recurrence_relation: np.ndarray = calculate_mutual_recurrence_relation(k)
-    a_k: int = recurrence_relation[0]
-    b_k: int = recurrence_relation[1]
-    winning_probability: float = 0.5 - (n * a_k + b_k) / (
-        math.factorial(2 * (k - 1)) * (n + k) * (n + k - 1) * (n + k - 2)
-    )
+    if (n, k) == (1, 1):
+        return 0.5
+
+    falling: int = (n + k) * (n + k - 1) * (n + k - 2)
+    # 相互再帰関係のキャッシュの有無で結果が変わらないよう、常に同じ方法で計算する
+    alpha, beta = calculate_mutual_recurrence_relation_normalized(k)
+    winning_probability: float = 0.5 - (n * alpha + beta) / falling
     return winning_probability
 
 
-def calculate_two_rows_prob_fraction(n: int, k: int) -> Fraction:
+def calculate_two_rows_prob_fraction(n: int, k: int, workers: int = 1) -> Fraction:
     """2行のChompにおいて一様ランダムに手を打ったときの先手の勝率を分数型で求める関数。
 
     Parameters
@@ -112,6 +221,8 @@ def calculate_two_rows_prob_fraction(n: int, k: int) -> Fraction:
         1行目のチョコレートの数。
     k: int
         2行目のチョコレートの数。
+    workers: int, optional
+        積の木で相互再帰関係を求める場合のプロセスの数 (デフォルト: 1)
 
     Returns
     -------
@@ -126,17 +237,194 @@ def calculate_two_rows_prob_fraction(n: int, k: int) -> Fraction:
             return Fraction(0, 1)
         return Fraction(1, 2)
 
-    recurrence_relation: np.ndarray = calculate_mutual_recurrence_relation(k)
-    a_k: int = recurrence_relation[0]
-    b_k: int = recurrence_relation[1]
+    a_k, b_k, factorial = _calculate_recurrence_terms(k, workers)
+    denominator: int = factorial * (n + k) * (n + k - 1) * (n + k - 2)
+
+    # 1/2 - (n * a_k + b_k) / denominator を通分し、約分を1回で済ませる
+    winning_probability: Fraction = Fraction(
+        denominator - 2 * (n * a_k + b_k),
+        2 * denominator,
+    )
+    return winning_probability
+
+
+def calculate_two_rows_prob_grid(
+    n_values: int | npt.ArrayLike,
+    k_values: int | npt.ArrayLike,
+    *,
+    exact: bool = False,
+) -> np.ndarray:
+    """2行のChompの先手の勝率を、nとkの全ての組について一度に求める関数。
+
+    相互再帰関係はkの最大値まで1回だけ計算する。
+    勝率の式 1/2 - (n * a_k + b_k) / ((2(k-1))! (n+k)(n+k-1)(n+k-2)) の分子は
+    nについて1次式なので、各kの係数を求めた後は全てのnをnumpyでまとめて計算する。
+
+    Parameters
+    ----------
+    n_values: int or array_like
+        1行目のチョコレートの数の一覧。整数の場合は0からその値までの全ての数。
+    k_values: int or array_like
+        2行目のチョコレートの数の一覧。整数の場合は0からその値までの全ての数。
+    exact: bool, optional
+        Trueの場合は分数型で求める (デフォルト: False)
+
+    Returns
+    -------
+    numpy.ndarray
+        形が (nの個数, kの個数) の配列。[i, j] 成分が盤面 (n_values[i], k_values[j])
+        の先手の勝率。n < k の成分は、浮動小数点数の場合はnan、分数型の場合はNone。
+
+    """
+    n_array = _as_board_lengths(n_values)
+    k_array = _as_board_lengths(k_values)
+    max_k = int(k_array.max(initial=0))
+
+    if exact:
+        if max_k >= 1:
+            calculate_mutual_recurrence_relation_exact(max_k)
+        return _calculate_two_rows_prob_grid_fraction(n_array, k_array)
+
+    # 係数を (2(k-1))! で割った値を、kの最大値までの1回の掃引で求める
+    requested = set(k_array.tolist())
+    coefficients = {
+        k: (alpha, beta)
+        for k, alpha, beta in _iter_normalized_recurrence(max_k)
+        if k in requested
+    }
+    slopes = np.array([coefficients.get(k, (0.0, 0.0))[0] for k in k_array.tolist()])
+    intercepts = np.array(
+        [coefficients.get(k, (0.0, 0.0))[1] for k in k_array.tolist()],
+    )
 
-    numerator: Fraction = Fraction(1, 2) * Fraction(
-        math.factorial(2 * (k - 1)) * (n + k) * (n + k - 1) * (n + k - 2),
-    ) - Fraction(n * a_k + b_k)
+    n_column = n_array[:, np.newaxis]
+    k_row = k_array[np.newaxis, :]
+    falling = (n_column + k_row) * (n_column + k_row - 1) * (n_column + k_row - 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        grid = 0.5 - (n_column * slopes + intercepts) / falling
+
+    grid[np.broadcast_to(k_row == 0, grid.shape)] = 0.5
+    for (n, k), value in _SPECIAL_TWO_ROWS_PROBS.items():
+        grid[(n_column == n) & (k_row == k)] = float(value)
+    grid[n_column < k_row] = np.nan
+    return grid
+
+
+def _calculate_two_rows_prob_grid_fraction(
+    n_array: npt.NDArray[np.int64],
+    k_array: npt.NDArray[np.int64],
+) -> np.ndarray:
+    """キャッシュ済みの相互再帰関係から勝率の表を分数型で求める内部関数。"""
+    grid = np.full((len(n_array), len(k_array)), None, dtype=object)
+    for j, k in enumerate(k_array.tolist()):
+        if k >= 1:
+            a_k, b_k = _recurrence_cache[k - 1]
+            factorial = math.factorial(2 * (k - 1))
+        for i, n in enumerate(n_array.tolist()):
+            if n < k:
+                continue
+            if k == 0 or (n, k) in _SPECIAL_TWO_ROWS_PROBS:
+                grid[i, j] = _SPECIAL_TWO_ROWS_PROBS.get((n, k), Fraction(1, 2))
+                continue
+            denominator = factorial * (n + k) * (n + k - 1) * (n + k - 2)
+            grid[i, j] = Fraction(denominator - 2 * (n * a_k + b_k), 2 * denominator)
+    return grid
+
+
+def _as_board_lengths(values: int | npt.ArrayLike) -> npt.NDArray[np.int64]:
+    """マスの個数の一覧を1次元の整数配列に変換する内部関数。"""
+    if isinstance(values, int):
+        values = range(values + 1)
+    array = np.asarray(values, dtype=np.int64).reshape(-1)
+    if np.any(array < 0):
+        msg: str = "マスの個数は0以上の整数でなければなりません。"
+        raise ValueError(msg)
+    return array
+
+
+def _iter_normalized_recurrence(max_k: int) -> Iterator[tuple[int, float, float]]:
+    """(k, a_k / (2(k-1))!, b_k / (2(k-1))!) を k = 1, ..., max_k の順に返す関数。"""
+    alpha, beta = 1.0, -1.0
+    for k in range(1, max_k + 1):
+        yield k, alpha, beta
+        scale = (2 * k - 1) * (2 * k)
+        alpha, beta = (
+            (k * (4 * k + 1) * alpha + beta) / scale,
+            (-k * (k + 1) * alpha + (4 * k**2 - k - 1) * beta) / scale,
+        )
+
+
+def _calculate_recurrence_terms(k: int, workers: int) -> tuple[int, int, int]:
+    """勝率の計算に用いる (a_k, b_k, (2(k-1))!) を求める内部関数。
+
+    キャッシュから近いkは漸化式を順に進め、遠いkは積の木で求める。
+    """
+    if k - len(_recurrence_cache) < BINARY_SPLITTING_THRESHOLD:
+        a_k, b_k = calculate_mutual_recurrence_relation_exact(k)
+        return a_k, b_k, math.factorial(2 * (k - 1))
+    return calculate_mutual_recurrence_relation_binary_splitting(k, workers)
 
-    denominator: Fraction = Fraction(
-        math.factorial(2 * (k - 1)) * (n + k) * (n + k - 1) * (n + k - 2),
+
+def _multiply_matrix_range(start: int, stop: int) -> MatrixProduct:
+    """番号が start, ..., stop-1 の行列の積 M_{stop-1} ... M_{start} を求める内部関数。
+
+    Parameters
+    ----------
+    start : int
+        最初の行列の番号
+    stop : int
+        最後の行列の番号+1
+
+    Returns
+    -------
+    MatrixProduct
+        行列の積と、(2i-1)(2i) の積
+
+    """
+    if stop - start <= BINARY_SPLITTING_LEAF_SIZE:
+        m00, m01, m10, m11, factorial = 1, 0, 0, 1, 1
+        for i in range(start, stop):
+            p00, p10, p11 = i * (4 * i + 1), -i * (i + 1), 4 * i**2 - i - 1
+            m00, m01, m10, m11 = (
+                p00 * m00 + m10,
+                p00 * m01 + m11,
+                p10 * m00 + p11 * m10,
+                p10 * m01 + p11 * m11,
+            )
+            factorial *= (2 * i - 1) * (2 * i)
+        return m00, m01, m10, m11, factorial
+
+    middle = (start + stop) // 2
+    return _multiply_two_products(
+        _multiply_matrix_range(start, middle),
+        _multiply_matrix_range(middle, stop),
     )
 
-    winning_probability: Fraction = numerator / denominator
-    return winning_probability
+
+def _multiply_products(products: list[MatrixProduct]) -> MatrixProduct:
+    """番号の小さい順に並んだ区間ごとの積を、平衡二分木の形で掛け合わせる内部関数。"""
+    while len(products) > 1:
+        merged = [
+            _multiply_two_products(products[i], products[i + 1])
+            for i in range(0, len(products) - 1, 2)
+        ]
+        if len(products) % 2 == 1:
+            merged.append(products[-1])
+        products = merged
+    return products[0]
+
+
+def _multiply_two_products(
+    lower: MatrixProduct,
+    upper: MatrixProduct,
+) -> MatrixProduct:
+    """番号の小さい区間の積lowerに、続く区間の積upperを左から掛ける内部関数。"""
+    l00, l01, l10, l11, lower_factorial = lower
+    u00, u01, u10, u11, upper_factorial = upper
+    return (
+        u00 * l00 + u01 * l10,
+        u00 * l01 + u01 * l11,
+        u10 * l00 + u11 * l10,
+        u10 * l01 + u11 * l11,
+        lower_factorial * upper_factorial,
+    )
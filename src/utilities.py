@@ -1,4 +1,6 @@
+import math
 from fractions import Fraction
+from statistics import NormalDist
 
 
 def sum_fraction_unnormalized(f: Fraction, g: Fraction) -> Fraction:
@@ -37,3 +39,42 @@ def sub_fraction_unnormalized(f: Fraction, g: Fraction) -> Fraction:
     result._numerator = numerator  # noqa: SLF001
     result._denominator = denominator  # noqa: SLF001
     return result
+
+
+def wilson_interval(
+    successes: int,
+    trials: int,
+    confidence: float = 0.95,
+) -> tuple[float, float]:
+    """二項分布の成功確率のWilsonスコア信頼区間を計算する。
+
+    正規近似による区間と異なり、成功確率が0や1に近い場合や試行回数が
+    少ない場合にも区間が[0, 1]からはみ出さない。
+
+    Args:
+        successes (int): 成功回数
+        trials (int): 試行回数
+        confidence (float): 信頼係数 (デフォルト: 0.95)
+
+    Returns:
+        tuple[float, float]: (下限, 上限)。試行回数が0の場合は (0.0, 1.0)
+
+    """
+    if not 0 <= successes <= trials:
+        msg: str = "成功回数は0以上試行回数以下でなければなりません。"
+        raise ValueError(msg)
+    if not 0 < confidence < 1:
+        msg: str = "信頼係数は0より大きく1より小さくなければなりません。"
+        raise ValueError(msg)
+    if trials == 0:
+        return 0.0, 1.0
+
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    p = successes / trials
+    denominator = 1 + z**2 / trials
+    center = (p + z**2 / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z**2 / (4 * trials**2)) / denominator
+    # 成功回数が0またはtrialsのときは、丸め誤差によらず端点を0または1にする
+    lower = 0.0 if successes == 0 else max(0.0, center - margin)
+    upper = 1.0 if successes == trials else min(1.0, center + margin)
+    return lower, upper
@@ -0,0 +1,190 @@
+import itertools
+import math
+from collections.abc import Sequence
+from functools import cached_property
+
+import numpy as np
+import numpy.typing as npt
+
+
+class YoungDiagramIndex:
+    """rows x cols の箱に含まれるヤング図形と整数の間の全単射。
+
+    ヤング図形は各行の長さの非増加列 λ_0 >= λ_1 >= ... >= λ_{rows-1} で表し、
+    番号 rank(λ) = Σ_i C(λ_i + rows-1-i, rows-i) を付ける。
+    番号は0から C(rows+cols, rows)-1 までの隙間のない整数になり、
+    行の長さの辞書式順序と一致する。空の図形の番号は0である。
+    盤面をタプルのキーとする辞書の代わりに、番号を添字とする1次元配列や
+    メモリマップに盤面ごとの値を保持できる。
+    図形から1マス以上を取り除くと、どの行の長さも増えずにいずれかの行が短くなるため、
+    番号は必ず小さくなる。
+
+    Attributes
+    ----------
+    rows : int
+        箱の行数
+    cols : int
+        箱の列数
+
+    """
+
+    def __init__(self, rows: int, cols: int) -> None:
+        """YoungDiagramIndexクラスのコンストラクタ。"""
+        if rows < 0 or cols < 0:
+            msg: str = "箱の大きさは0以上の整数でなければなりません。"
+            raise ValueError(msg)
+        self.rows = rows
+        self.cols = cols
+        # _terms[i][x] はi行目の長さがxのときの番号への寄与
+        self._terms: list[list[int]] = [
+            [math.comb(x + rows - 1 - i, rows - i) for x in range(cols + 1)]
+            for i in range(rows)
+        ]
+
+    @property
+    def size(self) -> int:
+        """箱に含まれるヤング図形の数 C(rows+cols, rows)。"""
+        return math.comb(self.rows + self.cols, self.rows)
+
+    @cached_property
+    def term_table(self) -> npt.NDArray[np.int64]:
+        """i行目の長さがxのときの番号への寄与を [i, x] 成分とする配列。"""
+        if self.size - 1 > np.iinfo(np.int64).max:
+            msg: str = "図形の数が多すぎるため、番号をnumpy配列で扱えません。"
+            raise OverflowError(msg)
+        return np.array(self._terms, dtype=np.int64).reshape(self.rows, self.cols + 1)
+
+    def rank(self, row_lengths: Sequence[int]) -> int:
+        """図形の番号を求める。O(rows)で計算する。
+
+        Parameters
+        ----------
+        row_lengths : Sequence of int
+            各行の長さ (非増加列)。rows個に満たない分は0とみなす。
+
+        Returns
+        -------
+        int
+            図形の番号
+
+        """
+        if len(row_lengths) > self.rows or any(
+            not 0 <= length <= self.cols for length in row_lengths
+        ):
+            msg: str = "盤面が長方形に含まれていません。"
+            raise ValueError(msg)
+        if any(longer < shorter for longer, shorter in itertools.pairwise(row_lengths)):
+            msg: str = "各行のマスの個数は非増加でなければなりません。"
+            raise ValueError(msg)
+        return sum(
+            terms[length]
+            for terms, length in zip(self._terms, row_lengths, strict=False)
+        )
+
+    def unrank(self, rank: int) -> tuple[int, ...]:
+        """番号から図形を求める。O(rows+cols)で計算する。
+
+        Parameters
+        ----------
+        rank : int
+            図形の番号
+
+        Returns
+        -------
+        tuple of int
+            各行の長さ (長さrowsの非増加列)
+
+        """
+        if not 0 <= rank < self.size:
+            msg: str = "盤面の番号が範囲外です"
+            raise IndexError(msg)
+        row_lengths = []
+        length = self.cols
+        for terms in self._terms:
+            # 行の長さは非増加なので、前の行の長さから減らしながら探せばよい
+            while terms[length] > rank:
+                length -= 1
+            rank -= terms[length]
+            row_lengths.append(length)
+        return tuple(row_lengths)
+
+    def rank_many(self, row_lengths: npt.ArrayLike) -> npt.NDArray[np.int64]:
+        """複数の図形の番号をまとめて求める。
+
+        Parameters
+        ----------
+        row_lengths : array_like
+            最後の軸の長さがrowsの整数配列。最後の軸が各行の長さを表す。
+
+        Returns
+        -------
+        numpy.ndarray
+            最後の軸を除いた形の、各図形の番号の配列
+
+        """
+        lengths = np.asarray(row_lengths, dtype=np.int64)
+        if lengths.ndim == 0 or lengths.shape[-1] != self.rows:
+            msg: str = f"最後の軸の長さは{self.rows}でなければなりません。"
+            raise ValueError(msg)
+        if ((lengths < 0) | (lengths > self.cols)).any():
+            msg: str = "盤面が長方形に含まれていません。"
+            raise ValueError(msg)
+        if (np.diff(lengths, axis=-1) > 0).any():
+            msg: str = "各行のマスの個数は非増加でなければなりません。"
+            raise ValueError(msg)
+        flat_index = np.arange(self.rows) * (self.cols + 1) + lengths
+        return self.term_table.ravel()[flat_index].sum(axis=-1)
+
+    def unrank_many(self, ranks: npt.ArrayLike) -> npt.NDArray[np.int64]:
+        """複数の番号から図形をまとめて求める。
+
+        Parameters
+        ----------
+        ranks : array_like
+            図形の番号の整数配列
+
+        Returns
+        -------
+        numpy.ndarray
+            ranksの形の後ろに長さrowsの軸を加えた、各図形の行の長さの配列
+
+        """
+        remaining = np.array(ranks, dtype=np.int64)
+        if ((remaining < 0) | (remaining >= self.size)).any():
+            msg: str = "盤面の番号が範囲外です"
+            raise IndexError(msg)
+        row_lengths = np.empty((*remaining.shape, self.rows), dtype=np.int64)
+        for i, terms in enumerate(self.term_table):
+            # 寄与はxについて狭義単調増加なので、寄与が残りの番号以下となる最大のxを選ぶ
+            lengths = np.searchsorted(terms, remaining, side="right") - 1
+            remaining -= terms[lengths]
+            row_lengths[..., i] = lengths
+        return row_lengths
+
+    def enumerate_diagrams(self) -> npt.NDArray[np.integer]:
+        """箱に含まれる全ての図形を番号の順に並べる。
+
+        1行目の長さがxの図形の番号は C(x+rows-1, rows) 以上 C(x+rows, rows) 未満であり、
+        残りの行は列数xの箱の図形を番号の順に並べたものになる。
+        そのため下からk行の図形の並びは、下からk-1行の図形の並びの先頭部分を
+        繰り返し使ってO(図形の数 * rows)で作れる。
+
+        Returns
+        -------
+        numpy.ndarray
+            形が (size, rows) の配列。r行目が番号rの図形。
+            要素の型はcolsを表せる最小の整数型。
+
+        """
+        dtype = np.min_scalar_type(self.cols)
+        diagrams = np.zeros((1, 0), dtype=dtype)
+        for k in range(1, self.rows + 1):
+            parts = []
+            for x in range(self.cols + 1):
+                size = math.comb(x + k - 1, k - 1)
+                part = np.empty((size, k), dtype=dtype)
+                part[:, 0] = x
+                part[:, 1:] = diagrams[:size]
+                parts.append(part)
+            diagrams = np.concatenate(parts)
+        return diagrams
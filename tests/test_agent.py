@@ -0,0 +1,113 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.game.agent import Agent, PerfectAgent
+from src.game.chomp import Chomp
+from src.game.chomp_solver import load_chomp_solution
+
+
+class TestAgent:
+    """Agentクラスのテストクラス。"""
+
+    def test_select_eat_cell_is_uniform_over_remaining_cells(self) -> None:
+        """選ばれるセルが残っているセル全体で一様に分布することを確認。"""
+        game = Chomp(3, 4)
+        game.eat(1, 2)
+        game.eat(2, 1)
+        agent = Agent("エージェント", np.random.default_rng(0))
+        trials = 40_000
+        counts: dict[tuple[int, int], int] = {}
+        for _ in range(trials):
+            cell = agent.select_eat_cell(game)
+            counts[cell] = counts.get(cell, 0) + 1
+
+        expected_cells = {
+            tuple(int(v) for v in cell) for cell in np.argwhere(game.board)
+        }
+        assert set(counts) == expected_cells
+        expected = trials / len(expected_cells)
+        sigma = (expected * (1 - 1 / len(expected_cells))) ** 0.5
+        for count in counts.values():
+            assert abs(count - expected) < 5 * sigma
+
+    def test_same_generator_seed_gives_same_moves(self) -> None:
+        """同じシードの乱数生成器からは同じ手が選ばれることを確認。"""
+        moves = []
+        for _ in range(2):
+            agent = Agent("エージェント", np.random.default_rng(42))
+            game = Chomp(6, 6)
+            history = []
+            while not game.is_empty_board():
+                row, col = agent.select_eat_cell(game)
+                history.append((row, col))
+                game.eat(row, col)
+            moves.append(history)
+        assert moves[0] == moves[1]
+
+    def test_empty_board_raises_value_error(self) -> None:
+        """空の盤面でValueErrorが発生することを確認。"""
+        game = Chomp(1, 1)
+        game.eat(0, 0)
+        with pytest.raises(ValueError, match="No valid cells to select."):
+            Agent("エージェント").select_eat_cell(game)
+
+
+class TestPerfectAgent:
+    """PerfectAgentクラスのテストクラス。"""
+
+    def test_perfect_first_player_always_wins(self, tmp_path: Path) -> None:
+        """完全なプレイをする先手は、ランダムな後手に必ず勝つことを確認。"""
+        perfect = PerfectAgent("先手", solution_dir=tmp_path)
+        random_agent = Agent("後手", np.random.default_rng(0))
+        for _ in range(50):
+            game = Chomp(4, 5)
+            is_perfect_turn = True
+            while not game.is_empty_board():
+                player = perfect if is_perfect_turn else random_agent
+                game.eat(*player.select_eat_cell(game))
+                is_perfect_turn = not is_perfect_turn
+            # 最後のセルを食べた直後に手番が移るため、先手の手番なら先手の勝ち
+            assert is_perfect_turn
+
+    def test_selects_winning_move(self, tmp_path: Path) -> None:
+        """勝てる盤面では勝ち手を選ぶことを確認。"""
+        game = Chomp(5, 5)
+        assert PerfectAgent("エージェント", solution_dir=tmp_path).select_eat_cell(
+            game,
+        ) == (1, 1)
+        game.eat(1, 1)
+        # P位置では最後の行の右端の1マスだけを食べる
+        assert PerfectAgent("エージェント", solution_dir=tmp_path).select_eat_cell(
+            game,
+        ) == (4, 0)
+
+    def test_table_is_shared_and_saved(self, tmp_path: Path) -> None:
+        """表が一度だけ保存され、エージェント間で共有されることを確認。"""
+        game = Chomp(3, 6)
+        PerfectAgent("エージェント1", solution_dir=tmp_path).select_eat_cell(game)
+        assert (tmp_path / "chomp_3x6.npz").exists()
+        solution = load_chomp_solution(3, 6, tmp_path)
+        PerfectAgent("エージェント2", solution_dir=tmp_path).select_eat_cell(game)
+        assert load_chomp_solution(3, 6, tmp_path) is solution
+
+    def test_epsilon_one_plays_randomly(self, tmp_path: Path) -> None:
+        """epsilonが1の場合はAgentと同じ手を選ぶことを確認。"""
+        game = Chomp(4, 4)
+        perfect = PerfectAgent(
+            "エージェント",
+            np.random.default_rng(3),
+            epsilon=1.0,
+            solution_dir=tmp_path,
+        )
+        rng = np.random.default_rng(3)
+        for _ in range(20):
+            rng.random()
+            expected = game.get_cell_by_index(int(rng.integers(16)))
+            assert perfect.select_eat_cell(game) == expected
+
+    def test_invalid_epsilon_raises_value_error(self) -> None:
+        """epsilonが範囲外の場合にValueErrorが発生することを確認。"""
+        with pytest.raises(ValueError, match="epsilon"):
+            PerfectAgent("エージェント", epsilon=1.5)
@@ -0,0 +1,251 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.game.batch_simulation import (
+    count_first_player_wins,
+    count_first_player_wins_adaptive,
+    count_first_player_wins_many,
+    count_first_player_wins_parallel,
+)
+from src.prob.three_rows_chomp_prob import calculate_three_rows_prob_fraction
+
+
+class TestCountFirstPlayerWins:
+    """count_first_player_wins関数のテストクラス。"""
+
+    def test_single_cell_board(self) -> None:
+        """1x1の盤面では先手が必ず負けることを確認。"""
+        assert count_first_player_wins(100, 1, 1) == 0
+
+    def test_empty_board(self) -> None:
+        """空の盤面では先手が必ず勝つことを確認。"""
+        assert count_first_player_wins(10, 0, 5) == 10
+
+    def test_same_seed_gives_same_result(self) -> None:
+        """同じシードからは同じ結果が得られることを確認。"""
+        result1 = count_first_player_wins(1000, 4, 4, np.random.default_rng(7))
+        result2 = count_first_player_wins(1000, 4, 4, np.random.default_rng(7))
+        assert result1 == result2
+
+    @pytest.mark.parametrize(
+        "rows,cols,board",
+        [
+            (2, 3, (3, 3, 0)),
+            (3, 3, (3, 3, 3)),
+            (3, 4, (4, 4, 4)),
+        ],
+    )
+    def test_matches_theoretical_probability(
+        self,
+        rows: int,
+        cols: int,
+        board: tuple[int, int, int],
+    ) -> None:
+        """シミュレーションの勝率が理論値と統計的に一致することを確認。"""
+        game_count = 100_000
+        wins = count_first_player_wins(
+            game_count,
+            rows,
+            cols,
+            np.random.default_rng(2025),
+            batch_size=30_000,
+        )
+        p = float(calculate_three_rows_prob_fraction(*board))
+        sigma = (p * (1 - p) / game_count) ** 0.5
+        assert abs(wins / game_count - p) < 5 * sigma
+
+    def test_perfect_play(self, tmp_path: Path) -> None:
+        """完全なプレイをする先手は必ず勝ち、後手が完全なら先手はほぼ勝てないことを確認。"""
+        rng = np.random.default_rng(0)
+        assert (
+            count_first_player_wins(
+                2000,
+                4,
+                5,
+                rng,
+                epsilons=(0.0, 1.0),
+                solution_dir=tmp_path,
+            )
+            == 2000
+        )
+        assert (
+            count_first_player_wins(
+                2000,
+                4,
+                5,
+                rng,
+                epsilons=(0.0, 0.0),
+                solution_dir=tmp_path,
+            )
+            == 2000
+        )
+        random_first = count_first_player_wins(
+            2000,
+            4,
+            5,
+            rng,
+            epsilons=(1.0, 0.0),
+            solution_dir=tmp_path,
+        )
+        assert random_first < 200
+
+    def test_epsilon_mixes_random_and_perfect_play(self, tmp_path: Path) -> None:
+        """epsilonを上げると完全なプレイの先手の勝率が下がることを確認。"""
+        rates = [
+            count_first_player_wins(
+                20_000,
+                5,
+                5,
+                np.random.default_rng(1),
+                epsilons=(epsilon, 1.0),
+                solution_dir=tmp_path,
+            )
+            / 20_000
+            for epsilon in (0.0, 0.3, 1.0)
+        ]
+        assert rates[0] == 1.0
+        assert rates[0] > rates[1] > rates[2]
+
+    def test_invalid_epsilons_raise_value_error(self) -> None:
+        """epsilonsが範囲外の場合にValueErrorが発生することを確認。"""
+        with pytest.raises(ValueError, match="epsilons"):
+            count_first_player_wins(10, 2, 2, epsilons=(0.5, 2.0))
+
+
+class TestCountFirstPlayerWinsParallel:
+    """count_first_player_wins_parallel関数のテストクラス。"""
+
+    def test_same_seed_gives_same_result_for_any_workers(self) -> None:
+        """同じシードであればプロセス数によらず同じ結果になることを確認。"""
+        results = {
+            count_first_player_wins_parallel(
+                5000,
+                4,
+                5,
+                workers=workers,
+                seed=12345,
+                chunk_size=1000,
+            )
+            for workers in (1, 2, 3)
+        }
+        assert len(results) == 1
+
+    def test_chunks_are_merged_exactly(self) -> None:
+        """各チャンクの勝ち数が漏れなく合算されることを確認。"""
+        seed_sequence = np.random.SeedSequence(99)
+        expected = sum(
+            count_first_player_wins(size, 3, 3, np.random.default_rng(child))
+            for size, child in zip((400, 400, 200), seed_sequence.spawn(3), strict=True)
+        )
+        result = count_first_player_wins_parallel(
+            1000,
+            3,
+            3,
+            seed=np.random.SeedSequence(99),
+            chunk_size=400,
+        )
+        assert result == expected
+
+    def test_invalid_workers_raises_value_error(self) -> None:
+        """workersが1未満の場合にValueErrorが発生することを確認。"""
+        msg = "workersは1以上の整数でなければなりません。"
+        with pytest.raises(ValueError, match=msg):
+            count_first_player_wins_parallel(10, 2, 2, workers=0)
+
+
+class TestCountFirstPlayerWinsMany:
+    """count_first_player_wins_many関数のテストクラス。"""
+
+    def test_matches_parallel_for_each_board(self) -> None:
+        """各盤面の結果が、spawnした乱数列でのcount_first_player_wins_parallelと一致することを確認。"""
+        boards = [(2, 1), (2, 3), (3, 3), (1, 1)]
+        children = np.random.SeedSequence(5).spawn(len(boards))
+        expected = [
+            count_first_player_wins_parallel(
+                2500,
+                rows,
+                cols,
+                seed=child,
+                chunk_size=1000,
+            )
+            for (rows, cols), child in zip(boards, children, strict=True)
+        ]
+        for workers in (1, 3):
+            result = count_first_player_wins_many(
+                2500,
+                boards,
+                workers=workers,
+                seed=5,
+                chunk_size=1000,
+            )
+            assert result == expected
+
+    def test_no_boards(self) -> None:
+        """盤面がない場合は空のリストを返すことを確認。"""
+        assert count_first_player_wins_many(100, [], workers=2) == []
+
+
+class TestCountFirstPlayerWinsAdaptive:
+    """count_first_player_wins_adaptive関数のテストクラス。"""
+
+    def test_stops_at_target_half_width(self) -> None:
+        """信頼区間の幅の半分が目標以下になり、理論値を含むことを確認。"""
+        result = count_first_player_wins_adaptive(
+            3,
+            3,
+            0.005,
+            seed=2025,
+            min_batch_games=1000,
+        )
+        p = float(calculate_three_rows_prob_fraction(3, 3, 3))
+        assert result.half_width <= 0.005
+        assert result.lower <= p <= result.upper
+        assert result.probability == result.first_player_wins / result.game_count
+
+    def test_deterministic_board_stops_early(self) -> None:
+        """勝敗が決まっている盤面では少ないゲーム数で終わることを確認。"""
+        result = count_first_player_wins_adaptive(
+            1,
+            1,
+            0.01,
+            seed=0,
+            min_batch_games=100,
+        )
+        assert result.first_player_wins == 0
+        assert result.lower == 0.0
+        assert result.game_count < 1000
+
+    def test_respects_max_games(self) -> None:
+        """目標の幅に届かなくてもmax_gamesで打ち切ることを確認。"""
+        result = count_first_player_wins_adaptive(
+            4,
+            4,
+            1e-4,
+            max_games=3000,
+            seed=1,
+            min_batch_games=1000,
+        )
+        assert result.game_count == 3000
+        assert result.half_width > 1e-4
+
+    def test_same_seed_gives_same_result_for_any_workers(self) -> None:
+        """同じシードであればプロセス数によらず同じ結果になることを確認。"""
+        results = {
+            count_first_player_wins_adaptive(
+                3,
+                4,
+                0.01,
+                seed=7,
+                min_batch_games=1000,
+                workers=workers,
+            )
+            for workers in (1, 2)
+        }
+        assert len(results) == 1
+
+    def test_invalid_half_width_raises_value_error(self) -> None:
+        """half_widthが正でない場合にValueErrorが発生することを確認。"""
+        with pytest.raises(ValueError, match="half_width"):
+            count_first_player_wins_adaptive(2, 2, 0)
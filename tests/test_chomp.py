@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from src.game.chomp import Chomp
+
+
+class TestChomp:
+    """Chompクラスのテストクラス。"""
+
+    def test_initial_board(self) -> None:
+        """初期盤面が全て食べられていない状態であることを確認。"""
+        game = Chomp(3, 4)
+        np.testing.assert_array_equal(game.get_board(), np.ones((3, 4), dtype=bool))
+        assert game.get_row_lengths() == (4, 4, 4)
+        assert game.get_cell_count() == 12
+
+    def test_eat_matches_dense_board(self) -> None:
+        """eatの結果が密な盤面で右下を食べた結果と一致することを確認。"""
+        game = Chomp(4, 5)
+        expected = np.ones((4, 5), dtype=bool)
+        for row, col in [(2, 3), (1, 4), (3, 1), (0, 2)]:
+            game.eat(row, col)
+            expected[row:, col:] = False
+            np.testing.assert_array_equal(game.get_board(), expected)
+            assert game.get_cell_count() == int(expected.sum())
+            for r in range(4):
+                assert game.get_row_cell_count(r) == int(expected[r].sum())
+            for c in range(5):
+                assert game.get_col_cell_count(c) == int(expected[:, c].sum())
+
+    def test_eat_origin_empties_board(self) -> None:
+        """(0, 0)を食べると盤面が空になることを確認。"""
+        game = Chomp(3, 3)
+        assert game.is_empty_board() is False
+        game.eat(0, 0)
+        assert game.is_empty_board() is True
+        assert game.is_game_over() is True
+        assert game.get_cell_count() == 0
+
+    def test_eatable_cell(self) -> None:
+        """食べたセルが食べられない状態になることを確認。"""
+        game = Chomp(2, 2)
+        game.eat(1, 1)
+        assert game.is_eatable_cell(0, 1) is True
+        assert game.is_eatable_cell(1, 1) is False
+        assert game.get_board_cell(1, 0) is True
+
+    def test_out_of_range_raises_index_error(self) -> None:
+        """範囲外のインデックスでIndexErrorが発生することを確認。"""
+        game = Chomp(2, 3)
+        with pytest.raises(IndexError, match="行のインデックスが範囲外です"):
+            game.eat(2, 0)
+        with pytest.raises(IndexError, match="列のインデックスが範囲外です"):
+            game.is_eatable_cell(0, 3)
+
+    def test_large_board(self) -> None:
+        """大きな盤面でもセル数が正しく保持されることを確認。"""
+        game = Chomp(1000, 1000)
+        game.eat(500, 250)
+        assert game.get_cell_count() == 1000 * 1000 - 500 * 750
+        assert game.get_col_cell_count(999) == 500
+
+    def test_cell_by_index_matches_row_major_order(self) -> None:
+        """get_cell_by_indexが残っているセルを行優先で数えた順序と一致することを確認。"""
+        game = Chomp(5, 6)
+        for row, col in [(3, 2), (1, 4), (4, 0)]:
+            game.eat(row, col)
+        expected = [tuple(int(v) for v in cell) for cell in np.argwhere(game.board)]
+        result = [game.get_cell_by_index(k) for k in range(game.get_cell_count())]
+        assert result == expected
+
+    def test_cell_by_index_out_of_range(self) -> None:
+        """範囲外のセル番号でIndexErrorが発生することを確認。"""
+        game = Chomp(2, 2)
+        with pytest.raises(IndexError, match="セルの番号が範囲外です"):
+            game.get_cell_by_index(4)
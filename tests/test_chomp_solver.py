@@ -0,0 +1,195 @@
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.game.chomp import Chomp
+from src.game.chomp_solver import (
+    ChompSolution,
+    load_chomp_solution,
+    solve_chomp,
+    solve_chomp_game,
+)
+
+
+@cache
+def _is_winning_brute_force(row_lengths: tuple[int, ...]) -> bool:
+    """全ての手を再帰的に調べて、手番のプレイヤーが勝つかどうかを求める。"""
+    if sum(row_lengths) == 0:
+        return True
+    for row, length in enumerate(row_lengths):
+        for col in range(length):
+            child = row_lengths[:row] + tuple(
+                min(rest, col) for rest in row_lengths[row:]
+            )
+            if not _is_winning_brute_force(child):
+                return True
+    return False
+
+
+class TestChompSolution:
+    """ChompSolutionクラスのテストクラス。"""
+
+    def test_rank_and_unrank_are_inverse(self) -> None:
+        """番号が0から盤面数-1までの隙間のない整数で、unrankの逆になっていることを確認。"""
+        solution = solve_chomp(3, 4)
+        assert solution.state_count == 35
+        for rank in range(solution.state_count):
+            assert solution.rank(solution.unrank(rank)) == rank
+        assert solution.rank(()) == 0
+        assert solution.rank((4, 4, 4)) == solution.state_count - 1
+
+    def test_invalid_board_raises_value_error(self) -> None:
+        """長方形に含まれない盤面や非増加でない盤面でValueErrorが発生することを確認。"""
+        solution = solve_chomp(2, 3)
+        with pytest.raises(ValueError, match="長方形に含まれていません"):
+            solution.rank((4, 1))
+        with pytest.raises(ValueError, match="非増加"):
+            solution.rank((1, 2))
+        with pytest.raises(IndexError):
+            solution.unrank(10)
+
+
+class TestSolveChomp:
+    """solve_chomp関数のテストクラス。"""
+
+    @pytest.mark.parametrize(("rows", "cols"), [(1, 5), (2, 4), (3, 3), (4, 6), (6, 5)])
+    def test_matches_brute_force(self, rows: int, cols: int) -> None:
+        """全ての盤面の勝敗が全探索の結果と一致することを確認。"""
+        solution = solve_chomp(rows, cols)
+        for rank in range(solution.state_count):
+            row_lengths = solution.unrank(rank)
+            assert solution.is_winning(row_lengths) == _is_winning_brute_force(
+                row_lengths,
+            )
+
+    def test_empty_and_single_cell_boards(self) -> None:
+        """空の盤面は手番の勝ち、1マスの盤面は手番の負けであることを確認。"""
+        solution = solve_chomp(2, 2)
+        assert solution.is_winning(())
+        assert not solution.is_winning((1,))
+        assert solve_chomp(0, 0).get_p_positions() == []
+
+    def test_rectangles_are_first_player_wins(self) -> None:
+        """1x1以外の長方形は戦略盗用論法の通り手番のプレイヤーの勝ちであることを確認。"""
+        solution = solve_chomp(5, 6)
+        for rows in range(1, 6):
+            for cols in range(1, 7):
+                expected = (rows, cols) != (1, 1)
+                assert solution.is_winning((cols,) * rows) == expected
+
+    def test_two_rows_p_positions(self) -> None:
+        """2行の盤面のP位置が (a, a-1) の形の盤面であることを確認。"""
+        solution = solve_chomp(2, 8)
+        assert solution.get_p_positions() == [(a, a - 1) for a in range(1, 9)]
+
+    def test_square_winning_move(self) -> None:
+        """正方形の唯一の勝ち手が (1, 1) であることを確認。"""
+        solution = solve_chomp(7, 7)
+        assert solution.get_winning_moves() == [(1, 1)]
+        assert solution.get_winning_moves((7, 1, 1, 1, 1, 1, 1)) == []
+
+    def test_best_moves(self) -> None:
+        """表の手がN位置では勝ち手、P位置では1マスだけを食べる手であることを確認。"""
+        solution = solve_chomp(4, 5)
+        for rank in range(1, solution.state_count):
+            row_lengths = solution.unrank(rank)
+            move = solution.get_best_move(row_lengths)
+            if solution.is_winning(row_lengths):
+                assert move in solution.get_winning_moves(row_lengths)
+            else:
+                last_row = max(i for i, length in enumerate(row_lengths) if length)
+                assert move == (last_row, row_lengths[last_row] - 1)
+
+        boards = np.array([[5, 5, 5, 5], [3, 2, 0, 0], [1, 0, 0, 0]])
+        rows, cols = solution.get_best_moves_many(boards)
+        assert list(zip(rows.tolist(), cols.tolist(), strict=True)) == [
+            solution.get_best_move(board) for board in boards.tolist()
+        ]
+        with pytest.raises(ValueError, match="空の盤面"):
+            solution.get_best_move(())
+
+
+class TestLoadChompSolution:
+    """load_chomp_solution関数のテストクラス。"""
+
+    def test_saves_and_loads_solution(self, tmp_path: Path) -> None:
+        """表が保存され、読み込んだ表が元の表と一致することを確認。"""
+        solution = load_chomp_solution(3, 5, tmp_path)
+        path = tmp_path / "chomp_3x5.npz"
+        assert path.exists()
+        loaded = ChompSolution.load(path)
+        assert (loaded.rows, loaded.cols) == (3, 5)
+        np.testing.assert_array_equal(loaded.winning_bits, solution.winning_bits)
+        np.testing.assert_array_equal(loaded.best_moves, solution.best_moves)
+
+
+class TestSolveChompGame:
+    """solve_chomp_game関数のテストクラス。"""
+
+    def test_solves_board_after_moves(self) -> None:
+        """手を進めた盤面を囲む長方形について解き、勝ち手が正しいことを確認。"""
+        game = Chomp(4, 6)
+        game.eat(2, 0)
+        game.eat(0, 4)
+        solution = solve_chomp_game(game)
+        assert (solution.rows, solution.cols) == (2, 4)
+        row_lengths = game.get_row_lengths()[:2]
+        assert solution.is_winning(row_lengths) == _is_winning_brute_force(row_lengths)
+        for row, col in solution.get_winning_moves(row_lengths):
+            child = row_lengths[:row] + tuple(
+                min(rest, col) for rest in row_lengths[row:]
+            )
+            assert not _is_winning_brute_force(child)
+
+    def test_board_with_emptied_rows(self) -> None:
+        """行が空になった盤面をそのまま渡しても、勝敗と勝ち手が求まることを確認。"""
+        game = Chomp(4, 5)
+        game.eat(2, 0)
+        game.eat(1, 2)
+        game.eat(0, 4)
+        row_lengths = game.get_row_lengths()
+        assert row_lengths == (4, 2, 0, 0)
+        solution = solve_chomp_game(game)
+        assert (solution.rows, solution.cols) == (2, 4)
+        assert solution.is_winning(row_lengths) == _is_winning_brute_force(
+            row_lengths,
+        )
+        expected_moves = [
+            (row, col)
+            for row in range(4)
+            for col in range(row_lengths[row])
+            if not _is_winning_brute_force(
+                row_lengths[:row] + tuple(min(rest, col) for rest in row_lengths[row:]),
+            )
+        ]
+        assert expected_moves
+        assert solution.get_winning_moves(row_lengths) == expected_moves
+        assert solution.get_best_move(row_lengths) in expected_moves
+
+        game = Chomp(3, 3)
+        game.eat(1, 0)
+        solution = solve_chomp_game(game)
+        assert solution.is_winning(game.get_row_lengths())
+        assert solution.get_winning_moves(game.get_row_lengths()) == [(0, 1)]
+        with pytest.raises(ValueError, match="長方形"):
+            solution.is_winning((3, 1))
+
+    def test_p_positions_reachable_from_board(self) -> None:
+        """現在の盤面を指定すると、到達できる盤面のP位置だけが求まることを確認。"""
+        game = Chomp(3, 5)
+        game.eat(1, 2)
+        solution = solve_chomp_game(game)
+        p_positions = solution.get_p_positions(game.get_row_lengths())
+        expected = [
+            (a, b, c)
+            for a in range(6)
+            for b in range(min(a, 2) + 1)
+            for c in range(min(b, 2) + 1)
+            if not _is_winning_brute_force((a, b, c))
+        ]
+        assert sorted(p_positions) == sorted(expected)
+        assert set(p_positions) < set(solution.get_p_positions())
+        with pytest.raises(ValueError, match="長方形"):
+            solution.get_p_positions((6,))
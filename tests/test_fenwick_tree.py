@@ -0,0 +1,29 @@
+import numpy as np
+
+from src.game.fenwick_tree import FenwickTree
+
+
+class TestFenwickTree:
+    """FenwickTreeクラスのテストクラス。"""
+
+    def test_prefix_sum_after_updates(self) -> None:
+        """更新後の接頭辞和が素朴な計算と一致することを確認。"""
+        rng = np.random.default_rng(1)
+        values = [int(v) for v in rng.integers(0, 10, size=13)]
+        tree = FenwickTree(values)
+        for _ in range(50):
+            index = int(rng.integers(len(values)))
+            delta = int(rng.integers(-values[index], 5))
+            values[index] += delta
+            tree.add(index, delta)
+            for i in range(len(values) + 1):
+                assert tree.prefix_sum(i) == sum(values[:i])
+
+    def test_find_returns_index_and_offset(self) -> None:
+        """findが累積和を超える最初の位置とオフセットを返すことを確認。"""
+        values = [3, 0, 2, 5, 0, 1]
+        tree = FenwickTree(values)
+        expected = [
+            (i, offset) for i, value in enumerate(values) for offset in range(value)
+        ]
+        assert [tree.find(k) for k in range(sum(values))] == expected
@@ -0,0 +1,117 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.game.game_log import (
+    FIRST_PLAYER,
+    SECOND_PLAYER,
+    GameLogReader,
+    GameLogWriter,
+)
+
+
+class TestGameLog:
+    """GameLogWriterクラスとGameLogReaderクラスのテストクラス。"""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """書き込んだ手と勝者がそのまま読み込めることを確認。"""
+        path = tmp_path / "games.bin"
+        games = [
+            ([(0, 1), (2, 3), (0, 0)], FIRST_PLAYER),
+            ([], SECOND_PLAYER),
+            ([(1, 1), (0, 0)], SECOND_PLAYER),
+        ]
+        # バッファより多くの手を書き込み、途中での書き出しも確認する
+        with GameLogWriter(path, 3, 4, buffer_size=2) as writer:
+            for moves, winner in games:
+                writer.write_game(moves, winner)
+
+        reader = GameLogReader(path)
+        assert (reader.board_rows, reader.board_cols) == (3, 4)
+        assert len(reader) == 3
+        np.testing.assert_array_equal(reader.offsets, [0, 3, 3, 5])
+        np.testing.assert_array_equal(reader.winners, [0, 1, 1])
+        np.testing.assert_array_equal(reader.move_counts, [3, 0, 2])
+        np.testing.assert_array_equal(reader.rows, [0, 2, 0, 1, 0])
+        np.testing.assert_array_equal(reader.cols, [1, 3, 0, 1, 0])
+        assert reader.get_game_moves(2).tolist() == [(1, 1), (0, 0)]
+
+    def test_reader_does_not_copy(self, tmp_path: Path) -> None:
+        """読み込んだ配列がファイルのメモリマップを参照していることを確認。"""
+        path = tmp_path / "games.bin"
+        with GameLogWriter(path, 2, 2) as writer:
+            writer.write_game([(1, 0), (0, 0)], FIRST_PLAYER)
+
+        reader = GameLogReader(path)
+        for values in (reader.moves, reader.offsets, reader.winners):
+            assert isinstance(values, np.memmap)
+            assert not values.flags.owndata
+
+    def test_unfinished_game_is_discarded(self, tmp_path: Path) -> None:
+        """end_gameを呼んでいないゲームの手が捨てられることを確認。"""
+        path = tmp_path / "games.bin"
+        with GameLogWriter(path, 2, 2) as writer:
+            writer.write_game([(0, 0)], SECOND_PLAYER)
+            writer.add_move(1, 1)
+
+        reader = GameLogReader(path)
+        assert len(reader) == 1
+        assert len(reader.moves) == 1
+
+    def test_unfinished_moves_after_even_games_are_discarded(
+        self,
+        tmp_path: Path,
+    ) -> None:
+        """偶数個のゲームの後に確定していない手が複数あっても捨てられることを確認。"""
+        path = tmp_path / "games.bin"
+        with GameLogWriter(path, 3, 3, buffer_size=2) as writer:
+            writer.write_game([(0, 1), (0, 0)], FIRST_PLAYER)
+            writer.write_game([(1, 0), (0, 0)], FIRST_PLAYER)
+            writer.add_move(2, 2)
+            writer.add_move(1, 1)
+            writer.add_move(0, 0)
+
+        reader = GameLogReader(path)
+        assert len(reader) == 2
+        assert reader.rows.tolist() == [0, 0, 1, 0]
+        assert reader.cols.tolist() == [1, 0, 0, 0]
+
+    def test_exception_inside_with_discards_unfinished_game(
+        self,
+        tmp_path: Path,
+    ) -> None:
+        """with文の中で例外が発生しても、確定したゲームだけが読み込めることを確認。"""
+        path = tmp_path / "games.bin"
+
+        def write_interrupted_log() -> None:
+            with GameLogWriter(path, 2, 2) as writer:
+                writer.write_game([(1, 1), (0, 0)], SECOND_PLAYER)
+                writer.write_game([(0, 0)], SECOND_PLAYER)
+                writer.add_move(1, 0)
+                writer.add_move(0, 1)
+                msg = "中断"
+                raise RuntimeError(msg)
+
+        with pytest.raises(RuntimeError, match="中断"):
+            write_interrupted_log()
+
+        reader = GameLogReader(path)
+        assert len(reader) == 2
+        assert reader.move_counts.tolist() == [2, 1]
+        assert reader.winners.tolist() == [SECOND_PLAYER, SECOND_PLAYER]
+
+    def test_invalid_file_raises_value_error(self, tmp_path: Path) -> None:
+        """形式が正しくないファイルを読み込んだ場合にValueErrorが発生することを確認。"""
+        path = tmp_path / "games.log"
+        path.write_text("player_name: 先手プレイヤー, selected_cell: (0, 0)\n" * 3)
+        with pytest.raises(ValueError, match="ゲームログの形式が正しくありません。"):
+            GameLogReader(path)
+
+    def test_invalid_winner_raises_value_error(self, tmp_path: Path) -> None:
+        """勝者の値が正しくない場合にValueErrorが発生することを確認。"""
+        with (
+            GameLogWriter(tmp_path / "games.bin", 2, 2) as writer,
+            pytest.raises(ValueError, match="勝者は"),
+        ):
+            writer.end_game(2)
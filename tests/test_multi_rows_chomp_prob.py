@@ -0,0 +1,69 @@
+from fractions import Fraction
+
+import pytest
+
+from src.prob.multi_rows_chomp_prob import (
+    calculate_multi_rows_prob_fraction,
+    calculate_multi_rows_prob_table,
+)
+from src.prob.three_rows_chomp_prob import calculate_three_rows_prob_fraction
+from src.prob.two_rows_chomp_prob import calculate_two_rows_prob_fraction
+
+
+def naive_prob(row_lengths: tuple[int, ...]) -> Fraction:
+    """全てのセルを列挙して後続盤面の勝率を足し合わせる素朴な計算。"""
+    if sum(row_lengths) == 0:
+        return Fraction(1)
+    total = Fraction(0)
+    for row, length in enumerate(row_lengths):
+        for col in range(length):
+            successor = tuple(
+                min(value, col) if i >= row else value
+                for i, value in enumerate(row_lengths)
+            )
+            total += naive_prob(successor)
+    return 1 - total / sum(row_lengths)
+
+
+class TestCalculateMultiRowsProbFraction:
+    """calculate_multi_rows_prob_fraction関数のテストクラス。"""
+
+    @pytest.mark.parametrize(
+        "n1,n2,n3",
+        [(0, 0, 0), (1, 0, 0), (3, 3, 3), (5, 3, 2), (4, 4, 0), (6, 2, 1)],
+    )
+    def test_compare_with_three_rows(self, n1: int, n2: int, n3: int) -> None:
+        """3行の盤面で3行の確率計算と一致することを確認。"""
+        result = calculate_multi_rows_prob_fraction((n1, n2, n3))
+        assert result == calculate_three_rows_prob_fraction(n1, n2, n3)
+
+    @pytest.mark.parametrize(
+        "n,k",
+        [(2, 1), (3, 1), (3, 2), (5, 3), (6, 6), (8, 5)],
+    )
+    def test_compare_with_two_rows(self, n: int, k: int) -> None:
+        """2行の盤面で2行の確率計算と一致することを確認。"""
+        result = calculate_multi_rows_prob_fraction((n, k))
+        assert result == calculate_two_rows_prob_fraction(n, k)
+
+    @pytest.mark.parametrize(
+        "row_lengths",
+        [(2, 2, 2, 2), (3, 2, 2, 1), (4, 3, 1, 1, 0), (2, 2, 1, 1, 1, 1)],
+    )
+    def test_compare_with_naive_enumeration(
+        self,
+        row_lengths: tuple[int, ...],
+    ) -> None:
+        """4行以上や長方形でない盤面で素朴な計算と一致することを確認。"""
+        result = calculate_multi_rows_prob_fraction(row_lengths)
+        assert result == naive_prob(row_lengths)
+
+    def test_table_contains_all_sub_diagrams(self) -> None:
+        """表に全ての部分盤面が含まれることを確認。"""
+        table = calculate_multi_rows_prob_table((2, 1))
+        assert set(table) == {(0, 0), (1, 0), (1, 1), (2, 0), (2, 1)}
+
+    def test_increasing_row_lengths_raises_value_error(self) -> None:
+        """非増加でない盤面でValueErrorが発生することを確認。"""
+        with pytest.raises(ValueError, match="非増加"):
+            calculate_multi_rows_prob_fraction((1, 2))
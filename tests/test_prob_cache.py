@@ -0,0 +1,59 @@
+from fractions import Fraction
+from pathlib import Path
+from unittest.mock import patch
+
+from src.prob.prob_cache import ProbCache
+from src.prob.three_rows_chomp_prob import (
+    THREE_ROWS_ENGINE,
+    THREE_ROWS_ENGINE_VERSION,
+    calculate_three_rows_prob_fraction,
+)
+
+
+class TestProbCache:
+    """ProbCacheクラスのテストクラス。"""
+
+    def test_put_and_get(self, tmp_path: Path) -> None:
+        """保存した分数が厳密に取り出せることを確認。"""
+        huge = Fraction(3**5000, 2**4000 + 1)
+        with ProbCache(tmp_path / "cache.sqlite3") as cache:
+            cache.put_many("engine", 1, [((3, 2, 1), huge), ((1,), Fraction(0))])
+            assert cache.get("engine", 1, (3, 2, 1)) == huge
+            assert cache.get("engine", 1, (1,)) == Fraction(0)
+            assert cache.get("engine", 2, (3, 2, 1)) is None
+            assert cache.get_all("engine", 1) == {(3, 2, 1): huge, (1,): Fraction(0)}
+
+    def test_cache_is_shared_between_connections(self, tmp_path: Path) -> None:
+        """別の接続から保存した値を読み出せることを確認。"""
+        path = tmp_path / "cache.sqlite3"
+        with ProbCache(path) as writer, ProbCache(path) as reader:
+            writer.put_many("engine", 1, [((2, 1), Fraction(1, 3))])
+            assert reader.get("engine", 1, (2, 1)) == Fraction(1, 3)
+
+
+class TestCalculateThreeRowsProbFractionWithCache:
+    """キャッシュを用いたcalculate_three_rows_prob_fractionのテストクラス。"""
+
+    def test_cold_run_fills_all_sub_boards(self, tmp_path: Path) -> None:
+        """キャッシュにない場合に、表の全ての部分盤面が保存されることを確認。"""
+        with ProbCache(tmp_path / "cache.sqlite3") as cache:
+            result = calculate_three_rows_prob_fraction(4, 3, 2, cache)
+            assert result == calculate_three_rows_prob_fraction(4, 3, 2)
+            stored = cache.get_all(THREE_ROWS_ENGINE, THREE_ROWS_ENGINE_VERSION)
+            assert stored[(3, 3, 1)] == calculate_three_rows_prob_fraction(3, 3, 1)
+            assert len(stored) == 28
+
+    def test_warm_run_does_not_recompute(self, tmp_path: Path) -> None:
+        """キャッシュにある盤面では表を計算しないことを確認。"""
+        path = tmp_path / "cache.sqlite3"
+        with ProbCache(path) as cache:
+            expected = calculate_three_rows_prob_fraction(5, 4, 3, cache)
+        with (
+            ProbCache(path) as cache,
+            patch(
+                "src.prob.three_rows_chomp_prob.calculate_three_rows_prob_table",
+            ) as mock_table,
+        ):
+            assert calculate_three_rows_prob_fraction(5, 4, 3, cache) == expected
+            assert calculate_three_rows_prob_fraction(2, 2, 1, cache) > 0
+            mock_table.assert_not_called()
@@ -1,7 +1,19 @@
+import math
+
 import numpy as np
 import pytest
 
-from src.recurrence_relation import calculate_mutual_recurrence_relation
+from src.prob.multi_rows_chomp_prob import calculate_multi_rows_prob_fraction
+from src.prob.two_rows_chomp_prob import (
+    calculate_mutual_recurrence_relation,
+    calculate_mutual_recurrence_relation_binary_splitting,
+    calculate_mutual_recurrence_relation_exact,
+    calculate_mutual_recurrence_relation_normalized,
+    calculate_two_rows_prob,
+    calculate_two_rows_prob_fraction,
+    calculate_two_rows_prob_grid,
+    clear_mutual_recurrence_relation_cache,
+)
 
 
 class TestCalculateMutualRecurrenceRelation:
@@ -55,3 +67,133 @@ class TestCalculateMutualRecurrenceRelation:
         """返り値の配列のdtypeがintであることを確認。"""
         result = calculate_mutual_recurrence_relation(1)
         assert result.dtype == np.dtype("int64") or result.dtype == np.dtype("int32")
+
+    def test_large_k_raises_overflow_error(self) -> None:
+        """値がnumpyの整数型に収まらない場合にOverflowErrorが発生することを確認。"""
+        with pytest.raises(OverflowError):
+            calculate_mutual_recurrence_relation(30)
+
+
+class TestCalculateMutualRecurrenceRelationExact:
+    """calculate_mutual_recurrence_relation_exact関数のテストクラス。"""
+
+    def test_small_k(self) -> None:
+        """小さいkで既知の値と一致することを確認。"""
+        expected = [(1, -1), (4, -4), (68, -76), (2576, -3248)]
+        for k, values in enumerate(expected, start=1):
+            assert calculate_mutual_recurrence_relation_exact(k) == values
+
+    def test_independent_of_cache(self) -> None:
+        """キャッシュの有無や計算の順序によらず同じ値になることを確認。"""
+        clear_mutual_recurrence_relation_cache()
+        large = calculate_mutual_recurrence_relation_exact(200)
+        small = calculate_mutual_recurrence_relation_exact(50)
+        clear_mutual_recurrence_relation_cache()
+        assert calculate_mutual_recurrence_relation_exact(50) == small
+        assert calculate_mutual_recurrence_relation_exact(200) == large
+
+    def test_k_equals_0_raises_value_error(self) -> None:
+        """k=0が渡された場合にValueErrorが発生することを確認。"""
+        with pytest.raises(ValueError, match="kは1以上の整数でなければなりません。"):
+            calculate_mutual_recurrence_relation_exact(0)
+
+
+class TestCalculateMutualRecurrenceRelationBinarySplitting:
+    """calculate_mutual_recurrence_relation_binary_splitting関数のテストクラス。"""
+
+    @pytest.mark.parametrize("k", [1, 2, 33, 100, 257])
+    def test_compare_with_exact(self, k: int) -> None:
+        """漸化式を順に進めた結果と階乗に一致することを確認。"""
+        expected = (
+            *calculate_mutual_recurrence_relation_exact(k),
+            math.factorial(2 * (k - 1)),
+        )
+        assert calculate_mutual_recurrence_relation_binary_splitting(k) == expected
+
+    def test_parallel_matches_serial(self) -> None:
+        """複数のプロセスで分担しても結果が変わらないことを確認。"""
+        expected = calculate_mutual_recurrence_relation_binary_splitting(300)
+        result = calculate_mutual_recurrence_relation_binary_splitting(300, workers=3)
+        assert result == expected
+
+    def test_k_equals_0_raises_value_error(self) -> None:
+        """k=0が渡された場合にValueErrorが発生することを確認。"""
+        with pytest.raises(ValueError, match="kは1以上の整数でなければなりません。"):
+            calculate_mutual_recurrence_relation_binary_splitting(0)
+
+
+class TestCalculateMutualRecurrenceRelationNormalized:
+    """calculate_mutual_recurrence_relation_normalized関数のテストクラス。"""
+
+    @pytest.mark.parametrize("k", [1, 2, 10, 500, 3000])
+    def test_compare_with_exact(self, k: int) -> None:
+        """多倍長整数の結果を (2(k-1))! で割った値とほぼ一致することを確認。"""
+        a_k, b_k, factorial = calculate_mutual_recurrence_relation_binary_splitting(k)
+        alpha, beta = calculate_mutual_recurrence_relation_normalized(k)
+        assert alpha == pytest.approx(a_k / factorial, rel=1e-12)
+        assert beta == pytest.approx(b_k / factorial, rel=1e-12)
+
+    def test_huge_k_without_cache(self) -> None:
+        """キャッシュにない大きなkでも、正規化した計算で勝率が求まることを確認。"""
+        clear_mutual_recurrence_relation_cache()
+        probability = calculate_two_rows_prob(200_000, 100_000)
+        assert 0 < probability < 1
+
+    def test_k_equals_0_raises_value_error(self) -> None:
+        """k=0が渡された場合にValueErrorが発生することを確認。"""
+        with pytest.raises(ValueError, match="kは1以上の整数でなければなりません。"):
+            calculate_mutual_recurrence_relation_normalized(0)
+
+
+class TestCalculateTwoRowsProb:
+    """calculate_two_rows_prob関数のテストクラス。"""
+
+    @pytest.mark.parametrize("n,k", [(20, 15), (40, 40), (100, 30)])
+    def test_compare_with_multi_rows_prob(self, n: int, k: int) -> None:
+        """桁あふれが起きるkでも任意行数の確率計算と一致することを確認。"""
+        expected = calculate_multi_rows_prob_fraction((n, k))
+        assert calculate_two_rows_prob_fraction(n, k) == expected
+        assert calculate_two_rows_prob(n, k) == float(expected)
+
+    def test_binary_splitting_matches_cache(self) -> None:
+        """積の木を用いる大きなkでも、漸化式を順に進めた結果と一致することを確認。"""
+        clear_mutual_recurrence_relation_cache()
+        result = calculate_two_rows_prob_fraction(1600, 1500)
+        calculate_mutual_recurrence_relation_exact(1500)
+        assert calculate_two_rows_prob_fraction(1600, 1500) == result
+
+
+class TestCalculateTwoRowsProbGrid:
+    """calculate_two_rows_prob_grid関数のテストクラス。"""
+
+    def test_exact_matches_multi_rows_prob(self) -> None:
+        """分数型の表が任意行数の確率計算と一致し、n < k の成分がNoneになる。"""
+        n_values = list(range(12))
+        k_values = [0, 1, 2, 5, 3, 11]
+        grid = calculate_two_rows_prob_grid(n_values, k_values, exact=True)
+        for i, n in enumerate(n_values):
+            for j, k in enumerate(k_values):
+                if n < k:
+                    assert grid[i, j] is None
+                else:
+                    board = (n, k) if k > 0 else (n,)
+                    assert grid[i, j] == calculate_multi_rows_prob_fraction(board)
+
+    def test_float_matches_exact(self) -> None:
+        """浮動小数点数の表が分数型の表とほぼ一致し、n < k の成分がnanになる。"""
+        grid = calculate_two_rows_prob_grid(40, 40)
+        exact = calculate_two_rows_prob_grid(40, 40, exact=True)
+        assert grid.shape == (41, 41)
+        valid = np.not_equal(exact, None)
+        np.testing.assert_allclose(
+            grid[valid],
+            exact[valid].astype(float),
+            rtol=0,
+            atol=1e-15,
+        )
+        assert np.isnan(grid[~valid]).all()
+
+    def test_negative_length_raises_value_error(self) -> None:
+        """負のマスの個数が渡された場合にValueErrorが発生することを確認。"""
+        with pytest.raises(ValueError, match="0以上の整数"):
+            calculate_two_rows_prob_grid([-1, 2], [1])
@@ -1,35 +1,77 @@
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from scripts.simulation import simulate_with_log
+from scripts.simulation import (
+    ComparisonRow,
+    compare_theory_and_simulation,
+    load_comparison_table,
+    save_comparison_table,
+    simulate_with_log,
+)
 
 
-def test_simulate_with_log_outputs_logs_and_winner(
-    capsys: pytest.CaptureFixture[str],
-) -> None:
-    """simulate_with_logがログと勝者を出力することを確認する。"""
-    user_inputs = ["1", "1", "1"]
+def test_simulate_with_log_outputs_logs_and_winner(tmp_path: Path) -> None:
+    """simulate_with_logがログと勝者をファイルに出力することを確認する。"""
+    user_inputs = ["1", "1", "1", "simulation.log"]
     with (
         patch("builtins.input", side_effect=user_inputs),
+        patch("scripts.simulation.RESULT_DIR", tmp_path),
         patch(
-            "src.agent.Agent.select_eat_cell",
+            "src.game.agent.Agent.select_eat_cell",
             return_value=(0, 0),
         ) as mock_select,
     ):
         simulate_with_log()
 
-    captured = capsys.readouterr()
+    output = (tmp_path / "simulation.log").read_text()
 
-    log_snippet = "player_name: 先手プレイヤー, selected_row: 0, selected_col: 0"
-    if log_snippet not in captured.out:
+    log_snippet = "player_name: 先手プレイヤー, selected_cell: (0, 0)"
+    if log_snippet not in output:
         msg = "ログ出力が期待した形式ではありません。"
         raise AssertionError(msg)
 
-    if "winner: prev_player" not in captured.out:
+    if "winner: prev_player" not in output:
         msg = "勝者の出力が期待値と一致しません。"
         raise AssertionError(msg)
 
     if mock_select.call_count != 1:
         msg = "select_eat_cellの呼び出し回数が不正です。"
         raise AssertionError(msg)
+
+
+def test_compare_theory_and_simulation_writes_table(tmp_path: Path) -> None:
+    """理論値とシミュレーション値の比較表がCSVと画像に保存されることを確認する。"""
+    with (
+        patch("scripts.simulation.RESULT_DIR", tmp_path),
+        patch("scripts.simulation.plt.show"),
+    ):
+        csv_path = compare_theory_and_simulation(
+            3,
+            2000,
+            "comparison.png",
+            seed=0,
+        )
+
+    assert csv_path == tmp_path / "comparison.csv"
+    assert (tmp_path / "comparison.png").exists()
+    rows = load_comparison_table(csv_path)
+    assert [row.i for row in rows] == [1, 2, 3]
+    assert all(row.games == 2000 for row in rows)
+    # 2x1の盤面では先手が(1, 0)を選んだときだけ先手が勝つので、理論値は1/2
+    assert rows[0].theory == pytest.approx(0.5)
+    for row in rows:
+        assert row.lower <= row.estimate <= row.upper
+        assert abs(row.estimate - row.theory) < 0.05
+
+
+def test_comparison_table_round_trip(tmp_path: Path) -> None:
+    """比較表をCSVに保存して読み込むと、同じ値に戻ることを確認する。"""
+    rows = [
+        ComparisonRow(1, 0.5, 0.50355, 0.4966206391513811, 0.5104779973926207, 20000),
+        ComparisonRow(2, 5 / 12, 0.416, 0.4091857380806922, 0.4228465239767333, 20000),
+    ]
+    path = tmp_path / "comparison.csv"
+    save_comparison_table(rows, path)
+    assert load_comparison_table(path) == rows
@@ -0,0 +1,126 @@
+from fractions import Fraction
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.prob.multi_rows_chomp_prob import calculate_multi_rows_prob_table
+from src.prob.prob_cache import ProbCache
+from src.prob.three_rows_chomp_prob import (
+    calculate_three_rows_prob_cube,
+    calculate_three_rows_prob_fraction,
+    calculate_three_rows_prob_table,
+    calculate_three_rows_prob_unnormalized_fraction,
+    is_multiple_number,
+    iter_three_rows_boards_by_total,
+)
+
+
+class TestCalculateThreeRowsProbTable:
+    """calculate_three_rows_prob_table関数のテストクラス。"""
+
+    def test_compare_with_multi_rows_table(self) -> None:
+        """表の全ての値が任意行数の確率計算と一致することを確認。"""
+        table = calculate_three_rows_prob_table(7, 5, 3)
+        expected = calculate_multi_rows_prob_table((7, 5, 3))
+        assert dict(table) == expected
+
+    @pytest.mark.parametrize(
+        "n1,n2,n3",
+        [(0, 0, 0), (1, 1, 1), (4, 2, 1), (5, 5, 5), (6, 3, 0)],
+    )
+    def test_compare_with_unnormalized_recursion(
+        self,
+        n1: int,
+        n2: int,
+        n3: int,
+    ) -> None:
+        """再帰による計算結果と一致することを確認。"""
+        unnormalized = calculate_three_rows_prob_unnormalized_fraction(n1, n2, n3)
+        expected = Fraction(unnormalized.numerator, unnormalized.denominator)
+        assert calculate_three_rows_prob_fraction(n1, n2, n3) == expected
+
+    def test_boards_are_ordered_by_total(self) -> None:
+        """盤面がマスの総数の昇順に漏れなく列挙されることを確認。"""
+        boards = list(iter_three_rows_boards_by_total(5, 4, 2))
+        totals = [sum(board) for board in boards]
+        assert totals == sorted(totals)
+        expected = {
+            (a, b, c)
+            for a in range(6)
+            for b in range(min(a, 4) + 1)
+            for c in range(min(b, 2) + 1)
+        }
+        assert len(boards) == len(expected)
+        assert set(boards) == expected
+
+    def test_large_board_without_recursion_limit(self) -> None:
+        """再帰の上限を超える大きさの盤面でも計算できることを確認。"""
+        assert calculate_three_rows_prob_fraction(1100, 0, 0) == Fraction(1, 2)
+
+    def test_invalid_board_raises_value_error(self) -> None:
+        """n1 >= n2 >= n3を満たさない盤面でValueErrorが発生することを確認。"""
+        with pytest.raises(ValueError, match="n1 >= n2 >= n3"):
+            calculate_three_rows_prob_table(2, 3, 0)
+
+
+class TestCalculateThreeRowsProbCube:
+    """calculate_three_rows_prob_cube関数のテストクラス。"""
+
+    def test_compare_with_table(self) -> None:
+        """各成分が表の値と一致し、盤面でない成分がnanになることを確認。"""
+        cube = calculate_three_rows_prob_cube(6, 4, 3)
+        table = calculate_three_rows_prob_table(6, 4, 3)
+        assert cube.shape == (7, 5, 4)
+        for a in range(7):
+            for b in range(5):
+                for c in range(4):
+                    if a >= b >= c:
+                        assert cube[a, b, c] == float(table[(a, b, c)])
+                    else:
+                        assert np.isnan(cube[a, b, c])
+
+    def test_uses_cache(self, tmp_path: Path) -> None:
+        """キャッシュから読み込んだ結果が計算結果と一致することを確認。"""
+        with ProbCache(tmp_path / "cache.sqlite3") as cache:
+            computed = calculate_three_rows_prob_cube(5, 3, 2, cache)
+            cached = calculate_three_rows_prob_cube(5, 3, 2, cache)
+        np.testing.assert_array_equal(computed, cached)
+
+
+class TestIsMultipleNumber:
+    """is_multiple_number関数のテストクラス。"""
+
+    @pytest.mark.parametrize(
+        ("board", "expected"),
+        [
+            ((1, 1, 1), [False, False, False]),
+            ((2, 1, 1), [True, True, False, False]),
+            ((2, 2, 1), [True, False, False, False, False]),
+            ((3, 2, 1), [False] * 6),
+            ((3, 3, 3), [True] + [False] * 8),
+            ((4, 2, 2), [True, True] + [False] * 6),
+            ((4, 4, 3), [True, True, True] + [False] * 8),
+        ],
+    )
+    def test_known_results(
+        self,
+        board: tuple[int, int, int],
+        expected: list[bool],
+    ) -> None:
+        """約分した再帰項の分母に対する既知の判定結果と一致することを確認。"""
+        assert [is_multiple_number(n, *board) for n in range(sum(board))] == expected
+
+    def test_uses_reduced_denominator(self) -> None:
+        """分数型で求めた確率の約分した分母による判定と一致することを確認。"""
+        for board in iter_three_rows_boards_by_total(4, 4, 4):
+            total = sum(board)
+            if total == 0:
+                continue
+            denominator = (
+                Fraction(1, 2) - calculate_three_rows_prob_fraction(*board)
+            ).denominator
+            falling = 1
+            for n in range(total):
+                falling *= total - n
+                assert is_multiple_number(n, *board) == (denominator % falling == 0)
@@ -0,0 +1,42 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from src.prob.three_rows_chomp_prob import (
+    calculate_three_rows_prob_fraction,
+    calculate_three_rows_prob_table,
+)
+from src.prob.three_rows_chomp_prob_interval import (
+    calculate_three_rows_prob_interval,
+    calculate_three_rows_prob_interval_cube,
+)
+
+
+class TestCalculateThreeRowsProbIntervalCube:
+    """calculate_three_rows_prob_interval_cube関数のテストクラス。"""
+
+    @pytest.mark.parametrize("n1,n2,n3", [(12, 9, 7), (8, 8, 8), (5, 2, 0)])
+    def test_intervals_contain_exact_values(self, n1: int, n2: int, n3: int) -> None:
+        """全ての盤面で区間が厳密値を含み、十分に狭いことを確認。"""
+        lower, upper = calculate_three_rows_prob_interval_cube(n1, n2, n3)
+        for board, value in calculate_three_rows_prob_table(n1, n2, n3).items():
+            assert Fraction(lower[board]) <= value <= Fraction(upper[board])
+            assert upper[board] - lower[board] < 1e-13
+
+    def test_invalid_boards_are_nan(self) -> None:
+        """盤面にならない成分がnanになることを確認。"""
+        lower, upper = calculate_three_rows_prob_interval_cube(4, 3, 2)
+        assert np.isnan(lower[1, 2, 0])
+        assert np.isnan(upper[2, 3, 1])
+
+
+class TestCalculateThreeRowsProbInterval:
+    """calculate_three_rows_prob_interval関数のテストクラス。"""
+
+    def test_fallback_to_exact_value(self) -> None:
+        """幅の上限を超える場合に、厳密値を含む最も狭い区間が返ることを確認。"""
+        exact = calculate_three_rows_prob_fraction(10, 5, 3)
+        lower, upper = calculate_three_rows_prob_interval(10, 5, 3, max_width=0.0)
+        assert Fraction(lower) <= exact <= Fraction(upper)
+        assert upper <= np.nextafter(lower, np.inf)
@@ -0,0 +1,66 @@
+from fractions import Fraction
+
+import pytest
+
+from src.prob.modular_arithmetic import (
+    chinese_remainder,
+    generate_primes,
+    is_prime,
+    rational_reconstruction,
+)
+from src.prob.three_rows_chomp_prob import calculate_three_rows_prob_fraction
+from src.prob.three_rows_chomp_prob_modular import (
+    calculate_three_rows_prob_fraction_modular,
+)
+
+
+class TestCalculateThreeRowsProbFractionModular:
+    """calculate_three_rows_prob_fraction_modular関数のテストクラス。"""
+
+    @pytest.mark.parametrize(
+        "n1,n2,n3",
+        [(0, 0, 0), (1, 0, 0), (1, 1, 1), (5, 3, 2), (9, 9, 9), (30, 12, 7)],
+    )
+    def test_compare_with_fraction(self, n1: int, n2: int, n3: int) -> None:
+        """分数による計算結果と一致することを確認。"""
+        result = calculate_three_rows_prob_fraction_modular(n1, n2, n3, batch_size=8)
+        assert result == calculate_three_rows_prob_fraction(n1, n2, n3)
+
+    def test_too_few_primes_raises_value_error(self) -> None:
+        """素数が足りず復元が一意とは限らない場合にValueErrorが発生することを確認。"""
+        with pytest.raises(ValueError, match="法が小さすぎる"):
+            calculate_three_rows_prob_fraction_modular(10, 10, 10, prime_count=2)
+
+    def test_default_batch_size(self) -> None:
+        """素数の組の大きさを省略しても分数による計算結果と一致することを確認。"""
+        result = calculate_three_rows_prob_fraction_modular(40, 40, 40)
+        assert result == calculate_three_rows_prob_fraction(40, 40, 40)
+
+
+class TestModularArithmetic:
+    """剰余演算の補助関数のテストクラス。"""
+
+    def test_generate_primes(self) -> None:
+        """生成した数が相異なる2^31未満の素数であることを確認。"""
+        primes = [int(p) for p in generate_primes(10)]
+        assert len(set(primes)) == 10
+        assert all(is_prime(p) and p < 2**31 for p in primes)
+        assert [n for n in range(50) if is_prime(n)] == [
+            2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47,
+        ]  # fmt: skip
+
+    def test_generate_primes_with_upper_bound(self) -> None:
+        """上限を指定すると、その上限未満の素数を大きい順に生成することを確認。"""
+        primes = [int(p) for p in generate_primes(5, 1 << 30)]
+        assert primes == sorted(primes, reverse=True)
+        assert all(is_prime(p) and 2**29 < p < 2**30 for p in primes)
+
+    def test_chinese_remainder_and_rational_reconstruction(self) -> None:
+        """剰余から元の分数が復元できることを確認。"""
+        expected = Fraction(-12345, 678)
+        primes = [int(p) for p in generate_primes(3)]
+        residues = [
+            expected.numerator * pow(expected.denominator, -1, p) % p for p in primes
+        ]
+        value, modulus = chinese_remainder(residues, primes)
+        assert rational_reconstruction(value, modulus, 10**5, 10**3) == expected
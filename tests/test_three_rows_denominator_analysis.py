@@ -0,0 +1,51 @@
+import math
+from fractions import Fraction
+from pathlib import Path
+
+from src.prob.three_rows_chomp_prob import (
+    calculate_three_rows_prob_fraction,
+    is_multiple_number,
+)
+from src.prob.three_rows_denominator_analysis import (
+    analyze_three_rows_denominators,
+    load_denominator_records,
+    save_denominator_records,
+)
+
+
+class TestAnalyzeThreeRowsDenominators:
+    """analyze_three_rows_denominators関数のテストクラス。"""
+
+    def test_denominators_and_valuations(self) -> None:
+        """分母と素因数分解が1/2 - fの分母と一致することを確認。"""
+        records = list(analyze_three_rows_denominators(6, 4, 3))
+        assert len(records) == 62
+        for record in records:
+            expected = Fraction(1, 2) - calculate_three_rows_prob_fraction(
+                *record.board,
+            )
+            assert record.denominator == expected.denominator
+            assert record.denominator == math.prod(
+                prime**exponent for prime, exponent in record.valuations.items()
+            )
+            assert all(exponent > 0 for exponent in record.valuations.values())
+
+    def test_falling_factorial_length_matches_is_multiple_number(self) -> None:
+        """下降階乗の長さがis_multiple_numberの判定と一致することを確認。"""
+        for record in analyze_three_rows_denominators(4, 3, 3):
+            for n in range(sum(record.board)):
+                expected = is_multiple_number(n, *record.board)
+                assert (record.falling_factorial_length >= n + 1) == expected
+
+
+class TestSaveDenominatorRecords:
+    """save_denominator_records関数のテストクラス。"""
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """保存した分母の構造を読み込むと元に戻り、上書きしても重複しないことを確認。"""
+        path = tmp_path / "denominators.sqlite3"
+        records = list(analyze_three_rows_denominators(5, 5, 2))
+        assert save_denominator_records(records, path) == len(records)
+        assert save_denominator_records(records, path) == len(records)
+        loaded = load_denominator_records(path)
+        assert loaded == {record.board: record for record in records}
@@ -0,0 +1,162 @@
+import functools
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.game.agent import Agent, PerfectAgent
+from src.game.chomp import Chomp
+from src.game.tournament import (
+    AgentFactory,
+    load_tournament_result,
+    play_games,
+    run_tournament,
+)
+
+
+class FirstCellAgent:
+    """常に左上のセルを食べる、Agentを継承しないエージェント。"""
+
+    def __init__(self, name: str, rng: np.random.Generator) -> None:
+        """FirstCellAgentクラスのコンストラクタ。"""
+        self.name = name
+        self.rng = rng
+
+    def select_eat_cell(self, game: Chomp) -> tuple[int, int]:
+        """左上のセルを選択する。"""
+        return game.get_cell_by_index(0)
+
+
+def _agents(tmp_path: Path) -> dict[str, AgentFactory]:
+    """テストに用いるエージェントの作成関数。"""
+    return {
+        "random": Agent,
+        "perfect": functools.partial(PerfectAgent, solution_dir=tmp_path),
+        "first_cell": FirstCellAgent,
+    }
+
+
+class TestPlayGames:
+    """play_games関数のテストクラス。"""
+
+    def test_first_cell_agent_always_loses(self) -> None:
+        """左上のセルを食べる先手は必ず負けることを確認。"""
+        agent = FirstCellAgent("先手", np.random.default_rng())
+        assert play_games(agent, Agent("後手"), 10, 3, 4) == 0
+
+    def test_empty_board(self) -> None:
+        """空の盤面では先手が勝つことを確認。"""
+        agent = FirstCellAgent("先手", np.random.default_rng())
+        assert play_games(agent, agent, 5, 0, 3) == 5
+
+
+class TestRunTournament:
+    """run_tournament関数のテストクラス。"""
+
+    def test_win_rate_matrix(self, tmp_path: Path) -> None:
+        """全ての組み合わせが対戦し、勝率の行列と信頼区間が求まることを確認。"""
+        result = run_tournament(
+            _agents(tmp_path),
+            [(3, 3), (2, 5)],
+            50,
+            tmp_path / "tournament.jsonl",
+            block_size=20,
+            seed=0,
+        )
+        np.testing.assert_array_equal(result.games, np.full((3, 3, 2), 50))
+        rates, lower, upper = result.get_win_rate_matrix((3, 3))
+        names = list(result.names)
+        # 完全なプレイの先手は必ず勝ち、左上のセルを食べる先手は必ず負ける
+        assert rates[names.index("perfect")].tolist() == [1.0, 1.0, 1.0]
+        assert rates[names.index("first_cell")].tolist() == [0.0, 0.0, 0.0]
+        assert (lower <= rates).all()
+        assert (rates <= upper).all()
+        assert "perfect" in result.format_win_rate_matrix((2, 5))
+
+    def test_results_do_not_depend_on_workers(self, tmp_path: Path) -> None:
+        """プロセス数によらず同じ結果になることを確認。"""
+        results = [
+            run_tournament(
+                _agents(tmp_path),
+                [(3, 4)],
+                30,
+                tmp_path / f"tournament_{workers}.jsonl",
+                block_size=7,
+                workers=workers,
+                seed=1,
+            )
+            for workers in (1, 3)
+        ]
+        np.testing.assert_array_equal(results[0].wins, results[1].wins)
+        np.testing.assert_array_equal(results[0].games, results[1].games)
+
+    def test_resume(self, tmp_path: Path) -> None:
+        """中断したトーナメントを再開すると、中断しない場合と同じ結果になることを確認。"""
+        agents = _agents(tmp_path)
+        expected = run_tournament(
+            agents,
+            [(3, 4)],
+            40,
+            tmp_path / "full.jsonl",
+            block_size=10,
+            seed=2,
+        )
+
+        path = tmp_path / "resumed.jsonl"
+        run_tournament(agents, [(3, 4)], 40, path, block_size=10, seed=2)
+        lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+        # 半分のブロックと、書き込み途中の行だけが残った状態を作る
+        path.write_text(
+            "".join(lines[: len(lines) // 2]) + lines[-1][:5],
+            encoding="utf-8",
+        )
+        resumed = run_tournament(agents, [(3, 4)], 40, path, block_size=10)
+        np.testing.assert_array_equal(resumed.wins, expected.wins)
+        np.testing.assert_array_equal(resumed.games, expected.games)
+
+        records = [json.loads(line) for line in path.read_text().splitlines()[1:]]
+        assert len(records) == 3 * 3 * 4
+        loaded = load_tournament_result(path, list(agents), [(3, 4)])
+        np.testing.assert_array_equal(loaded.wins, expected.wins)
+
+    def test_mismatched_settings_raise_value_error(self, tmp_path: Path) -> None:
+        """既存の結果と異なるシードやblock_size、対戦数で再開するとValueErrorが発生することを確認。"""
+        path = tmp_path / "tournament.jsonl"
+        agents = {"random": Agent}
+        run_tournament(agents, [(2, 2)], 10, path, block_size=5, seed=0)
+        with pytest.raises(ValueError, match="シード"):
+            run_tournament(agents, [(2, 2)], 10, path, block_size=5, seed=1)
+        with pytest.raises(ValueError, match="block_size"):
+            run_tournament(agents, [(2, 2)], 10, path, block_size=4, seed=0)
+        with pytest.raises(ValueError, match="対戦数"):
+            run_tournament(agents, [(2, 2)], 20, path, block_size=5, seed=0)
+        with pytest.raises(ValueError, match="対戦数"):
+            run_tournament(agents, [(2, 2)], 5, path, block_size=5)
+        result = run_tournament(agents, [(2, 2)], 10, path, block_size=5)
+        np.testing.assert_array_equal(result.games, [[[10]]])
+
+    def test_duplicate_boards_are_played_once(self, tmp_path: Path) -> None:
+        """重複した盤面は1回だけ対戦し、1回だけ集計されることを確認。"""
+        result = run_tournament(
+            {"random": Agent},
+            [(2, 3), (2, 3), (1, 4)],
+            10,
+            tmp_path / "tournament.jsonl",
+            block_size=5,
+            seed=0,
+        )
+        assert result.boards == ((2, 3), (1, 4))
+        np.testing.assert_array_equal(result.games, [[[10, 10]]])
+        lines = (tmp_path / "tournament.jsonl").read_text().splitlines()
+        assert len(lines) == 1 + 2 * 2
+
+    def test_invalid_arguments_raise_value_error(self, tmp_path: Path) -> None:
+        """引数が不正な場合にValueErrorが発生することを確認。"""
+        path = tmp_path / "tournament.jsonl"
+        with pytest.raises(ValueError, match="対戦数"):
+            run_tournament({"random": Agent}, [(2, 2)], -1, path)
+        with pytest.raises(ValueError, match="block_size"):
+            run_tournament({"random": Agent}, [(2, 2)], 10, path, block_size=0)
+        with pytest.raises(ValueError, match="workers"):
+            run_tournament({"random": Agent}, [(2, 2)], 10, path, workers=0)
@@ -0,0 +1,79 @@
+from collections.abc import Iterator
+from fractions import Fraction
+
+import pytest
+
+from src.prob.fraction.unnormalize_fraction import UnnormalizeFraction
+from src.prob.three_rows_chomp_prob import (
+    calculate_three_rows_prob_fraction,
+    calculate_three_rows_prob_unnormalized_fraction,
+)
+
+
+@pytest.fixture
+def normalize_bit_length() -> Iterator[None]:
+    """テスト後に約分の閾値と統計を元に戻すフィクスチャ。"""
+    original = UnnormalizeFraction.normalize_bit_length
+    yield
+    UnnormalizeFraction.normalize_bit_length = original
+    UnnormalizeFraction.stats.reset()
+
+
+class TestUnnormalizeFraction:
+    """UnnormalizeFractionクラスのテストクラス。"""
+
+    def test_operators(self) -> None:
+        """四則演算の結果がFractionと一致することを確認。"""
+        x = UnnormalizeFraction(2, 6)
+        y = UnnormalizeFraction(-3, 4)
+        assert (x + y).to_fraction() == Fraction(1, 3) + Fraction(-3, 4)
+        assert (x - y).to_fraction() == Fraction(1, 3) - Fraction(-3, 4)
+        assert (x * y).to_fraction() == Fraction(1, 3) * Fraction(-3, 4)
+        assert (x / y).to_fraction() == Fraction(1, 3) / Fraction(-3, 4)
+        assert (1 - x).to_fraction() == Fraction(2, 3)
+        assert (x / 5).to_fraction() == Fraction(1, 15)
+        assert x == UnnormalizeFraction(1, 3)
+
+    def test_in_place_operators_keep_identity(self) -> None:
+        """+=などの演算子が新しいオブジェクトを作らずに自身を書き換えることを確認。"""
+        x = UnnormalizeFraction(1, 2)
+        original = x
+        x += UnnormalizeFraction(1, 3)
+        x -= 1
+        x *= UnnormalizeFraction(6, 1)
+        x /= 2
+        assert x is original
+        assert x.to_fraction() == Fraction(-1, 2)
+
+    @pytest.mark.usefixtures("normalize_bit_length")
+    def test_normalize_only_above_threshold(self) -> None:
+        """ビット数が閾値を超えたときにだけ約分されることを確認。"""
+        UnnormalizeFraction.normalize_bit_length = 16
+        UnnormalizeFraction.stats.reset()
+
+        small = UnnormalizeFraction(2, 4) * 2
+        assert (small.numerator, small.denominator) == (4, 4)
+
+        large = UnnormalizeFraction(2**20, 2**21) * UnnormalizeFraction(3, 3)
+        assert (large.numerator, large.denominator) == (1, 2)
+        assert UnnormalizeFraction.stats.operation_count == 2
+        assert UnnormalizeFraction.stats.normalization_count == 1
+        assert UnnormalizeFraction.stats.max_bit_length == 23
+
+    def test_normalize_makes_denominator_positive(self) -> None:
+        """約分すると分母が正になることを確認。"""
+        x = UnnormalizeFraction(6, -4).normalize()
+        assert (x.numerator, x.denominator) == (-3, 2)
+
+    def test_division_by_zero_raises_zero_division_error(self) -> None:
+        """0で割った場合にZeroDivisionErrorが発生することを確認。"""
+        with pytest.raises(ZeroDivisionError, match="0で割ることはできません。"):
+            UnnormalizeFraction(1, 2) / UnnormalizeFraction(0, 1)
+
+    @pytest.mark.usefixtures("normalize_bit_length")
+    @pytest.mark.parametrize("threshold", [8, 256, 1 << 20])
+    def test_recursion_is_independent_of_threshold(self, threshold: int) -> None:
+        """約分の閾値によらず、再帰による確率の値が変わらないことを確認。"""
+        UnnormalizeFraction.normalize_bit_length = threshold
+        result = calculate_three_rows_prob_unnormalized_fraction(4, 3, 2)
+        assert result.to_fraction() == calculate_three_rows_prob_fraction(4, 3, 2)
@@ -0,0 +1,32 @@
+import pytest
+
+from src.utilities import wilson_interval
+
+
+class TestWilsonInterval:
+    """wilson_interval関数のテストクラス。"""
+
+    def test_known_value(self) -> None:
+        """10回中5回成功の95%信頼区間が既知の値と一致することを確認。"""
+        lower, upper = wilson_interval(5, 10)
+        assert lower == pytest.approx(0.2366, abs=1e-4)
+        assert upper == pytest.approx(0.7634, abs=1e-4)
+
+    def test_extreme_counts(self) -> None:
+        """成功回数が0または試行回数に等しいとき、区間の端が0または1になることを確認。"""
+        assert wilson_interval(0, 20)[0] == 0.0
+        assert wilson_interval(20, 20)[1] == 1.0
+        assert wilson_interval(0, 0) == (0.0, 1.0)
+
+    def test_higher_confidence_gives_wider_interval(self) -> None:
+        """信頼係数を大きくすると区間が広がることを確認。"""
+        lower95, upper95 = wilson_interval(30, 100, 0.95)
+        lower99, upper99 = wilson_interval(30, 100, 0.99)
+        assert lower99 < lower95 < 0.3 < upper95 < upper99
+
+    def test_invalid_arguments_raise_value_error(self) -> None:
+        """不正な引数でValueErrorが発生することを確認。"""
+        with pytest.raises(ValueError, match="成功回数"):
+            wilson_interval(11, 10)
+        with pytest.raises(ValueError, match="信頼係数"):
+            wilson_interval(5, 10, 1.0)
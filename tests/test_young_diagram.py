@@ -0,0 +1,79 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.young_diagram import YoungDiagramIndex
+
+
+class TestYoungDiagramIndex:
+    """YoungDiagramIndexクラスのテストクラス。"""
+
+    @pytest.mark.parametrize(("rows", "cols"), [(0, 3), (3, 0), (1, 5), (3, 4), (5, 2)])
+    def test_rank_is_bijection(self, rows: int, cols: int) -> None:
+        """番号が0から図形の数-1までの全単射で、unrankの逆になっていることを確認。"""
+        index = YoungDiagramIndex(rows, cols)
+        assert index.size == math.comb(rows + cols, rows)
+        diagrams = [index.unrank(rank) for rank in range(index.size)]
+        assert len(set(diagrams)) == index.size
+        for rank, row_lengths in enumerate(diagrams):
+            assert len(row_lengths) == rows
+            assert list(row_lengths) == sorted(row_lengths, reverse=True)
+            assert index.rank(row_lengths) == rank
+
+    def test_rank_order_is_lexicographic(self) -> None:
+        """番号の順が行の長さの辞書式順序と一致することを確認。"""
+        index = YoungDiagramIndex(4, 3)
+        diagrams = [index.unrank(rank) for rank in range(index.size)]
+        assert diagrams == sorted(diagrams)
+        assert index.rank(()) == 0
+        assert index.rank((3, 3, 3, 3)) == index.size - 1
+
+    def test_removing_cells_decreases_rank(self) -> None:
+        """図形からマスを取り除くと番号が小さくなることを確認。"""
+        index = YoungDiagramIndex(3, 5)
+        assert index.rank((4, 2)) < index.rank((4, 2, 1)) < index.rank((5, 2, 1))
+
+    def test_batch_matches_scalar(self) -> None:
+        """rank_many・unrank_manyの結果がrank・unrankと一致することを確認。"""
+        index = YoungDiagramIndex(4, 6)
+        ranks = np.arange(index.size).reshape(10, -1)
+        diagrams = index.unrank_many(ranks)
+        assert diagrams.shape == (*ranks.shape, 4)
+        assert diagrams.reshape(-1, 4).tolist() == [
+            list(index.unrank(rank)) for rank in range(index.size)
+        ]
+        np.testing.assert_array_equal(index.rank_many(diagrams), ranks)
+
+    def test_enumerate_diagrams(self) -> None:
+        """enumerate_diagramsが全ての図形を番号の順に並べることを確認。"""
+        index = YoungDiagramIndex(3, 7)
+        diagrams = index.enumerate_diagrams()
+        np.testing.assert_array_equal(
+            diagrams,
+            index.unrank_many(np.arange(index.size)),
+        )
+
+    def test_invalid_input(self) -> None:
+        """箱に含まれない図形や範囲外の番号でエラーが発生することを確認。"""
+        index = YoungDiagramIndex(2, 3)
+        with pytest.raises(ValueError, match="長方形に含まれていません"):
+            index.rank((4,))
+        with pytest.raises(ValueError, match="非増加"):
+            index.rank_many([[1, 2]])
+        with pytest.raises(ValueError, match="最後の軸の長さ"):
+            index.rank_many([1, 1, 1])
+        with pytest.raises(IndexError):
+            index.unrank(index.size)
+        with pytest.raises(IndexError):
+            index.unrank_many([0, -1])
+
+    def test_large_box_scalar_and_overflow(self) -> None:
+        """int64に収まらない箱でも、番号の計算は整数で行えることを確認。"""
+        index = YoungDiagramIndex(40, 40)
+        row_lengths = tuple(range(40, 0, -1))
+        rank = index.rank(row_lengths)
+        assert rank > np.iinfo(np.int64).max
+        assert index.unrank(rank) == row_lengths
+        with pytest.raises(OverflowError):
+            _ = index.term_table